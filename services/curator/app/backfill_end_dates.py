@@ -40,7 +40,7 @@ from app.config import Settings
 from app.db import create_engine, create_session_maker, session_scope
 from app.models import EventCurated, EventStatus, ModerationQueue, PostRaw
 from app.pipeline.detector import detect_event
-from app.pipeline.enricher import enrich_event
+from app.pipeline.enricher import DATE_PARSE_STATS, enrich_event
 
 LIVE_STATUSES = (EventStatus.approved, EventStatus.manual_review, EventStatus.pending)
 
@@ -184,6 +184,7 @@ async def main() -> None:
         f"\n[{mode}] pass1 live: scanned={scanned_live} filled_end={filled} "
         f"start_fixed={started} | pass2 rejected-as-past: scanned={scanned_rej} revived={revived}"
     )
+    print(DATE_PARSE_STATS.describe())
     if not args.apply and (filled or revived):
         print("Re-run with --apply to write.")
 
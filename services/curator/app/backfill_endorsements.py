@@ -0,0 +1,58 @@
+"""One-off: залить таблицу endorsements из истории постов @animalswithhands.
+
+Новые посты куратора пишут свои ссылки сами (PipelineProcessor.process_channel);
+этот скрипт нужен один раз — для постов, собранных до появления таблицы.
+Идемпотентен (ON CONFLICT DO NOTHING), можно гонять повторно. Залитые строки
+получают свежие endorsements.id — выше водяного знака rank_state, так что
+следующий инкрементальный пересчёт ранга подхватит их дни.
+
+    docker exec <curator> python -m app.backfill_endorsements            # dry-run
+    docker exec <curator> python -m app.backfill_endorsements --apply    # запись
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.config import Settings
+from app.db import create_engine, create_session_maker, session_scope
+from app.models import Channel, PostRaw
+from app.ranking import AWH_HANDLE, extract_links
+from app.repositories.endorsements import EndorsementsRepository
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--apply", action="store_true", help="записать (иначе dry-run)")
+    args = ap.parse_args()
+
+    settings = Settings()
+    engine = create_engine(settings.postgres_dsn)
+    session_factory = create_session_maker(engine)
+
+    posts = links = new = 0
+    async with session_scope(session_factory) as s:
+        q = (
+            select(PostRaw.id, PostRaw.text)
+            .join(Channel, Channel.id == PostRaw.channel_id)
+            .where(func.lower(func.replace(Channel.handle, "@", "")) == AWH_HANDLE)
+            .order_by(PostRaw.id)
+        )
+        repo = EndorsementsRepository(s)
+        for post_id, text in (await s.execute(q)).all():
+            found = extract_links([text])
+            posts += 1
+            links += len(found)
+            if args.apply and found:
+                new += await repo.record(post_id, found)
+
+    await engine.dispose()
+    print(f"постов @{AWH_HANDLE}: {posts}, ссылок: {links}, записано новых: {new}")
+    mode = "APPLIED" if args.apply else "DRY-RUN (no writes)"
+    print(f"[{mode}]")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
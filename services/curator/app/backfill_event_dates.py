@@ -32,7 +32,7 @@ from app.config import Settings
 from app.db import create_engine, create_session_maker, session_scope
 from app.models import EventCurated, EventStatus, PostRaw
 from app.pipeline.detector import detect_event
-from app.pipeline.enricher import enrich_event
+from app.pipeline.enricher import DATE_PARSE_STATS, enrich_event
 
 # Statuses worth repairing (rejected events surface nowhere, so skip them).
 LIVE_STATUSES = (EventStatus.approved, EventStatus.manual_review, EventStatus.pending)
@@ -139,6 +139,7 @@ async def main() -> None:
         f"\n[{mode}] scanned={scanned} fixed={fixed} "
         f"unchanged={unchanged} unparseable={unparseable}"
     )
+    print(DATE_PARSE_STATS.describe())
     if not args.apply and fixed:
         print("Re-run with --apply to write these changes.")
 
@@ -16,16 +16,28 @@ agent geocoder sets one too (source="agent-geocode"/"agent-channel"/"agent", 576
 in prod). Re-running geocode() over those would clear pins the gazetteer cannot
 reproduce and silently destroy data.
 
+--venues k1,k2 narrows the sweep to what a gazetteer edit can actually move
+(POST /admin/gazetteer/reload returns the changed keys): events pinned to one of
+those venues, plus events whose text or channel hits one of their aliases/handles
+(a new alias may now outrank the current pin). Removed keys work too.
+
+Площадки — те же, что у API: GAZETTEER_VENUES_FILE, если задан (иначе
+встроенный app/data/venues.json); digest печатается в начале прогона. Иначе
+--apply после правки внешнего файла геокодил бы по СТАРЫМ площадкам и снимал
+бы ровно те пины, ради которых правили.
+
 Idempotent. Dry-run by default; --apply writes.
 
     docker exec <curator> python -m app.backfill_geo_regeocode          # dry-run
     docker exec <curator> python -m app.backfill_geo_regeocode --apply
+    docker exec <curator> python -m app.backfill_geo_regeocode --venues zotov,ges2 --apply
 """
 
 from __future__ import annotations
 
+import argparse
 import asyncio
-import sys
+from pathlib import Path
 
 from sqlalchemy import select
 
@@ -40,14 +52,41 @@ from app.pipeline import gazetteer
 GAZETTEER_SOURCES = frozenset({"gazetteer", "gazetteer-channel"})
 
 
-async def main(apply: bool) -> None:
+def _touches(probe: gazetteer.AliasIndex, text: str | None, location_text: str | None,
+             handle: str | None) -> bool:
+    """Может ли геокод этого события упасть на одну из площадок probe."""
+    hay = gazetteer._norm(" ".join(p for p in (location_text, text) if p))
+    if hay and probe.find(hay):
+        return True
+    h = (handle or "").lower()
+    return bool(h) and (h if h.startswith("@") else "@" + h) in probe.by_handle
+
+
+def load_gazetteer(settings: Settings) -> gazetteer.Gazetteer:
+    """Справочник, как у API (app.main): внешний файл, если задан."""
+    if settings.gazetteer_venues_file:
+        gazetteer.reload(Path(settings.gazetteer_venues_file))
+    return gazetteer.current()
+
+
+def venue_probe(venues: set[str] | None) -> gazetteer.AliasIndex | None:
+    """Индекс только по площадкам --venues (из текущего справочника)."""
+    if not venues:
+        return None
+    return gazetteer.AliasIndex(tuple(v for v in gazetteer.current().venues if v.key in venues))
+
+
+async def main(apply: bool, venues: set[str] | None = None) -> None:
     settings = Settings()
+    gz = load_gazetteer(settings)
+    print(f"[regeocode] gazetteer {gz.path}: {len(gz.venues)} venues, digest {gz.digest[:8]}")
     engine = create_engine(settings.postgres_dsn)
     sf = create_session_maker(engine)
 
     scanned = kept = moved = cleared = 0
     cleared_by: dict[str, int] = {}
     moved_by: dict[str, int] = {}
+    probe = venue_probe(venues)
 
     async with session_scope(sf) as s:
         rows = (
@@ -66,6 +105,9 @@ async def main(apply: bool) -> None:
             old_venue = old.get("venue")
             if not old_venue:
                 continue
+            if probe is not None and old_venue not in venues \
+                    and not _touches(probe, text, ev.location_text, handle):
+                continue  # правка этих площадок пин не сдвинет
             scanned += 1
             geo = gazetteer.geocode(
                 text=text, location_text=ev.location_text, channel_handle=handle
@@ -101,4 +143,8 @@ async def main(apply: bool) -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main("--apply" in sys.argv[1:]))
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--apply", action="store_true", help="записать (иначе dry-run)")
+    ap.add_argument("--venues", default="", help="только эти площадки газеттира (key через запятую)")
+    args = ap.parse_args()
+    asyncio.run(main(args.apply, {k.strip() for k in args.venues.split(",") if k.strip()} or None))
@@ -25,7 +25,7 @@ from app.config import Settings
 from app.db import create_engine, create_session_maker, session_scope
 from app.models import EventCurated, EventStatus, PostRaw
 from app.pipeline.detector import detect_event
-from app.pipeline.enricher import enrich_event
+from app.pipeline.enricher import DATE_PARSE_STATS, enrich_event
 
 # Статусы, которые где-то показываются (rejected не трогаем).
 LIVE_STATUSES = (EventStatus.approved, EventStatus.manual_review, EventStatus.pending)
@@ -92,6 +92,7 @@ async def main() -> None:
         f"\n[{mode}] scanned={scanned} derived={derived} "
         f"(future={future} past={past}) still_null={scanned - derived}"
     )
+    print(DATE_PARSE_STATS.describe())
     if not args.apply and derived:
         print("Re-run with --apply to write these dates.")
 
@@ -14,6 +14,7 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
+from datetime import date
 from pathlib import Path
 
 from sqlalchemy import select, update
@@ -21,7 +22,7 @@ from sqlalchemy import select, update
 from app.config import Settings
 from app.db import create_engine, create_session_maker, session_scope
 from app.models import Channel
-from app.ranking import recompute_feed_ranks
+from app.ranking import _time_score, recompute_feed_ranks
 
 _TAXONOMY = Path(__file__).parent / "data" / "channel_taxonomy.json"
 
@@ -72,11 +73,13 @@ async def main() -> None:
         print(
             f"ранг: {res.rows} фид-строк → {res.groups} событий "
             f"(дедуп −{res.collapsed}); одобрено @animalswithhands: {res.endorsed}; "
-            f"обновлений: {len(res.updates)}"
+            f"обновлений: {len(res.updates)} (реально изменено строк: {res.changed})"
         )
-        # топ-15 по скору (из посчитанного)
+        print(res.explain())
+        # топ-15 по скору на сегодня (из посчитанного: статика + time-часть)
+        today = date.today()
         top = sorted(
-            {(gid, sc) for (_id, gid, _p, _x, sc) in res.updates},
+            {(gid, sc + _time_score(start, close, today)) for (_id, gid, _p, _x, sc, start, close) in res.updates},
             key=lambda t: -t[1],
         )[:15]
         print("топ-15 групп по rank_score:", ", ".join(f"{gid}:{sc:+.2f}" for gid, sc in top))
@@ -0,0 +1,141 @@
+"""Синтетический бенчмарк детектора (app.pipeline.detector) — офлайн, без БД.
+
+Генератор собирает посты из реалистичных фрагментов: анонсы с датами
+(«25 октября», «03.11.26»), временем и диапазонами, днями недели, метро /
+улицей / заведением / садом, ссылками, регистрацией — и «ловушки» для
+отсевов: дайджесты, другие города, опен-коллы, радиошоу, политика. Печатает
+пропускную способность detect_event (постов/с, мкс на пост) по размерам.
+
+    python -m app.bench_detector                     # 2000 постов × 5 прогонов
+    python -m app.bench_detector --sizes 1000 10000 --repeat 3
+
+Тот же генератор даёт корпус для golden-теста детектора
+(tests/fixtures/detector_golden.json, см. tests/test_detector_golden.py).
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from app.pipeline.detector import detect_event
+
+_MONTHS = ("января", "февраля", "марта", "апреля", "мая", "июня", "июля", "августа",
+           "сентября", "октября", "ноября", "декабря", "сент", "нояб")
+_WEEKDAYS = ("понедельник", "вторник", "среду", "четверг", "пятницу", "субботу",
+             "воскресенье", "в эту субботу", "в следующую пятницу", "в ближайшее воскресенье")
+_RELATIVE = ("сегодня", "завтра", "послезавтра", "на этой неделе", "на выходных",
+             "на следующей неделе")
+_VENUES = (
+    "м. Чистые пруды", "метро «Курская»", "ул. Покровка, 12", "пр-т Мира 33",
+    "Бульвар Рокоссовского", "наб. Тараса Шевченко 3", "клуб «16 тонн»", "бар «Стрелка»",
+    "Дом культуры ГЭС-2", "галерея «Триумф»", "кинотеатр «Ноябрь»", "библиотеке им. Некрасова",
+    "Сад им. Баумана", "Парк Горького", "саду Эрмитаж", "пространство «Внутри»",
+    "кино-театр под открытым небом", "лофт на Бауманской", "музей Москвы", "кафе «Вспышка»",
+)
+_ACTIONS = ("Пройдёт концерт", "Состоится спектакль", "Приглашаем на вечер",
+            "Открытие выставки", "Начало в", "Ждём всех", "Стартует фестиваль",
+            "Устраиваем показы", "Организуем встречу")
+_REG = ("Регистрация по ссылке", "Вход свободный", "вход по билетам", "Билеты на сайте",
+        "Записывайтесь в комментариях", "по предварительной регистрации")
+_FILLER = (
+    "Будет много музыки и хороших людей.", "Расскажем о новых проектах и планах.",
+    "Возьмите с собой друзей!", "Поговорим о кино, литературе и городе.",
+    "Программа вечера: знакомство, дискуссия, фуршет.", "Количество мест ограничено.",
+    "Лектор — историк искусства и куратор.", "Подробности — в закреплённом посте.",
+    "Стоимость 1500 ₽, для студентов 900 ₽.", "Саундтрек исполнит живой оркестр.",
+)
+_LINKS = ("https://timepad.ru/event/123/", "t.me/somechannel/45", "https://vk.com/event77",
+          "yandex.ru/maps/-/CCU", "2gis.ru/moscow/firm/1", "https://telegra.ph/post-01",
+          "instagram.com/venue")
+_TRAPS = (
+    "#афиша на неделю: подборка лучших событий", "Дайджест событий недели",
+    "Концерт в Санкт-Петербурге, 12 мая в 19:00", "Выставка фотографа из Казани, 5 июня в галерее",
+    "Открыт набор на курс рисования, дедлайн приёма заявок 1 сентября",
+    "Open call для художников: приём заявок до 20.09", "ВТРНК Radio Show — слушайте vtrnk.online",
+    "Радиошоу в прямом эфире сегодня в 20:00", "Вечер писем политзаключённым, 18:00",
+    "Митап по Python: спикеры из индустрии, 19:30", "Карнавальный сап-заплыв на Яузе, 9 августа",
+    "Лекция Сергея Кара-Мурзы о советской цивилизации", "Москва, 14 июля, Tretyakov",
+    "Гастроли в Новосибирске и Москве: 3 и 4 марта", "Концерт в Подмосковье, в 7 вечера",
+)
+
+
+def _date(rnd: random.Random) -> str:
+    day = rnd.randint(1, 31)
+    k = rnd.random()
+    if k < 0.5:
+        suffix = rnd.choice(("", "", "-го", "е"))
+        year = f" {rnd.choice((2025, 2026, 2027))}" if rnd.random() < 0.2 else ""
+        return f"{day}{suffix} {rnd.choice(_MONTHS)}{year}"
+    if k < 0.85:
+        year = rnd.choice(("", f".{rnd.randint(24, 27)}", f".20{rnd.randint(24, 27)}", f"/{rnd.randint(24, 27)}"))
+        return f"{day:02d}.{rnd.randint(1, 12):02d}{year}"
+    return f"{day}/{rnd.randint(1, 12)}"
+
+
+def _time(rnd: random.Random) -> str:
+    k = rnd.random()
+    h, m = rnd.randint(9, 23), rnd.choice((0, 15, 30, 45))
+    if k < 0.6:
+        return f"в {h}:{m:02d}"
+    if k < 0.85:
+        return f"{h}:{m:02d}–{min(h + 2, 23)}:{m:02d}"
+    return f"в {h % 12 or 12} {rnd.choice(('часов', 'вечера', 'утра', 'дня'))}"
+
+
+def synth_posts(n: int, seed: int = 0) -> list[str]:
+    """Детерминированный корпус из n постов."""
+    rnd = random.Random(seed)
+    out: list[str] = []
+    for _ in range(n):
+        parts: list[str] = []
+        if rnd.random() < 0.2:
+            parts.append(rnd.choice(_TRAPS))
+        if rnd.random() < 0.8:
+            parts.append(rnd.choice(_ACTIONS))
+        for _ in range(rnd.choice((0, 1, 1, 1, 1, 1, 2, 6))):
+            parts.append(_date(rnd))
+        if rnd.random() < 0.7:
+            parts.append(_time(rnd))
+        for _ in range(rnd.choice((0, 0, 0, 1, 1, 1, 4))):
+            parts.append(rnd.choice(_WEEKDAYS))
+        if rnd.random() < 0.3:
+            parts.append(rnd.choice(_RELATIVE))
+        for _ in range(rnd.choice((0, 1, 1, 2))):
+            parts.append(rnd.choice(_VENUES))
+        parts.extend(rnd.sample(_FILLER, rnd.randint(1, 4)))
+        if rnd.random() < 0.5:
+            parts.append(rnd.choice(_REG))
+        for _ in range(rnd.choice((0, 0, 0, 1, 1, 2, 3, 6))):
+            parts.append(rnd.choice(_LINKS))
+        rnd.shuffle(parts)
+        sep = rnd.choice((". ", "\n", ", "))
+        out.append(sep.join(parts))
+    return out
+
+
+def bench(n: int, *, seed: int = 0, repeat: int = 5) -> dict:
+    """Лучший из repeat прогонов detect_event по корпусу размера n."""
+    posts = synth_posts(n, seed)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for text in posts:
+            detect_event(text)
+        best = min(best, time.perf_counter() - t0)
+    return {"posts": n, "total_s": round(best, 4), "posts_per_s": round(n / best), "us_per_post": round(best / n * 1e6, 1)}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[2000])
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=5, help="прогонов на размер (берём лучший)")
+    args = ap.parse_args()
+    for n in args.sizes:
+        r = bench(n, seed=args.seed, repeat=args.repeat)
+        print(f"n={r['posts']:>6} → {r['total_s']:.3f}s | {r['posts_per_s']} постов/с, {r['us_per_post']} мкс/пост")
+
+
+if __name__ == "__main__":
+    main()
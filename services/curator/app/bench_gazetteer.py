@@ -0,0 +1,118 @@
+"""Синтетический бенчмарк геокодера (app.pipeline.gazetteer) — офлайн, без БД.
+
+Пропускная способность geocode() в зависимости от размера VENUES: к реальному
+справочнику добавляются синтетические площадки (псевдо-слова из слогов, 1–4
+слова в алиасе, как у настоящих), посты — корпус детектора (app.bench_detector)
+с вкраплёнными алиасами (в т.ч. после «выпускник …» — ловушка для
+ATTRIBUTION_CUES). Для сравнения печатается прежний линейный перебор
+(padded.find по каждому алиасу) и сверяется, что ответы совпадают.
+
+    python -m app.bench_gazetteer                        # VENUES ×1, 1k, 5k
+    python -m app.bench_gazetteer --venues 0 2000 20000 --posts 5000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Optional
+
+from app.bench_detector import synth_posts
+from app.pipeline.gazetteer import ATTRIBUTION_CUES, VENUES, AliasIndex, Venue, _norm
+
+_CONS = "бвгдзклмнпрстфхцчшж"
+_VOWS = "аеиоуыя"
+
+
+def synth_venues(n: int, seed: int = 0) -> tuple[Venue, ...]:
+    """VENUES + n синтетических площадок."""
+    rnd = random.Random(seed)
+
+    def word() -> str:
+        return "".join(rnd.choice(_CONS) + rnd.choice(_VOWS) for _ in range(rnd.randint(2, 4)))
+
+    extra = tuple(
+        Venue(f"synth{i}", 55.75, 37.62, (f"@synth{i}",) if rnd.random() < 0.3 else (),
+              tuple(" ".join(word() for _ in range(rnd.randint(1, 4))) for _ in range(rnd.randint(1, 3))))
+        for i in range(n)
+    )
+    return VENUES + extra
+
+
+def synth_hays(venues: tuple[Venue, ...], n: int, seed: int = 0) -> list[str]:
+    """_norm-тексты постов; примерно в половине — алиас площадки."""
+    rnd = random.Random(seed)
+    aliases = [a for v in venues for a in v.aliases]
+    out: list[str] = []
+    for text in synth_posts(n, seed):
+        k = rnd.random()
+        if k < 0.35:
+            text = f"{text} {rnd.choice(aliases)}"
+        elif k < 0.45:
+            text = f"{rnd.choice(ATTRIBUTION_CUES)} {rnd.choice(aliases)}. {text}"
+        elif k < 0.5:
+            text = f"{rnd.choice(aliases)} {text} {rnd.choice(aliases)}"
+        out.append(_norm(text))
+    return out
+
+
+def match_linear(venues: tuple[Venue, ...], hay: str) -> Optional[Venue]:
+    """Прежний алгоритм geocode(): перебор всех алиасов по порядку."""
+    padded = f" {hay} "
+    for v in venues:
+        for a in v.norm_aliases:
+            if not a:
+                continue
+            pos = padded.find(f" {a} ")
+            if pos == -1:
+                continue
+            if any(cue in padded[max(0, pos - 60):pos] for cue in ATTRIBUTION_CUES):
+                continue
+            return v
+    return None
+
+
+def _best(fn, hays: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for h in hays:
+            fn(h)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench(extra: int, *, posts: int = 2000, seed: int = 0, repeat: int = 3) -> dict:
+    venues = synth_venues(extra, seed)
+    hays = synth_hays(venues, posts, seed)
+    t0 = time.perf_counter()
+    index = AliasIndex(venues)
+    build = time.perf_counter() - t0
+    mismatches = sum(index.match(h) is not match_linear(venues, h) for h in hays)
+    t_index = _best(index.match, hays, repeat)
+    t_linear = _best(lambda h: match_linear(venues, h), hays, repeat)
+    return {
+        "venues": len(venues), "aliases": sum(len(v.aliases) for v in venues), "posts": posts,
+        "build_ms": round(build * 1e3, 1), "mismatches": mismatches,
+        "index_us": round(t_index / posts * 1e6, 1), "linear_us": round(t_linear / posts * 1e6, 1),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--venues", type=int, nargs="+", default=[0, 1000, 5000],
+                    help="сколько синтетических площадок добавить к VENUES")
+    ap.add_argument("--posts", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=3, help="прогонов на размер (берём лучший)")
+    args = ap.parse_args()
+    for extra in args.venues:
+        r = bench(extra, posts=args.posts, seed=args.seed, repeat=args.repeat)
+        print(
+            f"venues={r['venues']:>6} aliases={r['aliases']:>6} → trie {r['index_us']} мкс/пост, "
+            f"перебор {r['linear_us']} мкс/пост (сборка {r['build_ms']} ms, расхождений {r['mismatches']})"
+        )
+
+
+if __name__ == "__main__":
+    main()
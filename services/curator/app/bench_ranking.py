@@ -0,0 +1,274 @@
+"""Синтетический бенчмарк ранжирования/дедупа ленты (app.ranking) — офлайн, без БД.
+
+Генератор строит реалистичный корпус `_Row`: кросс-посты одного события из разных
+каналов (чуть разный заголовок, свой постер), репосты агрегаторов с именем в
+кавычках, перепакованные Telegram постеры (близкий dHash), постер со
+спонсор-плашкой (рыхлая зона + общее имя), лукэлайки афиш одного шаблона (близкий
+dHash, разные события), override-группы и перекошенные дни (фестивали). По каждому
+размеру печатает время стадий cluster() (ClusterStats) + скоринга, пик памяти,
+размер payload для пула процессов (make_rank_executor) и число склеек по проходам.
+
+write_s — клиентская часть записи recompute_feed_ranks: _write_back над
+updates прогона (кортежи VALUES по чанкам + компиляция UPDATE … FROM (VALUES …)
+под postgresql) через сессию-заглушку. Сам UPDATE на сервере сюда не входит —
+он зависит от таблицы и индексов живой БД; его время пишется в rank_runs
+(стадия write) на каждом прогоне с apply.
+
+    python -m app.bench_ranking                          # 1k/10k, сверка с базой
+    python -m app.bench_ranking --sizes 1000 10000 100000
+    python -m app.bench_ranking --update-baseline        # перезаписать базу
+
+Сверка с app/data/bench_ranking_baseline.json: склейки/группы обязаны совпасть
+точно (генератор детерминирован — расхождение = поменялось поведение дедупа),
+время и пик памяти — не хуже базы × --tolerance. Регресс → exit 1. Время зависит
+от машины: базу обновляем на той же машине, где проверяем.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.ranking import ClusterStats, _pack_rows, _primary, _rank, _Row, _score, _write_back, cluster
+
+BASELINE = Path(__file__).parent / "data" / "bench_ranking_baseline.json"
+START = datetime(2026, 9, 1)
+DAYS = 60
+
+_CONS = "бвгдзклмнпрстфхцчшж"
+_VOWS = "аеиоуыя"
+_CTYPES = (
+    ("venue-official", 35), ("promoter", 20), ("aggregator", 25),
+    ("community-blog", 10), ("media-outlet", 10),
+)
+
+
+def _vocab(rnd: random.Random, n: int = 3000) -> list[str]:
+    """Псевдо-слова из слогов — значимые токены (≥4 букв, не стоп-слова)."""
+    out: set[str] = set()
+    while len(out) < n:
+        out.add("".join(rnd.choice(_CONS) + rnd.choice(_VOWS) for _ in range(rnd.randint(2, 4))))
+    return sorted(out)
+
+
+def _flip(h: int, bits: int, rnd: random.Random) -> int:
+    for b in rnd.sample(range(64), bits):
+        h ^= 1 << b
+    return h
+
+
+def synth_rows(n: int, seed: int = 0) -> list[_Row]:
+    """Детерминированный корпус из ~n фид-строк в порядке _load_rows
+    (event_time, id)."""
+    rnd = random.Random(seed)
+    vocab = _vocab(rnd)
+    channels = [
+        (f"ch{i}", rnd.choices([c for c, _ in _CTYPES], [w for _, w in _CTYPES])[0], float(rnd.randint(1, 3)))
+        for i in range(max(50, n // 40))
+    ]
+    aggregators = [c for c in channels if c[1] == "aggregator"]
+    venues = [f"venue{i}" for i in range(max(30, n // 80))]
+    templates = [rnd.getrandbits(64) for _ in range(max(5, n // 500))]
+    # Перекос по дням: ~zipf + несколько фестивальных дней ×8.
+    day_w = [1.0 / (r + 1) ** 0.8 for r in range(DAYS)]
+    rnd.shuffle(day_w)
+    for d in rnd.sample(range(DAYS), 3):
+        day_w[d] *= 8
+
+    rows: list[_Row] = []
+    next_id = 1
+    override_seq = 1
+
+    def row(title: str, descr: str, ch: tuple, dt: datetime, end: datetime | None,
+            media_hash: str, phash: int, venue: str | None, override: int | None) -> None:
+        nonlocal next_id
+        rows.append(_Row(
+            id=next_id, title=title, descr=descr, event_time=dt, event_time_end=end,
+            media_hash=media_hash, filter_score=rnd.randint(4, 11), channel=ch[0],
+            message_id=rnd.randint(1, 50_000), ctype=ch[1], authority=ch[2],
+            override=override, venue=venue, phash=f"{phash:016x}",
+        ))
+        next_id += 1
+
+    while len(rows) < n:
+        name = rnd.sample(vocab, rnd.randint(3, 6))
+        title = " ".join(name).capitalize()
+        quote = " ".join(name[:2])
+        filler = " ".join(rnd.choices(vocab, k=rnd.randint(15, 35)))
+        day = rnd.choices(range(DAYS), day_w)[0]
+        hour = 0 if rnd.random() < 0.2 else rnd.randint(12, 21)
+        dt = START + timedelta(days=day, hours=hour, minutes=rnd.choice((0, 0, 30)))
+        end = dt + timedelta(days=rnd.randint(3, 30)) if rnd.random() < 0.15 else None
+        venue = rnd.choice(venues) if rnd.random() < 0.6 else None
+        lookalike = rnd.random() < 0.15  # афиша по общему шаблону — ловушка для прохода D
+        phash = _flip(rnd.choice(templates), rnd.randint(8, 12), rnd) if lookalike else rnd.getrandbits(64)
+        mhash = f"{rnd.getrandbits(128):032x}"
+        url = f" https://site{rnd.randint(1, 400)}.ru/e/{next_id}" if rnd.random() < 0.3 else ""
+        override = None
+        if rnd.random() < 0.02:
+            override, override_seq = override_seq, override_seq + 1
+        src = rnd.choice(channels)
+        row(title, f"{title} «{quote}» {filler}{url}", src, dt, end, mhash, phash, venue, override)
+
+        extra = min(8, int(rnd.expovariate(1.2)))
+        for _ in range(extra):
+            ch = rnd.choice(channels)
+            kind = rnd.random()
+            if kind < 0.25:  # репост того же поста: тот же постер/время (exact)
+                row(title, f"{title} «{quote}» {filler}{url}", ch, dt, end, mhash, phash, venue, override)
+            elif kind < 0.5:  # кросс-пост: одно слово заголовка другое, постер перепакован
+                t2 = name[:-1] + [rnd.choice(vocab)] if len(name) > 5 else name + [rnd.choice(vocab)]
+                row(" ".join(t2).capitalize(), " ".join(rnd.choices(vocab, k=25)), ch, dt, end,
+                    f"{rnd.getrandbits(128):032x}", _flip(phash, rnd.randint(0, 4), rnd), venue, override)
+            elif kind < 0.75 and aggregators:  # агрегатор: своё оформление, имя в кавычках
+                row("", f"Подборка недели: «{quote}» и ещё {' '.join(rnd.choices(vocab, k=20))}",
+                    rnd.choice(aggregators), dt, end, f"{rnd.getrandbits(128):032x}",
+                    rnd.getrandbits(64), None, override)
+            elif kind < 0.9:  # спонсор-плашка: рыхлый dHash + два общих слова имени
+                row("", f"{name[0]} {name[1]} {' '.join(rnd.choices(vocab, k=20))}", ch, dt, end,
+                    f"{rnd.getrandbits(128):032x}", _flip(phash, rnd.randint(9, 12), rnd), None, override)
+            else:  # совсем другая обёртка — склеит только override
+                row(" ".join(rnd.sample(vocab, 4)), " ".join(rnd.choices(vocab, k=25)), ch, dt, end,
+                    f"{rnd.getrandbits(128):032x}", rnd.getrandbits(64), venue, override)
+
+    rows = rows[:n]
+    rows.sort(key=lambda r: (r.event_time or datetime.max, r.id))
+    return rows
+
+
+class _CompileSession:
+    """Сессия для _write_back без БД: каждый UPDATE компилируется под postgresql
+    (рендер SQL + параметры VALUES), как перед отправкой драйверу."""
+
+    def __init__(self) -> None:
+        self.statements = 0
+
+    async def execute(self, stmt):
+        stmt.compile(dialect=postgresql.dialect())
+        self.statements += 1
+        return SimpleNamespace(rowcount=0)
+
+
+def bench_write(rows: list[_Row], *, ham: int = 8, corrob: int = 14, repeat: int = 1) -> tuple[float, int]:
+    """(лучшее время _write_back по updates корпуса, число UPDATE-чанков)."""
+    _, _, updates, _ = _rank(rows, set(), ham, corrob)
+    sig_by_id = {r.id: f"{r.id:032x}" for r in rows}
+    best = float("inf")
+    for _ in range(repeat):
+        session = _CompileSession()
+        t0 = time.perf_counter()
+        asyncio.run(_write_back(session, updates, sig_by_id))  # type: ignore[arg-type]
+        best = min(best, time.perf_counter() - t0)
+    return best, session.statements
+
+
+def bench(n: int, *, seed: int = 0, ham: int = 8, corrob: int = 14, repeat: int = 1) -> dict:
+    """Прогнать cluster + скоринг на корпусе размера n. Время — лучший из repeat
+    прогонов без tracemalloc; пик памяти — отдельным прогоном под tracemalloc."""
+    rows = synth_rows(n, seed)
+    today = START.date()
+    best: dict | None = None
+    for _ in range(repeat):
+        gc.collect()
+        st = ClusterStats()
+        t0 = time.perf_counter()
+        groups = cluster(rows, phash_max_hamming=ham, phash_corrob_hamming=corrob, stats=st)
+        t1 = time.perf_counter()
+        for g in groups:
+            _primary(g)
+            _score(g, today)
+        st.seconds["score"] = time.perf_counter() - t1
+        total = time.perf_counter() - t0
+        if best is None or total < best["total_s"]:
+            best = {
+                "rows": len(rows), "groups": len(groups),
+                "merges": dict(sorted(st.merges.items())),
+                "seconds": {k: round(v, 4) for k, v in st.seconds.items()},
+                "total_s": round(total, 4),
+            }
+
+    gc.collect()
+    tracemalloc.start()
+    cluster(rows, phash_max_hamming=ham, phash_corrob_hamming=corrob)
+    best["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+    tracemalloc.stop()
+    best["payload_kb"] = round(len(pickle.dumps(_pack_rows(rows))) / 1024, 1)
+    write_s, best["write_chunks"] = bench_write(rows, ham=ham, corrob=corrob, repeat=repeat)
+    best["write_s"] = round(write_s, 4)
+    return best
+
+
+def check(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """Список регрессий относительно базы (пусто — всё ок)."""
+    problems: list[str] = []
+    for size, cur in results.items():
+        base = baseline.get(size)
+        if not base:
+            continue
+        if cur["groups"] != base["groups"] or cur["merges"] != base["merges"]:
+            problems.append(
+                f"{size}: результат дедупа изменился — групп {base['groups']}→{cur['groups']}, "
+                f"склейки {base['merges']}→{cur['merges']}"
+            )
+        for key in ("total_s", "peak_mb", "write_s"):
+            if key in base and key in cur and cur[key] > base[key] * tolerance:
+                problems.append(f"{size}: {key} {base[key]}→{cur[key]} (> ×{tolerance})")
+    return problems
+
+
+def _print(r: dict) -> None:
+    stages = " ".join(f"{k}={v:.3f}" for k, v in r["seconds"].items())
+    merges = " ".join(f"{k}={v}" for k, v in r["merges"].items())
+    print(
+        f"n={r['rows']:>7} → групп {r['groups']:>7} | total {r['total_s']:.3f}s "
+        f"peak {r['peak_mb']}MB payload {r['payload_kb']}KB "
+        f"write {r['write_s']:.3f}s/{r['write_chunks']} UPDATE\n"
+        f"    стадии: {stages}\n    склейки: {merges}"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=3, help="прогонов на размер (берём лучший)")
+    ap.add_argument("--tolerance", type=float, default=1.5, help="допуск по времени/памяти к базе")
+    ap.add_argument("--update-baseline", action="store_true", help="записать результаты как новую базу")
+    args = ap.parse_args()
+
+    results: dict[str, dict] = {}
+    for n in args.sizes:
+        r = bench(n, seed=args.seed, repeat=args.repeat)
+        results[str(n)] = r
+        _print(r)
+
+    if args.update_baseline:
+        old = json.loads(BASELINE.read_text(encoding="utf-8")) if BASELINE.exists() else {}
+        old.update(results)
+        BASELINE.write_text(json.dumps(old, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"база обновлена: {BASELINE}")
+        return
+    if not BASELINE.exists():
+        print("базы нет — запусти с --update-baseline")
+        return
+    problems = check(results, json.loads(BASELINE.read_text(encoding="utf-8")), args.tolerance)
+    for p in problems:
+        print("РЕГРЕСС:", p)
+    if problems:
+        sys.exit(1)
+    print("OK: в пределах базы")
+
+
+if __name__ == "__main__":
+    main()
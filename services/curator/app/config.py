@@ -75,7 +75,44 @@ class Settings(BaseSettings):
     event_score_threshold_auto: int = Field(6, alias="EVENT_SCORE_AUTO")
     default_poll_interval_minutes: int = Field(30, alias="DEFAULT_POLL_INTERVAL_MIN")
     poll_concurrency: int = Field(3, alias="POLL_CONCURRENCY")
+    # Батч-опрос: >0 → вместо job'а на канал раз в минуту собираем подошедшие
+    # по poll_interval каналы и тянем их пачками по N одним /ingest. 0 → по каналу.
+    poll_batch_size: int = Field(0, alias="POLL_BATCH_SIZE")
+    # Батч через /ingest/stream (NDJSON): обработка идёт, пока поллер ещё тянет
+    # остальные сообщения. Нужен поллер с /ingest/stream.
+    poll_stream: bool = Field(False, alias="POLL_STREAM")
+    # Очередь пост-обработки (processing_jobs): >0 → поллинг только сохраняет
+    # посты и ставит задачи, detect/enrich/classify + пуш делают N воркеров на
+    # реплику (SKIP LOCKED — реплик может быть несколько). 0 → всё inline, как раньше.
+    pipeline_workers: int = Field(0, alias="PIPELINE_WORKERS")
+    pipeline_batch: int = Field(10, alias="PIPELINE_BATCH")  # постов на транзакцию воркера
+    pipeline_max_attempts: int = Field(5, alias="PIPELINE_MAX_ATTEMPTS")
+    # Где считать detect/enrich/classify: process — пул из
+    # PIPELINE_EXECUTOR_WORKERS процессов (event loop API не блокируется),
+    # inline — прямо в loop (детерминированно, для тестов/отладки).
+    pipeline_executor: str = Field("process", alias="PIPELINE_EXECUTOR")
+    pipeline_executor_workers: int = Field(2, alias="PIPELINE_EXECUTOR_WORKERS")
+    # Кэш таксономии (теги + автомат классификатора) на процесс: сбрасывается по
+    # NOTIFY curator_taxonomy при upsert тега; TTL — страховка, если NOTIFY потерялся.
+    taxonomy_ttl_seconds: float = Field(600.0, alias="TAXONOMY_TTL_SECONDS")
+    # Индекс карты /me/map (geocoded события + площадки в сетке) — перечитывается
+    # раз в столько секунд; новые события появляются на карте с этой задержкой.
+    map_index_ttl_seconds: float = Field(60.0, alias="MAP_INDEX_TTL_SECONDS")
+    # Снимок ленты в памяти (/me/feed без SQL по событиям): пересобирается после
+    # пересчёта рангов / ингеста / модерации / правки названий и тегов на своей
+    # реплике; другие реплики догоняют только по TTL (NOTIFY для снимка нет).
+    feed_snapshot_enabled: bool = Field(True, alias="FEED_SNAPSHOT_ENABLED")
+    feed_snapshot_ttl_seconds: float = Field(300.0, alias="FEED_SNAPSHOT_TTL_SECONDS")
+    # Файл площадок газеттира вне образа (volume) — правится без деплоя и
+    # перечитывается POST /admin/gazetteer/reload. Пусто → app/data/venues.json.
+    gazetteer_venues_file: str = Field("", alias="GAZETTEER_VENUES_FILE")
     rank_recompute_minutes: int = Field(15, alias="RANK_RECOMPUTE_MIN")  # пересчёт дедуп+rank_score ленты
+    # Инкрементальный пересчёт: перекластеризуем только дни, где что-то поменялось
+    # (полный — при смене порогов/формулы). false → каждый прогон полный, как раньше.
+    rank_incremental: bool = Field(True, alias="RANK_INCREMENTAL")
+    # Где считать cluster()/_score(): process — отдельный процесс (event loop API
+    # не блокируется), inline — прямо в loop (детерминированно, для отладки).
+    rank_executor: str = Field("process", alias="RANK_EXECUTOR")
 
     # ── Перцептивный дедуп постеров (dHash по картинке) ──
     # MEDIA_LOCAL_DIR — путь к смонтированному citysignal_media внутри curator
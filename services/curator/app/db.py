@@ -50,6 +50,14 @@ _ADDITIVE_MIGRATIONS: list[str] = [
     'CREATE INDEX IF NOT EXISTS ix_events_dup_group ON "{s}".events_curated (dup_group_id)',
     'CREATE INDEX IF NOT EXISTS ix_events_dup_override ON "{s}".events_curated (dup_override_group)',
     'ALTER TABLE "{s}".reminders ADD COLUMN IF NOT EXISTS when_text varchar(80)',
+    'ALTER TABLE "{s}".events_curated ADD COLUMN IF NOT EXISTS rank_sig varchar(32)',
+    'ALTER TABLE "{s}".events_curated ADD COLUMN IF NOT EXISTS rank_start_day date',
+    'ALTER TABLE "{s}".events_curated ADD COLUMN IF NOT EXISTS rank_close_day date',
+    # Генерируемая колонка — таблица перепишется один раз, при первом старте
+    'ALTER TABLE "{s}".events_curated ADD COLUMN IF NOT EXISTS venue_key text'
+    " GENERATED ALWAYS AS (location_meta ->> 'venue') STORED",
+    'CREATE INDEX IF NOT EXISTS ix_events_venue_key ON "{s}".events_curated'
+    " (venue_key, (coalesce(event_time, event_time_end)), id) WHERE venue_key IS NOT NULL",
 ]
 
 
@@ -52,7 +52,7 @@ import urllib.request
 from pathlib import Path
 
 HERE = Path(__file__).resolve().parent
-GAZ = HERE / "pipeline" / "gazetteer.py"
+GAZ = HERE / "data" / "venues.json"
 SRC_DIR = HERE.parent.parent.parent / "src" / "pages" / "cs"
 VENUES_TS = SRC_DIR / "venues.ts"
 FOOTPRINTS_TS = SRC_DIR / "venueFootprints.ts"
@@ -74,11 +74,7 @@ CHUNK = 4              # points per Overpass union query (mail.ru handles 4, not
 
 # -- parse the two source files ----------------------------------------------
 def parse_gazetteer() -> dict:
-    src = GAZ.read_text(encoding="utf-8")
-    out = {}
-    for k, lat, lng in re.findall(r'Venue\(\s*"([a-z0-9_]+)"\s*,\s*([\d.]+)\s*,\s*([\d.]+)', src):
-        out[k] = (float(lat), float(lng))
-    return out
+    return {v["key"]: (float(v["lat"]), float(v["lng"])) for v in json.loads(GAZ.read_text(encoding="utf-8"))}
 
 
 def _field(line: str, name: str) -> str:
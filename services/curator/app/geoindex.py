@@ -0,0 +1,99 @@
+"""Равномерная сетка по lat/lng — выборка точек в bbox и кластеризация по зуму.
+
+GridIndex раскладывает точки по ячейкам cell_deg×cell_deg; query(bbox)
+перебирает только ячейки, задетые bbox (или все непустые, если их меньше), и
+доточно фильтрует по координатам. Для городской карты (тысячи точек, почти все
+в одном городе) сетка проще KD-дерева и не требует перестройки при вставке.
+
+grid_cluster() — серверная кластеризация пинов: точки сводятся по ячейкам
+сетки, размер которой зависит от зума карты (как у тайлов: на зуме z мир —
+2^z тайлов по долготе, ячейка — 1/CELLS_PER_TILE тайла). Одиночная точка в
+ячейке остаётся пином, две и больше — кластер с центроидом и числом точек.
+
+Антимеридиан не поддерживается (west > east — пустой ответ): карта московская.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+
+CELLS_PER_TILE = 4  # ≈ 64px ячейка кластера на 256px тайле
+MAX_ZOOM = 22
+
+
+@dataclass(frozen=True)
+class BBox:
+    south: float
+    west: float
+    north: float
+    east: float
+
+    def contains(self, lat: float, lng: float) -> bool:
+        return self.south <= lat <= self.north and self.west <= lng <= self.east
+
+
+class GridIndex(Generic[T]):
+    """insert(lat, lng, item) / query(bbox) → [(lat, lng, item)]."""
+
+    __slots__ = ("cell", "_cells", "size")
+
+    def __init__(self, cell_deg: float = 0.01) -> None:
+        if cell_deg <= 0:
+            raise ValueError(f"cell_deg={cell_deg} должен быть > 0")
+        self.cell = cell_deg
+        self._cells: dict[tuple[int, int], list[tuple[float, float, T]]] = {}
+        self.size = 0
+
+    def _key(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell), math.floor(lng / self.cell)
+
+    def insert(self, lat: float, lng: float, item: T) -> None:
+        self._cells.setdefault(self._key(lat, lng), []).append((lat, lng, item))
+        self.size += 1
+
+    def query(self, bbox: BBox) -> list[tuple[float, float, T]]:
+        if bbox.south > bbox.north or bbox.west > bbox.east:
+            return []
+        (r0, c0), (r1, c1) = self._key(bbox.south, bbox.west), self._key(bbox.north, bbox.east)
+        out: list[tuple[float, float, T]] = []
+        if (r1 - r0 + 1) * (c1 - c0 + 1) <= len(self._cells):
+            cells: Iterable[list] = filter(None, (
+                self._cells.get((r, c)) for r in range(r0, r1 + 1) for c in range(c0, c1 + 1)
+            ))
+        else:  # bbox шире заполненной части — дешевле пройти непустые ячейки
+            cells = (pts for (r, c), pts in self._cells.items() if r0 <= r <= r1 and c0 <= c <= c1)
+        for pts in cells:
+            out.extend(p for p in pts if bbox.contains(p[0], p[1]))
+        return out
+
+
+def cluster_cell_deg(zoom: int) -> float:
+    """Размер ячейки кластера (градусы) на зуме карты."""
+    return 360.0 / (2 ** max(0, min(zoom, MAX_ZOOM)) * CELLS_PER_TILE)
+
+
+@dataclass
+class Cluster(Generic[T]):
+    lat: float
+    lng: float
+    count: int
+    items: list[T] = field(default_factory=list)
+
+
+def grid_cluster(points: Iterable[tuple[float, float, T]], zoom: int) -> list[Cluster[T]]:
+    """Свести точки в ячейки сетки зума: Cluster на каждую непустую ячейку
+    (центроид, число точек, сами элементы) — в порядке первой точки ячейки."""
+    cell = cluster_cell_deg(zoom)
+    acc: dict[tuple[int, int], list[tuple[float, float, T]]] = {}
+    for p in points:
+        acc.setdefault((math.floor(p[0] / cell), math.floor(p[1] / cell)), []).append(p)
+    return [
+        Cluster(
+            lat=sum(p[0] for p in pts) / len(pts), lng=sum(p[1] for p in pts) / len(pts),
+            count=len(pts), items=[p[2] for p in pts],
+        )
+        for pts in acc.values()
+    ]
@@ -30,9 +30,18 @@ def dhash(path: str, hash_size: int = _HASH_SIZE) -> str:
     return f"{bits:0{hash_size * hash_size // 4}x}"
 
 
-def hamming(a: str, b: str) -> int:
-    """Расстояние Хэмминга между двумя hex-dHash. 0 = идентичны."""
-    return bin(int(a, 16) ^ int(b, 16)).count("1")
+def to_int(h: str) -> int:
+    """hex-dHash → int. Парсим один раз на строку, дальше сравниваем int'ами."""
+    return int(h, 16)
+
+
+def hamming(a: int | str, b: int | str) -> int:
+    """Расстояние Хэмминга между двумя dHash (int или hex). 0 = идентичны."""
+    if isinstance(a, str):
+        a = int(a, 16)
+    if isinstance(b, str):
+        b = int(b, 16)
+    return (a ^ b).bit_count()
 
 
 def close(a: str | None, b: str | None, max_dist: int) -> bool:
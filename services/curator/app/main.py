@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import logging
+from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import Settings
 from app.db import bootstrap_schema, create_engine, create_session_maker, session_scope
+from app.pipeline import gazetteer
 from app.pipeline.processor import PipelineProcessor
+from app.pipeline.workers import PipelineWorkers
 from app.repositories.channels import ChannelsRepository
 from app.repositories.tags import TagsRepository
 from app.routers import admin as admin_router
@@ -23,7 +26,10 @@ from app.routers import tags as tags_router
 from app.seed import INITIAL_TAGS
 from app.klursi_tags import KLURSI_TAGS
 from app.services.push import PushService, set_push_service
+from app.services.feed_snapshot import FeedSnapshotCache
+from app.services.map_index import MapIndexCache
 from app.services.scheduler import CuratorScheduler, set_scheduler
+from app.services.taxonomy import TaxonomyCache
 from app.services.tg_client import TelegramServiceClient
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
@@ -77,6 +83,24 @@ async def on_startup() -> None:
         n_tags = await TagsRepository(s).upsert_many(INITIAL_TAGS + KLURSI_TAGS)
     logger.info("seeded tags: %d", n_tags)
 
+    # Газеттир из внешнего файла (если задан); битый файл — работаем на встроенном
+    if settings.gazetteer_venues_file:
+        try:
+            gazetteer.reload(Path(settings.gazetteer_venues_file))
+        except (OSError, ValueError) as exc:
+            logger.error("GAZETTEER_VENUES_FILE not loaded, using bundled venues: %s", exc)
+
+    # Кэш таксономии — общий для пайплайна и /tags; сброс по NOTIFY от любой реплики
+    app.state.taxonomy = TaxonomyCache(session_factory, ttl_seconds=settings.taxonomy_ttl_seconds)
+    app.state.taxonomy.listen(engine)
+    # Пространственный индекс карты (/me/map) — лениво, по первому запросу
+    app.state.map_index = MapIndexCache(session_factory, ttl_seconds=settings.map_index_ttl_seconds)
+    # Снимок ленты (/me/feed) — собирается по первому запросу, дальше в фоне
+    app.state.feed_snapshot = (
+        FeedSnapshotCache(session_factory, ttl_seconds=settings.feed_snapshot_ttl_seconds)
+        if settings.feed_snapshot_enabled else None
+    )
+
     app.state.tg_client = TelegramServiceClient(
         settings.telegram_service_url,
         token=settings.telegram_service_token or None,
@@ -86,6 +110,7 @@ async def on_startup() -> None:
         session_factory=session_factory,
         tg_client=app.state.tg_client,
         settings=settings,
+        taxonomy=app.state.taxonomy,
     )
 
     # Push service
@@ -93,6 +118,15 @@ async def on_startup() -> None:
     app.state.push_service = push_svc
     set_push_service(push_svc)
     app.state.processor.push_service = push_svc  # let pipeline trigger fanout
+    app.state.processor.feed_snapshot = app.state.feed_snapshot  # пересборка после ингеста/рангов
+
+    # Очередь пост-обработки (processing_jobs) — воркеры, если включена
+    app.state.pipeline_workers = None
+    if settings.pipeline_workers > 0:
+        app.state.pipeline_workers = PipelineWorkers(
+            app.state.processor, workers=settings.pipeline_workers, batch=settings.pipeline_batch,
+        )
+        app.state.pipeline_workers.start()
 
     # Scheduler — start with current enabled channels
     scheduler = CuratorScheduler(processor=app.state.processor, settings=settings)
@@ -110,6 +144,18 @@ async def on_shutdown() -> None:
     sch = getattr(app.state, "scheduler", None)
     if sch is not None:
         await sch.shutdown()
+    workers = getattr(app.state, "pipeline_workers", None)
+    if workers is not None:
+        await workers.stop()
+    processor = getattr(app.state, "processor", None)
+    if processor is not None:
+        processor.executor.shutdown()
+    taxonomy = getattr(app.state, "taxonomy", None)
+    if taxonomy is not None:
+        await taxonomy.stop()
+    feed_snapshot = getattr(app.state, "feed_snapshot", None)
+    if feed_snapshot is not None:
+        await feed_snapshot.stop()
     engine = getattr(app.state, "engine", None)
     if engine is not None:
         await engine.dispose()
@@ -0,0 +1,104 @@
+"""MinHash + LSH по наборам токенов — кандидаты на «похожие имена» без попарного
+перебора.
+
+Сигнатура набора — num_perm минимумов по независимым хэш-перестановкам; для двух
+наборов доля совпавших минимумов ≈ Jaccard. Сигнатура режется на `bands` полос по
+`rows` значений; пара — кандидат, если совпала хоть одна полоса целиком:
+P(кандидат) = 1 − (1 − J^rows)^bands. Точная мера (`_overlap` в ranking, число
+общих редких токенов в scripts/semantic_dedup_candidates.py) считается уже только
+на кандидатах.
+
+Дефолт rows=1 выбран под меру-вложение (overlap = |A∩B| / min(|A|,|B|)): короткое
+имя целиком внутри длинного даёт высокий overlap при низком Jaccard (3 из 15 →
+J=0.2), а при rows=1 и 32 полосах такой пар пропускается < 0.1%. Непересекающиеся
+наборы не коллидируют никогда (минимум — всегда токен самого набора).
+
+Хэш токена — crc32, а не hash(): сигнатуры воспроизводимы между процессами
+(PYTHONHASHSEED) и прогонами.
+"""
+from __future__ import annotations
+
+import random
+import zlib
+from typing import Any, Hashable, Iterable
+
+_PRIME = (1 << 61) - 1  # Мерсенн: (a·x + b) mod p — семейство перестановок
+_EMPTY = _PRIME
+
+
+class MinHashLSH:
+    """LSH-индекс: insert(key, sig) / query(sig) → ключи-кандидаты.
+
+    Ключи — любые hashable (позиции, id событий). Сигнатуру считает signature()
+    один раз на набор и переиспользует и для запроса, и для вставки."""
+
+    __slots__ = ("bands", "rows", "_perms", "_tok_cache", "_buckets")
+
+    def __init__(self, num_perm: int = 32, bands: int = 32, seed: int = 1) -> None:
+        if num_perm % bands:
+            raise ValueError(f"num_perm={num_perm} не делится на bands={bands}")
+        self.bands = bands
+        self.rows = num_perm // bands
+        rnd = random.Random(seed)
+        self._perms = [(rnd.randrange(1, _PRIME), rnd.randrange(0, _PRIME)) for _ in range(num_perm)]
+        # токен → его значения под всеми перестановками: словарь имён повторяется,
+        # так что сигнатура набора — поэлементный min готовых векторов.
+        self._tok_cache: dict[str, tuple[int, ...]] = {}
+        # ns → по таблице на полосу: {значения полосы: ключ | [ключи]}. При rows=1
+        # ключ таблицы — сам int из сигнатуры (он же лежит в кэше токенов), так
+        # что запись в корзину не плодит новых объектов — на 10k строк × 32
+        # полосы это основная память индекса.
+        self._buckets: dict[Hashable, list[dict[Any, Any]]] = {}
+
+    def signature(self, tokens: Iterable[str]) -> tuple[int, ...]:
+        cache = self._tok_cache
+        vecs = []
+        for t in tokens:
+            v = cache.get(t)
+            if v is None:
+                x = zlib.crc32(t.encode("utf-8"))
+                v = cache[t] = tuple((a * x + b) % _PRIME for a, b in self._perms)
+            vecs.append(v)
+        if not vecs:
+            return (_EMPTY,) * len(self._perms)
+        if len(vecs) == 1:
+            return vecs[0]
+        return tuple(map(min, *vecs))
+
+    def _band_keys(self, sig: tuple[int, ...]) -> Iterable[Any]:
+        r = self.rows
+        if r == 1:
+            return sig
+        return (sig[i * r:(i + 1) * r] for i in range(self.bands))
+
+    def insert(self, key: Hashable, sig: tuple[int, ...], ns: Hashable = None) -> None:
+        """ns — пространство имён (напр. день-бакет): кандидаты ищутся только
+        внутри своего ns, а перестановки и кэш токенов общие."""
+        if sig and sig[0] == _EMPTY:
+            return  # пустой набор ни с чем не похож
+        tables = self._buckets.get(ns)
+        if tables is None:
+            tables = self._buckets[ns] = [{} for _ in range(self.bands)]
+        for table, k in zip(tables, self._band_keys(sig)):
+            hit = table.get(k)
+            if hit is None:
+                table[k] = key  # одиночка — без списка
+            elif type(hit) is list:
+                hit.append(key)
+            else:
+                table[k] = [hit, key]
+
+    def query(self, sig: tuple[int, ...], ns: Hashable = None) -> set[Any]:
+        out: set[Any] = set()
+        tables = self._buckets.get(ns)
+        if tables is None or (sig and sig[0] == _EMPTY):
+            return out
+        for table, k in zip(tables, self._band_keys(sig)):
+            hit = table.get(k)
+            if hit is None:
+                continue
+            if type(hit) is list:
+                out.update(hit)
+            else:
+                out.add(hit)
+        return out
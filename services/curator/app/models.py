@@ -14,6 +14,7 @@ from sqlalchemy import (
     ARRAY,
     BigInteger,
     Boolean,
+    Computed,
     Date,
     DateTime,
     Enum,
@@ -25,6 +26,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     Index,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -104,6 +106,11 @@ class EventCurated(Base):
     __table_args__ = (
         Index("ix_events_status", "status"),
         Index("ix_events_event_time", "event_time"),
+        # Страница площадки (/me/venues/{key}/events): keyset по (старт, id)
+        Index(
+            "ix_events_venue_key", "venue_key", text("coalesce(event_time, event_time_end)"), "id",
+            postgresql_where=text("venue_key IS NOT NULL"),
+        ),
         {"schema": SCHEMA},
     )
 
@@ -115,6 +122,12 @@ class EventCurated(Base):
     event_time_end: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), nullable=True)
     location_text: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
     location_meta: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    # location_meta.venue (ключ газеттира / агент-геокодера) — генерируемая
+    # колонка: её держит в синхроне сам Postgres при любой записи location_meta
+    # (enricher, backfill_geo*), писать её не нужно и нельзя.
+    venue_key: Mapped[Optional[str]] = mapped_column(
+        Text, Computed("location_meta ->> 'venue'", persisted=True), nullable=True
+    )
     price_text: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
     price_kopecks: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     # Human-readable event name, curated (Claude/editor). Falls back to the post's
@@ -136,19 +149,92 @@ class EventCurated(Base):
     #   dup_group_id  — id представителя группы дублей (== своему id для одиночек)
     #   is_primary    — показывать ли эту копию в ленте (одна на группу)
     #   crosspost_count — сколько РАЗНЫХ каналов постили событие (сигнал масштаба)
-    #   rank_score    — порядок «самое интересное вверх»; NULL до пересчёта
+    #   rank_score    — СТАТИЧЕСКАЯ часть «интересности» (авторитет, кросс-посты,
+    #                   качество, одобрение, отмена); NULL до пересчёта. Зависящая
+    #                   от даты часть (близость, «последний шанс») считается в
+    #                   ORDER BY ленты — app.ranking.rank_order_expr
+    #   rank_start_day / rank_close_day — опорные дни группы для этой time-части:
+    #                   ближайший старт и закрытие, дающее «последний шанс» (NULL — нет)
     dup_group_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True, index=True)
     is_primary: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     crosspost_count: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
     rank_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True, index=True)
+    rank_start_day: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    rank_close_day: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     #   dup_override_group — семантический дедуп (LLM/ручной): события с ОДИНАКОВЫМ
     #   значением принудительно склеиваются в одну группу, даже если токен-дедуп их
     #   не взял (разные обёртки одного события, что текст-оверлап не ловит).
     dup_override_group: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True, index=True)
+    #   rank_sig — md5 входов кластеризации на момент последнего пересчёта (см.
+    #   app.ranking._rank_sig_expr). Расхождение с текущим = строка изменилась →
+    #   её день пересчитывается инкрементально. NULL = ещё не ранжировалась/вне ленты.
+    rank_sig: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), default=datetime.utcnow, nullable=False)
+
+
+# ────────────────────────────────────────────────────────────────────
+# Состояние пересчёта ранга (app.ranking) — одна строка (id=1). Водяные знаки
+# инкрементального режима: параметры dHash-проходов и версия формулы скора
+# (смена → полный пересчёт), последняя учтённая запись endorsements (новые
+# одобрения → пересчёт их дней).
+# ────────────────────────────────────────────────────────────────────
+class RankState(Base):
+    __tablename__ = "rank_state"
+    __table_args__ = ({"schema": SCHEMA},)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    params: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # "ham/corrob/vN" последнего прогона
+    # max endorsements.id, уже учтённый. Именно id (порядок вставки), не post_id:
+    # backfill_endorsements дописывает старые посты куратора задним числом.
+    awh_endorsement_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), default=datetime.utcnow, nullable=False)
+
 
+# Одобрения @animalswithhands: ссылки t.me/<канал>/<msg> из постов куратора,
+# извлечённые один раз при инжесте (PipelineProcessor) — ранжирование джойнит
+# по (channel, message_id) вместо regex-прохода по всей истории канала.
+# Разовый залив истории — app.backfill_endorsements.
+class Endorsement(Base):
+    __tablename__ = "endorsements"
+    __table_args__ = (
+        UniqueConstraint("post_id", "channel", "message_id", name="uq_endorsement"),
+        Index("ix_endorsements_target", "channel", "message_id"),
+        {"schema": SCHEMA},
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    post_id: Mapped[int] = mapped_column(BigInteger, ForeignKey(f"{SCHEMA}.posts_raw.id", ondelete="CASCADE"), nullable=False, index=True)
+    channel: Mapped[str] = mapped_column(String(64), nullable=False)  # хэндл без @, lower
+    message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), default=datetime.utcnow, nullable=False)
 
 
+# Журнал прогонов пересчёта: время и число склеек по стадиям (exact, fuzzy,
+# override, pass_a/b/c/d, score, write) — чтобы по медленному или пересклеившему
+# прогону было видно, какой проход виноват. Хранятся последние RANK_RUNS_KEEP.
+class RankRun(Base):
+    __tablename__ = "rank_runs"
+    __table_args__ = (
+        Index("ix_rank_runs_started", "started_at"),
+        {"schema": SCHEMA},
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), default=datetime.utcnow, nullable=False)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), nullable=True)
+    mode: Mapped[str] = mapped_column(String(16), nullable=False)  # full | incremental
+    params: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    rows: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    groups: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    endorsed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    days: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    changed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_s: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    seconds: Mapped[dict[str, float]] = mapped_column(JSON, default=dict, nullable=False)  # стадия → сек
+    merges: Mapped[dict[str, int]] = mapped_column(JSON, default=dict, nullable=False)     # проход → склеек
+
+
 # ────────────────────────────────────────────────────────────────────
 # Tags — taxonomy
 # ────────────────────────────────────────────────────────────────────
@@ -223,6 +309,46 @@ class IngestRun(Base):
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
 
+# ────────────────────────────────────────────────────────────────────
+# Processing jobs — durable очередь пост-обработки (PIPELINE_WORKERS > 0)
+# process: пост из insert_unseen ждёт detect/enrich/classify;
+# fanout:  пуш по авто-одобренному событию (раньше — голый create_task,
+#          терялся при рестарте). Воркеры (app.pipeline.workers) забирают
+#          строки FOR UPDATE SKIP LOCKED; успешные удаляются, упавшие
+#          откладываются с backoff, после PIPELINE_MAX_ATTEMPTS — failed.
+# ────────────────────────────────────────────────────────────────────
+class JobKind(str, enum.Enum):
+    process = "process"
+    fanout = "fanout"
+
+
+class JobStatus(str, enum.Enum):
+    pending = "pending"
+    failed = "failed"
+
+
+class ProcessingJob(Base):
+    __tablename__ = "processing_jobs"
+    __table_args__ = (
+        Index("ix_processing_jobs_claim", "kind", "status", "available_at"),
+        {"schema": SCHEMA},
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    kind: Mapped[JobKind] = mapped_column(Enum(JobKind, name="job_kind", schema=SCHEMA), nullable=False)
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus, name="job_status", schema=SCHEMA),
+        default=JobStatus.pending,
+        nullable=False,
+    )
+    post_id: Mapped[Optional[int]] = mapped_column(BigInteger, ForeignKey(f"{SCHEMA}.posts_raw.id", ondelete="CASCADE"), nullable=True)
+    event_id: Mapped[Optional[int]] = mapped_column(BigInteger, ForeignKey(f"{SCHEMA}.events_curated.id", ondelete="CASCADE"), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), default=datetime.utcnow, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), default=datetime.utcnow, nullable=False)
+
+
 # ────────────────────────────────────────────────────────────────────
 # User-side: interests, feedback, push
 # user_id = backend's users.telegram_id (loose ref, no FK across schemas)
@@ -1,7 +1,14 @@
-"""Keyword-based classifier. Returns tag IDs with confidence."""
+"""Keyword-based classifier. Returns tag IDs with confidence.
+
+All keywords of the taxonomy are compiled once into an Aho-Corasick automaton
+(KeywordAutomaton) — one pass over the post finds every keyword occurrence,
+instead of `kw in text` for each of ~1.7k keywords. The automaton is rebuilt
+when the taxonomy's keywords change (see KeywordClassifier._automaton_for).
+"""
 
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
 
 from app.models import Tag
@@ -14,21 +21,130 @@ class TagAssignment:
     confidence: float  # 0..1
 
 
+TaxonomySignature = tuple[tuple[int, str, tuple[str, ...]], ...]
+
+
+def taxonomy_signature(tags: list[Tag]) -> TaxonomySignature:
+    """То, от чего зависит автомат: (id, key, keywords) каждого тега по порядку."""
+    return tuple((t.id, t.key, tuple(t.keywords or ())) for t in tags)
+
+
+class KeywordAutomaton:
+    """Aho-Corasick по всем (lower-case) ключевым словам таксономии.
+
+    Узел — dict переходов; fail-ссылки и выходы (id ключевых слов, кончающихся
+    в узле, включая суффиксные по fail-цепочке) считаются при сборке. find()
+    проходит текст один раз и возвращает множество найденных слов — ровно
+    `{kw : kw in text}`, перекрытия («кино» внутри «кинотеатр») тоже ловятся."""
+
+    __slots__ = ("_goto", "_fail", "_out", "words")
+
+    def __init__(self, words: list[str]) -> None:
+        self.words = words
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[int]] = [[]]
+        for wid, w in enumerate(words):
+            node = 0
+            for ch in w:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = goto[node][ch] = len(goto)
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(wid)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for node in queue:  # BFS: fail родителя уже посчитан
+            for ch, nxt in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+                queue.append(nxt)
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+
+    def find(self, text: str) -> set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[int] = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+class _CompiledTaxonomy:
+    """Автомат + обратный индекс слово → теги, в которых оно встречается (с
+    кратностью: дубль ключевого слова в теге считается дважды, как раньше)."""
+
+    __slots__ = ("automaton", "word_tags", "tag_sizes", "always")
+
+    def __init__(self, tags: list[Tag]) -> None:
+        index: dict[str, int] = {}
+        word_tags: list[list[int]] = []
+        self.tag_sizes: list[int] = []
+        # Пустое ключевое слово — подстрока любого текста: такие теги матчатся всегда.
+        self.always: Counter[int] = Counter()
+        for ti, tag in enumerate(tags):
+            kws = [kw.lower() for kw in (tag.keywords or [])]
+            self.tag_sizes.append(len(kws))
+            for kw in kws:
+                if not kw:
+                    self.always[ti] += 1
+                    continue
+                wid = index.get(kw)
+                if wid is None:
+                    wid = index[kw] = len(word_tags)
+                    word_tags.append([])
+                word_tags[wid].append(ti)
+        self.automaton = KeywordAutomaton(list(index))
+        self.word_tags = word_tags
+
+
+# Один скомпилированный вариант таксономии на процесс (в пуле PipelineExecutor —
+# на воркер): пересобирается, когда меняются ключевые слова тегов.
+_COMPILED: tuple[TaxonomySignature, _CompiledTaxonomy] | None = None
+
+
 class KeywordClassifier:
+    def __init__(self) -> None:
+        self._last_tags: list[Tag] | None = None
+        self._last: _CompiledTaxonomy | None = None
+
+    def _automaton_for(self, tags: list[Tag]) -> _CompiledTaxonomy:
+        """Тот же список тегов, что в прошлый вызов, — без проверок (батч/
+        reclassify классифицируют много постов по одному списку). Иначе —
+        сверка сигнатуры таксономии с закэшированной и пересборка при
+        расхождении (upsert_tag поменял keywords)."""
+        if tags is self._last_tags and self._last is not None:
+            return self._last
+        global _COMPILED
+        sig = taxonomy_signature(tags)
+        if _COMPILED is None or _COMPILED[0] != sig:
+            _COMPILED = (sig, _CompiledTaxonomy(tags))
+        self._last_tags, self._last = tags, _COMPILED[1]
+        return self._last
+
     def classify(self, text: str, tags: list[Tag]) -> list[TagAssignment]:
         if not text or not tags:
             return []
-        tl = text.lower()
+        compiled = self._automaton_for(tags)
+        counts = Counter(compiled.always)
+        for wid in compiled.automaton.find(text.lower()):
+            counts.update(compiled.word_tags[wid])
         out: list[TagAssignment] = []
-        for tag in tags:
-            kws = [kw.lower() for kw in (tag.keywords or [])]
-            if not kws:
-                continue
-            hits = sum(1 for kw in kws if kw in tl)
-            if hits == 0:
-                continue
+        for ti in sorted(counts):
+            tag = tags[ti]
+            hits = counts[ti]
             # Confidence: 0.4 floor + (matches / total_keywords) * 0.6, capped at 1.0
-            conf = min(1.0, 0.4 + (hits / max(1, len(kws))) * 0.6)
+            conf = min(1.0, 0.4 + (hits / max(1, compiled.tag_sizes[ti])) * 0.6)
             out.append(TagAssignment(tag_id=tag.id, tag_key=tag.key, confidence=round(conf, 3)))
         return out
 
@@ -63,7 +179,8 @@ _CINEMA_FAMILY: frozenset[str] = frozenset({
 
 
 def apply_cinema_venue_default(
-    handle: str, assignments: list[TagAssignment], tags: list[Tag]
+    handle: str, assignments: list[TagAssignment], tags: list[Tag],
+    by_key: dict[str, Tag] | None = None,
 ) -> list[TagAssignment]:
     """Для kino-venue каналов И только если пост реально про кино: оставить лишь
     теги кино-домена (`_CINEMA_FAMILY`) и гарантировать cinema+киноклуб. Так
@@ -71,14 +188,16 @@ def apply_cinema_venue_default(
     «лекция»/«театр» (обсуждение), «литература» (сюжет) — что вылезал ложным
     чипом вместо «киноклуб». Гейт по киносигналу важен для смешанных площадок
     (Невротик/DFF: кино + вечеринки + ужины) — не-кино посты не трогаем. Для
-    прочих каналов / постов без киносигнала — no-op."""
+    прочих каналов / постов без киносигнала — no-op. by_key — готовый индекс
+    tags по key (снимок таксономии / батч), иначе строится здесь."""
     h = (handle or "").lstrip("@").lower()
     if h not in CINEMA_VENUE_CHANNELS:
         return assignments
     keys = {a.tag_key for a in assignments}
     if keys.isdisjoint(_CINEMA_FAMILY):
         return assignments  # не кино (вечеринка/ужин/лекция на смешанной площадке)
-    by_key = {t.key: t for t in tags}
+    if by_key is None:
+        by_key = {t.key: t for t in tags}
     kept = [a for a in assignments if a.tag_key in _CINEMA_FAMILY]
     have = {a.tag_key for a in kept}
     for key, conf in _CINEMA_FORCE:
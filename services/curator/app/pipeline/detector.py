@@ -108,11 +108,15 @@ ROUNDUP_KW: Pattern[str] = re.compile(
 
 def looks_like_digest(text: str) -> bool:
     """True if the post is a multi-event roundup, not a single event."""
-    urls = len(URL_RE.findall(text))
-    weekdays = len({w.lower()[:4] for w in WEEKDAY.findall(text)})
-    dates = len(DATE_DD_MONTH.findall(text)) + len(DATE_DD_MM.findall(text))
-    if ROUNDUP_KW.search(text):
+    return _digest(_Scan(text))
+
+
+def _digest(sc: _Scan) -> bool:
+    if sc.any(ROUNDUP_KW):
         return True
+    urls = len(sc.matches(URL_RE))
+    weekdays = len({m.group(1).lower()[:4] for m in sc.matches(WEEKDAY)})
+    dates = len(sc.matches(DATE_DD_MONTH)) + len(sc.matches(DATE_DD_MM))
     if urls >= 5:  # a single event rarely carries 5+ distinct links
         return True
     if weekdays >= 4:  # 4+ different weekdays enumerated = a week plan
@@ -192,9 +196,90 @@ POLITICAL: Pattern[str] = re.compile(
 )
 
 
+# ── Scanner: один разбор текста на все признаки ────────────────────
+# detect_event и looks_* раньше гоняли каждый паттерн заново (DATE_* — по три
+# раза, VENUE_* — search + finditer), а тяжёлые словарные альтернации
+# (POLITICAL, OTHER_CITY, NON_EVENT, ROUNDUP_KW) — по всему тексту на каждый
+# пост. _Scan держит text.lower() и кэш матчей: каждый паттерн прогоняется не
+# больше одного раза, а словарный — только если в тексте есть хоть один его
+# литеральный корень (_STEMS: необходимое условие совпадения, проверка
+# `in` по lower() — в C и почти бесплатна). Слить всё в одну альтернацию
+# нельзя без смены семантики: признаки перекрываются (TIME_RANGE ⊃ TIME_HHMM,
+# «12.05» vs «12:05», метро/улица/заведение), а finditer по общей альтернации
+# отдаёт только непересекающиеся куски.
+_STEMS: dict[int, tuple[str, ...]] = {id(p): stems for p, stems in (
+    (POLITICAL, (
+        "политз", "узник", "антивоенн", "войны", "навальн", "фбк", "умное", "ходорковск",
+        "pussy", "пусси", "овд", "пикет", "митинг", "протест", "антиправительств", "сво",
+        "спецоперац", "мобилизац", "донбасс", "днр", "лнр", "новоросси", "патриот",
+        "военкор", "агент", "лгбт", "парад", "прайд", "pride", "драг", "трансгендер",
+    )),
+    (OTHER_CITY, (
+        "санкт", "спб", "питер", "дзержинск", "хотьково", "завидово", "мытищ", "капустино",
+        "тюмен", "омск", "новосибирск", "томск", "новгород", "екатеринбург", "казан", "сочи",
+        "калининград", "владивосток", "краснодар", "уф", "перм", "ростов", "воронеж",
+        "самар", "волгоград", "ярославл", "твер", "мордови", "татарстан", "башкортостан",
+        "удмурт", "карели",
+    )),
+    (MOSCOW_HINT, ("москв", "мск", "подмосков")),
+    (NON_EVENT, ("заяв", "прием", "набор", "резиденц", "open", "опен", "дедлайн", "приёма")),
+    (ROUNDUP_KW, ("#", "недел", "подборк", "дайджест", "каналы", "продолжение", "посетить")),
+    (BROADCAST, ("vtrnk", "втрнк", "радиошоу", "radioshow")),
+    (URL_RE, ("http", "t.me/", "instagram.com", "vk.", "timepad.ru", "telegra.ph", "teatr.mos.ru")),
+    (VENUE_LINK, ("t.me/", "yandex.", "2gis.ru", "maps.google", "goo.gl/maps")),
+    (TIME_HHMM, (":",)),
+    (TIME_RANGE, (":",)),
+    (TIME_VERBAL, ("час", "утра", "дня", "вечера", "ночи")),
+    (WEEKDAY, ("понедельник", "вторник", "сред", "четверг", "пятниц", "суббот", "воскресень")),
+    (RELATIVE_DAY, ("сегодня", "завтра", "неделе", "выходных")),
+    (VENUE_METRO, ("м.", "метро")),
+    (VENUE_GARDEN, ("сад", "парк")),
+    (ACTION_VERBS, (
+        "пройд", "состоится", "приглаш", "открыти", "начало", "начн", "стартует", "жд",
+        "устраиваем", "организуем", "показы", "концерт", "вечер", "спектакль",
+    )),
+    (REGISTRATION, ("регистр", "предварительн", "вход", "билет", "ссылке", "записыв")),
+)}
+
+
+class _Scan:
+    """Ленивый разбор одного текста: matches(p) — все finditer-матчи p (один
+    прогон на паттерн), any(p) — есть ли хоть один (search, тоже с кэшем).
+    low — только для проверки корней `in`: смещения матчей относятся к text."""
+
+    __slots__ = ("text", "low", "_all", "_any")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.low = text.lower()
+        # Ключ — id(паттерна): hash(re.Pattern) каждый раз хэширует весь
+        # байткод регэкспа, на POLITICAL это дороже самой проверки корней.
+        self._all: dict[int, list[re.Match[str]]] = {}
+        self._any: dict[int, bool] = {}
+
+    def _gated(self, key: int) -> bool:
+        stems = _STEMS.get(key)
+        return stems is not None and not any(st in self.low for st in stems)
+
+    def matches(self, p: Pattern[str]) -> list[re.Match[str]]:
+        key = id(p)
+        ms = self._all.get(key)
+        if ms is None:
+            ms = self._all[key] = [] if self._gated(key) else list(p.finditer(self.text))
+            self._any[key] = bool(ms)
+        return ms
+
+    def any(self, p: Pattern[str]) -> bool:
+        key = id(p)
+        hit = self._any.get(key)
+        if hit is None:
+            hit = self._any[key] = False if self._gated(key) else p.search(self.text) is not None
+        return hit
+
+
 def looks_political(text: str) -> bool:
     """Политическая / антиправительственная «запрещёнка» — не для ленты."""
-    return bool(POLITICAL.search(text))
+    return _Scan(text).any(POLITICAL)
 
 
 def looks_out_of_moscow(text: str) -> bool:
@@ -202,11 +287,17 @@ def looks_out_of_moscow(text: str) -> bool:
     the city is not merely an artist's ORIGIN («фотограф из Казани», «группа из
     Новосибирска»), which describes a touring guest at a Moscow event, not where
     it happens."""
-    if MOSCOW_HINT.search(text):
+    return _out_of_moscow(_Scan(text))
+
+
+def _out_of_moscow(sc: _Scan) -> bool:
+    if sc.any(MOSCOW_HINT):
         return False
-    for m in OTHER_CITY.finditer(text):
+    for m in sc.matches(OTHER_CITY):
         # «из <город>» = откуда артист/автор, а не где событие → пропускаем матч.
-        if text[max(0, m.start() - 4):m.start()].lower().endswith("из "):
+        # Срез — по text (смещения матча — от него): lower() может сменить
+        # длину строки («İ» → 2 символа), и индексы в low разъедутся.
+        if sc.text[max(0, m.start() - 4):m.start()].lower().endswith("из "):
             continue
         return True
     return False
@@ -214,18 +305,20 @@ def looks_out_of_moscow(text: str) -> bool:
 
 def looks_like_non_event(text: str) -> bool:
     """Application call / course enrolment — has a date but isn't attendable."""
-    return bool(NON_EVENT.search(text))
+    return _Scan(text).any(NON_EVENT)
 
 
 def looks_like_broadcast(text: str) -> bool:
     """Online radio show / stream (not an attendable city event). Rejected only
     when NO physical venue is named — a real party that's also streamed keeps its
     bar/street/metro cue and passes."""
-    if not BROADCAST.search(text):
+    return _broadcast(_Scan(text))
+
+
+def _broadcast(sc: _Scan) -> bool:
+    if not sc.any(BROADCAST):
         return False
-    has_venue = bool(
-        VENUE_STREET.search(text) or VENUE_METRO.search(text) or VENUE_INSTITUTION.search(text)
-    )
+    has_venue = sc.any(VENUE_STREET) or sc.any(VENUE_METRO) or sc.any(VENUE_INSTITUTION)
     return not has_venue
 
 
@@ -260,28 +353,29 @@ class DetectionResult:
 def detect_event(text: str) -> DetectionResult:
     if not text:
         return DetectionResult(0, [], DetectionHits())
+    sc = _Scan(text)
 
     # Политическая «запрещёнка» — проверяем ПЕРВОЙ, чтобы флаг ставился всегда,
     # даже если пост заодно похож на дайджест/др. Процессор отправит в rejected.
-    if looks_political(text):
+    if sc.any(POLITICAL):
         return DetectionResult(0, ["political"], DetectionHits(), political=True)
 
     # Digest / roundup posts (a week's worth of events in one message) score
     # high on every signal — reject before scoring so they never surface as a
     # single event.
-    if looks_like_digest(text):
+    if _digest(sc):
         return DetectionResult(0, ["digest"], DetectionHits())
 
     # Not a Moscow event → reject (aggregators repost other cities' events).
-    if looks_out_of_moscow(text):
+    if _out_of_moscow(sc):
         return DetectionResult(0, ["out_of_moscow"], DetectionHits())
 
     # Application call / enrolment → reject (dated but not attendable).
-    if looks_like_non_event(text):
+    if sc.any(NON_EVENT):
         return DetectionResult(0, ["non_event"], DetectionHits())
 
     # Online radio show / stream without a venue → reject (not attendable).
-    if looks_like_broadcast(text):
+    if _broadcast(sc):
         return DetectionResult(0, ["broadcast"], DetectionHits())
 
     hits = DetectionHits()
@@ -289,77 +383,68 @@ def detect_event(text: str) -> DetectionResult:
     reasons: list[str] = []
 
     # Date — DD month or DD.MM
-    m_dm = DATE_DD_MONTH.findall(text)
-    m_dd = DATE_DD_MM.findall(text)
+    m_dm = sc.matches(DATE_DD_MONTH)
+    m_dd = sc.matches(DATE_DD_MM)
     if m_dm or m_dd:
         score += 3
         reasons.append("date")
-        for m in DATE_DD_MONTH.finditer(text):
-            hits.date.append(m.group(0))
-        for m in DATE_DD_MM.finditer(text):
-            hits.date.append(m.group(0))
+        hits.date.extend(m.group(0) for m in m_dm)
+        hits.date.extend(m.group(0) for m in m_dd)
 
     # Time
-    times = TIME_HHMM.findall(text)
-    if times:
+    if (times := sc.matches(TIME_HHMM)):
         score += 2
         reasons.append("time")
-        for m in TIME_HHMM.finditer(text):
-            hits.time.append(m.group(0))
-        if TIME_RANGE.search(text):
+        hits.time.extend(m.group(0) for m in times)
+        if sc.any(TIME_RANGE):
             score += 1
             hits.time_range = True
             reasons.append("time_range")
-    elif TIME_VERBAL.search(text):
+    elif sc.any(TIME_VERBAL):
         score += 2
         reasons.append("time_verbal")
 
     # Weekday
-    if (m := WEEKDAY.findall(text)):
+    if (m := sc.matches(WEEKDAY)):
         score += 1
         reasons.append("weekday")
-        hits.weekday.extend(m)
+        hits.weekday.extend(x.group(1) for x in m)
 
     # Relative day
-    if (rel := RELATIVE_DAY.findall(text)):
+    if (rel := sc.matches(RELATIVE_DAY)):
         score += 1
         reasons.append("relative_day")
-        hits.relative_day.extend(rel)
+        hits.relative_day.extend(x.group(1) for x in rel)
 
     # Venue
     venue_score = 0
-    if VENUE_METRO.search(text):
+    if (metro := sc.matches(VENUE_METRO)):
         venue_score = 2
-        for m in VENUE_METRO.finditer(text):
-            hits.venues.append(m.group(0).strip())
-    elif VENUE_STREET.search(text):
+        hits.venues.extend(m.group(0).strip() for m in metro)
+    elif (street := sc.matches(VENUE_STREET)):
         venue_score = 2
-        for m in VENUE_STREET.finditer(text):
-            hits.venues.append(m.group(0).strip())
+        hits.venues.extend(m.group(0).strip() for m in street)
     else:
         # A named garden/park is a proper venue name — take it before the bare
         # institution word so «Сад им. Баумана» wins over a stray «театр».
-        for m in VENUE_GARDEN.finditer(text):
-            hits.venues.append(m.group(0).strip())
-        if VENUE_INSTITUTION.search(text):
-            for m in VENUE_INSTITUTION.finditer(text):
-                hits.venues.append(m.group(0).strip())
+        hits.venues.extend(m.group(0).strip() for m in sc.matches(VENUE_GARDEN))
+        hits.venues.extend(m.group(0).strip() for m in sc.matches(VENUE_INSTITUTION))
         if hits.venues:
             venue_score = 1
-    if VENUE_LINK.search(text):
+    if sc.any(VENUE_LINK):
         venue_score = max(venue_score, 1)
     if venue_score:
         score += venue_score
         reasons.append(f"venue:{venue_score}")
 
     # Action
-    if (m := ACTION_VERBS.findall(text)):
+    if (m := sc.matches(ACTION_VERBS)):
         score += 1
         reasons.append("action")
-        hits.actions.extend(m)
+        hits.actions.extend(x.group(0) for x in m)
 
     # Registration
-    if REGISTRATION.search(text):
+    if sc.any(REGISTRATION):
         score += 1
         reasons.append("registration")
         hits.registration = True
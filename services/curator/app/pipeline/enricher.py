@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
 import dateparser
@@ -31,12 +32,68 @@ class EnrichmentResult:
     price_kopecks: Optional[int]
 
 
+@dataclass
+class DateParseStats:
+    """Счётчики _parse_dt на процесс (в пуле PipelineExecutor — на воркер):
+    попадания/промахи LRU и, среди промахов, сколько разобрал быстрый путь,
+    а сколько ушло в dateparser."""
+    cache_hits: int = 0
+    cache_misses: int = 0
+    fast: int = 0
+    fallback: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else 0.0
+
+    def describe(self) -> str:
+        return (
+            f"date cache: hits={self.cache_hits} misses={self.cache_misses} "
+            f"({self.hit_rate:.0%}) fast={self.fast} dateparser={self.fallback}"
+        )
+
+
+DATE_PARSE_STATS = DateParseStats()
+
+# LRU (snippet, день поста) → datetime | None. Кросс-посты и репосты одного
+# анонса, а тем более backfill_*_dates по всей истории, разбирают одни и те же
+# сниппеты. Ключ по КАЛЕНДАРНОМУ дню годится, только если результат не зависит
+# от времени суток base (см. _day_stable); иначе ключ — полный base.
+DATE_CACHE_SIZE = 4096
+_DATE_CACHE: OrderedDict[tuple[str, object], datetime | None] = OrderedDict()
+
+
 def _parse_dt(snippet: str, base: datetime | None = None) -> datetime | None:
-    """Parse a snippet near `base` date (defaults to now). Direction = future preferred."""
+    """Parse a snippet near `base` date (defaults to now). Direction = future preferred.
+
+    Memoized (_DATE_CACHE) on the normalized snippet + the post's day. Known
+    shapes go through _fast_parse_dt (same result, no dateparser); the rest
+    falls back to dateparser."""
+    base = base or datetime.utcnow()
+    snippet = " ".join(snippet.lower().split())
+    key = (snippet, base.date() if _day_stable(snippet, base) else base)
+    if key in _DATE_CACHE:
+        _DATE_CACHE.move_to_end(key)
+        DATE_PARSE_STATS.cache_hits += 1
+        return _DATE_CACHE[key]
+    DATE_PARSE_STATS.cache_misses += 1
+    dt = _parse_dt_uncached(snippet, base)
+    _DATE_CACHE[key] = dt
+    if len(_DATE_CACHE) > DATE_CACHE_SIZE:
+        _DATE_CACHE.popitem(last=False)
+    return dt
+
+
+def _parse_dt_uncached(snippet: str, base: datetime) -> datetime | None:
+    if (dt := _fast_parse_dt(snippet, base)) is not None:
+        DATE_PARSE_STATS.fast += 1
+        return dt
+    DATE_PARSE_STATS.fallback += 1
     settings = {
         "PREFER_DATES_FROM": "future",
         "DATE_ORDER": "DMY",
-        "RELATIVE_BASE": base or datetime.utcnow(),
+        "RELATIVE_BASE": base,
     }
     return dateparser.parse(snippet, languages=["ru"], settings=settings)
 
@@ -109,6 +166,105 @@ def _strip_ordinal(snippet: str | None) -> str | None:
     return _ORDINAL_RE.sub(r"\1", snippet)
 
 
+# ── Fast path: the snippet shapes the detector/normalizers produce ─────
+# dateparser стоит миллисекунды на вызов и съедает основное время энричера, а
+# сниппеты у нас почти всегда одной из известных форм: «D <месяц>[ 20YY]»
+# (в т.ч. после _numeric_ddmm_to_words / _strip_ordinal), «DD.MM.20YY» (после
+# _expand_two_digit_year), сегодня/завтра/послезавтра, день недели — плюс
+# необязательное «HH:MM». Для них повторяем семантику dateparser с
+# PREFER_DATES_FROM=future один в один (сверено по сетке баз/сниппетов):
+#   • дата без года: ближайшее вхождение СТРОГО после base (≤ base → год +1);
+#   • день недели: ближайший такой день строго после сегодняшнего;
+#   • только время: сегодня, а если уже прошло (< base) — завтра;
+#   • сегодня/завтра без времени сохраняют время base.
+# Чего нет в словарях (редкие падежи/сокращения, «на выходных»), невалидные
+# дата/время — None, т.е. в dateparser.
+_FAST_MONTHS: dict[str, int] = {
+    **{w: i for i, w in enumerate(_MONTHS_GEN) if w},
+    **{w: i for i, w in enumerate((
+        "", "январь", "февраль", "март", "апрель", "май", "июнь",
+        "июль", "август", "сентябрь", "октябрь", "ноябрь", "декабрь",
+    )) if w},
+    "янв": 1, "фев": 2, "мар": 3, "апр": 4, "июн": 6, "июл": 7, "авг": 8,
+    "сен": 9, "сент": 9, "окт": 10, "ноя": 11, "нояб": 11, "дек": 12,
+}
+_FAST_WEEKDAYS: dict[str, int] = {
+    "понедельник": 0, "вторник": 1, "среда": 2, "среду": 2, "четверг": 3,
+    "пятница": 4, "пятницу": 4, "суббота": 5, "субботу": 5, "воскресенье": 6,
+}
+_FAST_RELATIVE: dict[str, int] = {"сегодня": 0, "завтра": 1, "послезавтра": 2}
+_FAST_RE: re.Pattern[str] = re.compile(
+    r"\s*(?:"
+    r"(?P<d>\d{1,2})\s*(?P<mon>[а-я]+)(?:\s+(?P<y>20\d{2}))?"
+    r"|(?P<nd>\d{1,2})(?P<sep>[./])(?P<nm>\d{1,2})(?P=sep)(?P<ny>20\d{2})"
+    r"|(?P<word>[а-я]+)"
+    r")?\s*(?:(?P<h>\d{1,2}):(?P<mi>\d{2}))?\s*"
+)
+
+
+def _fast_parse_dt(snippet: str, base: datetime) -> datetime | None:
+    """dateparser-совместимый разбор известных форм; None — форма не наша."""
+    m = _FAST_RE.fullmatch(snippet.lower())
+    if m is None or not snippet.strip():
+        return None
+    hour = minute = None
+    if m["h"] is not None:
+        hour, minute = int(m["h"]), int(m["mi"])
+        if hour > 23 or minute > 59:
+            return None
+    hm = {"hour": hour or 0, "minute": minute or 0, "second": 0, "microsecond": 0}
+    try:
+        if m["d"] is not None or m["nd"] is not None:
+            if m["d"] is not None:
+                month = _FAST_MONTHS.get(m["mon"])
+                if month is None:
+                    return None
+                day, year = int(m["d"]), m["y"]
+            else:
+                day, month, year = int(m["nd"]), int(m["nm"]), m["ny"]
+            if year is not None:
+                return datetime(int(year), month, day, **hm)
+            dt = datetime(base.year, month, day, **hm)
+            return dt if dt > base else dt.replace(year=base.year + 1)
+        if m["word"] is not None:
+            w = m["word"]
+            if w in _FAST_RELATIVE:
+                day0 = base + timedelta(days=_FAST_RELATIVE[w])
+                return day0 if hour is None else day0.replace(**hm)
+            wd = _FAST_WEEKDAYS.get(w)
+            if wd is None:
+                return None
+            ahead = (wd - base.weekday()) % 7 or 7
+            return (base + timedelta(days=ahead)).replace(**hm)
+        if hour is None:
+            return None
+        dt = base.replace(**hm)
+        return dt if dt >= base else dt + timedelta(days=1)
+    except ValueError:  # 31 февраля, 29 февраля не в високосный и т.п.
+        return None
+
+
+def _day_stable(snippet: str, base: datetime) -> bool:
+    """Результат для snippet одинаков при любом времени суток base (значит,
+    кэшировать можно по дню)? Да — для явного года, дня недели и «завтра
+    HH:MM»; для даты без года — если это не сегодняшнее число (сегодняшнее
+    «22 июля 13:00» до 13:00 — этот год, после — следующий). Голое время,
+    «сегодня» без времени и всё, что не разбирает быстрый путь, — нет."""
+    m = _FAST_RE.fullmatch(snippet)
+    if m is None:
+        return False
+    if m["y"] is not None or m["ny"] is not None:
+        return True
+    if m["d"] is not None:
+        month = _FAST_MONTHS.get(m["mon"])
+        return month is not None and (int(m["d"]), month) != (base.day, base.month)
+    if m["word"] is not None:
+        if m["word"] in _FAST_WEEKDAYS:
+            return True
+        return m["word"] in _FAST_RELATIVE and m["h"] is not None
+    return False
+
+
 # ── Weekday-as-date («в субботу … 23:00») ──────────────────────────────
 # Афиши баров/вечеринок часто не пишут числовую дату в тексте (она на картинке),
 # а дают день недели: «в эту субботу». Детектор ловит его в hits.weekday, но
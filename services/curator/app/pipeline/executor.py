@@ -0,0 +1,154 @@
+"""Исполнитель текстовых стадий пайплайна: detect → enrich → classify.
+
+Стадии — чистый CPU без БД (регэкспы, dateparser до четырёх раз на пост), и
+в event loop куратора они стопорят API/вебхук, пока POLL_CONCURRENCY каналов
+в работе. PipelineExecutor гоняет их пачкой в ProcessPoolExecutor: туда
+уезжают PostInput/TagSpec, обратно — PostAnalysis (простые датаклассы, без
+ORM-объектов). Режим inline считает прямо в loop — детерминированно, для
+тестов/CLI. Время по стадиям копится в PipelineExecutor.seconds и
+возвращается с каждой пачкой. С пачкой едет версия газеттира родителя —
+воркер после POST /admin/gazetteer/reload перечитывает его сам (gazetteer.sync).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from app.models import EventStatus
+from app.pipeline import gazetteer
+from app.pipeline.classifier import KeywordClassifier, apply_cinema_venue_default
+from app.pipeline.detector import DetectionResult, detect_event
+from app.pipeline.enricher import EnrichmentResult, enrich_event
+
+STAGES = ("detect", "enrich", "classify")
+
+
+@dataclass(slots=True)
+class PostInput:
+    post_id: int
+    text: str
+    handle: str
+    published_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class TagSpec:
+    """То, что классификатору нужно от Tag (duck-typed: id/key/keywords)."""
+    id: int
+    key: str
+    keywords: list[str]
+
+
+@dataclass
+class PostAnalysis:
+    """Разбор одного поста до записи: status=None — не событие (не храним);
+    error — стадия упала на этом посте (соседи по пачке не страдают)."""
+    post_id: int
+    detection: Optional[DetectionResult] = None
+    enrichment: Optional[EnrichmentResult] = None
+    status: Optional[EventStatus] = None
+    tags: list[tuple[int, float]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _analyze_one(p: PostInput, tags: list[TagSpec], by_key: dict[str, TagSpec],
+                 classifier: KeywordClassifier, seconds: dict[str, float]) -> PostAnalysis:
+    t0 = time.perf_counter()
+    detection = detect_event(p.text)
+    t1 = time.perf_counter()
+    seconds["detect"] += t1 - t0
+    # Политические/антиправительственные ивенты («запрещёнка») — НЕ в
+    # ленту. Сохраняем как rejected (аудит в админке, вкладка Rejected),
+    # но не публикуем и не шлём пуш. Юр-риск для РФ-аудитории.
+    if not detection.political and not detection.is_event_review:
+        return PostAnalysis(p.post_id, detection)
+    enrichment = enrich_event(
+        p.text, detection.hits, published_at=p.published_at, channel_handle=p.handle
+    )
+    t2 = time.perf_counter()
+    seconds["enrich"] += t2 - t1
+    if detection.political:
+        return PostAnalysis(p.post_id, detection, enrichment, EventStatus.rejected)
+    status = (
+        EventStatus.approved
+        if detection.is_event_auto
+        else EventStatus.manual_review
+    )
+    # Classify (+ venue-default: alt-cinema каналы → cinema+киноклуб,
+    # снятие ложных лекция/театр по каналу-источнику)
+    assignments = classifier.classify(p.text, tags)
+    assignments = apply_cinema_venue_default(p.handle, assignments, tags, by_key)
+    seconds["classify"] += time.perf_counter() - t2
+    return PostAnalysis(
+        p.post_id, detection, enrichment, status, [(a.tag_id, a.confidence) for a in assignments]
+    )
+
+
+def analyze_batch(
+    posts: list[PostInput], tags: list[TagSpec],
+    gazetteer_version: tuple[str, Path] | None = None,
+) -> tuple[list[PostAnalysis], dict[str, float]]:
+    """Точка входа воркера пула: разобрать пачку. Возвращает (разборы в порядке
+    posts, секунды по стадиям). gazetteer_version — (digest, path) справочника
+    площадок у родителя."""
+    if gazetteer_version is not None:
+        gazetteer.sync(*gazetteer_version)
+    classifier = KeywordClassifier()
+    by_key = {t.key: t for t in tags}
+    seconds = dict.fromkeys(STAGES, 0.0)
+    out: list[PostAnalysis] = []
+    for p in posts:
+        try:
+            out.append(_analyze_one(p, tags, by_key, classifier, seconds))
+        except Exception as e:  # noqa: BLE001 — один пост не роняет пачку
+            out.append(PostAnalysis(p.post_id, error=f"{type(e).__name__}: {e!s}"))
+    return out, seconds
+
+
+class PipelineExecutor:
+    """Где считать analyze_batch: pool=None → прямо в текущем event loop."""
+
+    def __init__(self, pool: Executor | None = None) -> None:
+        self.pool = pool
+        self.seconds = dict.fromkeys(STAGES, 0.0)  # накопленное с запуска
+        self.posts = 0
+
+    async def analyze(
+        self, posts: list[PostInput], tags: list[TagSpec],
+    ) -> tuple[list[PostAnalysis], dict[str, float]]:
+        if not posts:
+            return [], dict.fromkeys(STAGES, 0.0)
+        if self.pool is None:
+            out, seconds = analyze_batch(posts, tags)
+        else:
+            gaz = gazetteer.current()
+            loop = asyncio.get_running_loop()
+            out, seconds = await loop.run_in_executor(
+                self.pool, analyze_batch, posts, tags, (gaz.digest, gaz.path)
+            )
+        for k, v in seconds.items():
+            self.seconds[k] += v
+        self.posts += len(posts)
+        return out, seconds
+
+    def shutdown(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+
+def make_pipeline_executor(mode: str, workers: int = 2) -> PipelineExecutor:
+    """По PIPELINE_EXECUTOR: "process" → пул из workers процессов (spawn, как у
+    make_rank_executor: форк с живым event loop небезопасен), иначе inline."""
+    if mode != "process":
+        return PipelineExecutor()
+    return PipelineExecutor(
+        ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn"))
+    )
@@ -11,8 +11,13 @@ API-ключей: координаты каждой площадки вывер
   2) HANDLE канала-источника → дефолтная локация этой площадки (канал
      площадки почти всегда постит про своё же здание).
 
-Расширять по мере появления новых площадок: добавить запись в VENUES с
-handle и/или отличительными алиасами.
+Расширять по мере появления новых площадок: добавить запись в
+app/data/venues.json (key, lat, lng, handles и/или отличительные aliases) и
+перечитать без деплоя — POST /admin/gazetteer/reload (reload()): файл
+проверяется целиком и собирается в новый AliasIndex, который подменяет
+текущий одним присваиванием; при ошибке остаётся прежний. Пины, которые
+правка сдвинула, пересчитывает
+`python -m app.backfill_geo_regeocode --venues <ключи>`.
 
 ⚠️ АЛИАС — ЭТО НЕ НАЗВАНИЕ, А ПОИСКОВЫЙ ЗАПРОС ПО ТЕКСТУ ПОСТА.
 Матч срабатывает, если алиас встречается где угодно в посте как отдельные слова.
@@ -26,16 +31,25 @@ handle и/или отличительными алиасами.
 не «sound», а «клуб sound»; не «москва», а «остров мечты». Если различающей
 формы нет — лучше вообще без алиаса (матч по handle канала), потому что
 НЕВЕРНАЯ геометка хуже её отсутствия.
-Обычные слова из GENERIC_ALIAS_STOPLIST запрещены и роняют импорт модуля —
-это намеренно: такую ошибку надо ловить на деплое, а не в проде на карте.
+Обычные слова из GENERIC_ALIAS_STOPLIST запрещены: в файле из репозитория они
+роняют импорт модуля — это намеренно, такую ошибку надо ловить на деплое, а
+не в проде на карте; при reload() — отклоняют новый файл.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 import re
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
+VENUES_FILE = Path(__file__).resolve().parents[1] / "data" / "venues.json"
+
 
 @dataclass(frozen=True)
 class Venue:
@@ -58,180 +72,6 @@ def _norm(s: str) -> str:
     return re.sub(r"\s+", " ", re.sub(r"[^0-9a-zа-я ]+", " ", s)).strip()
 
 
-# Выверенные вручную площадки (координаты — до здания). Волны geo_channels 1–3.
-VENUES: tuple[Venue, ...] = (
-    Venue("ges2", 55.7407, 37.6107, ("@vacges2",),
-          ("гэс-2", "ges-2", "дом культуры гэс 2", "болотная набережная 15")),
-    Venue("garage", 55.7287, 37.6017, ("@garagemca",),
-          ("музей гараж", "garage museum", "крымский вал 9")),
-    Venue("mmoma", 55.7669, 37.6147, ("@mmoma",),
-          ("mmoma", "ммома", "московский музей современного искусства", "петровка 25")),
-    Venue("rodchenko", 55.7818, 37.6680, ("@rodchenkoartschool",),
-          ("школа родченко", "rodchenko")),
-    Venue("zverev", 55.7720, 37.6840, ("@zverevcenter",),
-          ("зверевский центр", "новорязанская 29")),
-    Venue("fabrika", 55.7805, 37.6720, ("@cci_fabrika",),
-          ("цти фабрика", "переведеновский 18")),
-    Venue("nekrasovka", 55.7710, 37.6790, ("@nekrasovkalibrary",),
-          ("библиотека некрасова", "библиотека некрасовка",)),
-    Venue("zotov", 55.7770, 37.5540, ("@centrezotov",),
-          ("центр зотов", "зотов", "ходынская 2")),
-    Venue("pokrovka27", 55.7600, 37.6470, ("@pokrovka27",),
-          ("покровка 27", "кц покровские ворота",)),
-    Venue("stoyania", 55.7565, 37.6440, ("@stoyania",),
-          ("хохловские стояния", "хохловская площадь",)),
-    Venue("rgbm", 55.7960, 37.7150, ("@rgubru",),
-          ("ргбм", "библиотека для молодежи", "черкизовская 4")),
-    Venue("kholmy", 55.7380, 37.6450, ("@kholmygallery",),
-          ("краснохолмская галерея", "галерея краснохолмская")),
-    Venue("jaoda", 55.7540, 37.6330, ("@jao_da_official",),
-          ("джао да", "jao da")),
-    Venue("tsaritsyno", 55.6157, 37.6869, ("@tsaritsyno_museum",),
-          ("царицыно", "дольская 1")),
-    Venue("vdnh", 55.8264, 37.6377, ("@vdnh_moscow",),
-          ("вднх",)),
-    Venue("jewish", 55.7935, 37.6045, ("@jewishmuseum",),
-          ("еврейский музей", "музей толерантности", "образцова 11")),
-    Venue("a3", 55.7476, 37.5936, ("@a3gallery",),
-          ("галерея а3", "староконюшенный 39",)),
-    Venue("openklub", 55.7594, 37.5946, ("@openklub",),
-          ("спиридоновка 9", "галерея открытый клуб",)),
-    Venue("stradarium", 55.7700, 37.6810, ("@stradarium1",),
-          ("страдариум",)),
-    # РанДом Культуры — Б. Николопесковский пер., 13 (м. Смоленская)
-    Venue("random_culture", 55.750955, 37.589662, ("@random_culture",),
-          ("рандом культуры", "большой николопесковский переулок 13", "николопесковский переулок 13")),
-    Venue("mo_yeti", 55.7820, 37.7055, ("@mo_yeti",)),
-    Venue("splyu", 55.7870, 37.4480, ("@splyuivizhuu",)),
-    Venue("bestiarii", 55.7320, 37.6647, ("@ago_shvd_shtil_bestiarii",)),
-    # ── Волна 4: авто-извлечение из постов + веб-геокодинг (агенты, 2026-07) ──
-    Venue("zorka", 55.70797, 37.54576, (), ("ZORKA", "ZORKA (Zorka Panoramic Terrace & Bar)", "Zorka Panoramic Terrace & Bar",)),
-    Venue("dex", 55.71959, 37.68633, (), ("Клуб DEX",)),
-    Venue("lahesis", 55.76009, 37.64689, (), ("Lachesis Groves", "Лахесис",)),
-    Venue("rndm", 55.75002, 37.66524, (), ("RNDM", "RNDM (РанДом)",)),
-    Venue("kulturnyy_kvartal_brusni", 59.92277, 30.24943, (), ("Брусницын", "Культурный квартал «Брусницын»",)),
-    Venue("fabula_hq", 55.75668, 37.67645, (), ("Fabula HQ", "Fábula (fābula radio)", "fābula HQ",)),
-    Venue("prostranstvo_supermetall", 55.76407, 37.68337, (), ("«Суперметалл»", "Пространство «Суперметалл»", "Радио (на Суперметалле)", "Суперметалл",)),
-    Venue("kay_kan", 55.76633, 37.62993, (), ("Кай Кан",)),
-    Venue("community", 55.74591, 37.63817, (), ("Community Moscow", "клуб community",)),
-    Venue("af_i_if", 55.75485, 37.64541, (), ("AF и IF", "IF + AF",)),
-    Venue("depo_tri_vokzala", 55.77273, 37.66335, (), ("Бар Станция (Депо.Москва, Три вокзала)", "Депо «Три вокзала»", "Депо.Москва",)),
-    Venue("klub_smena", 55.74153, 37.65998, (), ("Клуб «Смена»", "Смена (Smena)", "Смена 2.0",)),
-    Venue("made_in_bali", 55.73255, 37.59978, (), ("Made in Bali",)),
-    Venue("klub_ton71", 55.77970, 37.69174, (), ("Тон71", "клуб Тон71",)),
-    Venue("biznes_kvartal_arma", 55.75587, 37.61770, (), ("Арма", "Бизнес-квартал «Арма»",)),
-    Venue("le_th_l_me", 55.78779, 37.58188, (), ("Île Thélème",)),
-    Venue("purba_place", 55.74426, 37.62991, (), ("Purba Place",)),
-    Venue("park_serebryanyy_bor", 55.78112, 37.44013, (), ("«Серебряный бор»", "Парк «Серебряный бор»", "Серебряный бор",)),
-    Venue("moryak_i_chayka", 55.75923, 37.64565, (), ("Моряк и Чайка",)),
-    Venue("boylernaya_hlebozavod_9", 55.80663, 37.58568, (), ("Бойлерная (Хлебозавод №9)",)),
-    Venue("odzu", 55.76220, 37.55781, (), ("ODZU", "Ресторан ODZU (ЖК Lucky)",)),
-    Venue("restoran_nyuans", 55.76335, 37.61576, (), ("ресторан Нюанс",)),
-    Venue("treff8", 55.76270, 37.66121, (), ("TREFF8",)),
-    Venue("fond_ruarts", 55.75105, 37.58739, (), ("Ruarts", "Фонд Ruarts",)),
-    Venue("mason_st_one", 55.73963, 37.65421, (), ("Mason St.One",)),
-    Venue("avtodrom_igora_drayv", 60.51444, 30.19417, (), ("Автодром «Игора Драйв»", "Игора Драйв",)),
-    Venue("live_arena", 55.70640, 37.35569, (), ("Live Арена",)),
-    Venue("koncertnyy_zal_moskva_os", 55.69393, 37.67376, (), ("Концертный зал «Москва» (Остров Мечты)", "Остров Мечты",)),
-    Venue("park_300_letiya_sankt_pe", 59.98288, 30.20144, (), ("300-летия Санкт-Петербурга", "Парк 300-летия Санкт-Петербурга",)),
-    Venue("kurort_zavidovo", 56.61539, 36.54426, (), ("Курорт Завидово",)),
-    Venue("luzhniki", 55.71583, 37.55361, (), ("Лужники",)),
-    Venue("cube_moscow_kub", 55.75743, 37.61267, (), ("Cube Moscow (КУБ)", "Cube.Moscow",)),
-    Venue("centr_vostochnoy_literat", 55.75027, 37.61059, (), ("Центр восточной литературы (ЦВЛ)", "Центр восточной литературы РГБ (ЦВЛ)", "восточной литературы (ЦВЛ)",)),
-    Venue("nevrotik", 55.74951, 37.64511, (), ("клуб «Невротик»",)),
-    Venue("vladey_dom_s_atlantami", 55.75241, 37.64039, (), ("VLADEY (Дом с Атлантами)", "VLADEY МУЗЕЙ", "VLADEY Музей (Дом с Атлантами)",)),
-    Venue("inzhenernyy_korpus_trety", 55.74099, 37.62112, (), ("Инженерный корпус Третьяковской галереи",)),
-    Venue("the_last_bar", 55.75720, 37.63383, (), ("The Last Bar",)),
-    Venue("ciferblat", 55.76231, 37.62584, (), ("Циферблат",)),
-    Venue("kultura", 55.75924, 37.58026, (), ("клуб культура",)),
-    Venue("soma", 55.76705, 37.62017, (), ("ресторан soma",)),
-    Venue("galereya_peresvetov_pere", 55.71478, 37.66158, (), ("«Пересветов переулок»", "Галерея «Пересветов переулок»", "Пересветов переулок",)),
-    Venue("sklad_3", 55.78458, 37.70620, (), ("клуб склад 3",)),
-    Venue("billie", 55.76634, 37.62072, (), ("бар billie",)),
-    Venue("leveldva_dvor", 55.75653, 37.60646, (), ("Leveldva (двор)",)),
-    Venue("arma_arma", 55.75913, 37.66754, (), ("ARMA (Арма)",)),
-    Venue("ad_marginem", 55.77922, 37.68893, (), ("шоурум ad marginem",)),
-    Venue("kristall", 55.75590, 37.67725, (), ("арт-квартал кристалл",)),
-    Venue("park_gorkogo_pushkinskay", 55.73101, 37.59766, (), ("Горького (Пушкинская набережная)", "Парк Горького (Пушкинская набережная)",)),
-    Venue("poklonnaya_gora", 55.73169, 37.50667, (), ("Поклонная гора",)),
-    Venue("mamm_multimedia_art_muze", 55.74162, 37.59866, (), ("МАММ (Мультимедиа Арт Музей)", "Мультимедиа-арт-музей (МАММ)",)),
-    Venue("severnyy_rechnoy_vokzal", 55.85141, 37.46699, (), ("Северный и Южный речные вокзалы", "Северный речной вокзал",)),
-    Venue("dom_sily_powerhouse_mosc", 55.74576, 37.64616, (), ("Дом Силы (Powerhouse Moscow)", "Зангези",)),
-    Venue("loft_hall_loft_1", 55.71105, 37.65494, (), ("LOFT HALL (LOFT#1)", "LOFT#1 (LOFT HALL)",)),
-    Venue("galereya_na_trubnoy", 55.76835, 37.61869, (), ("Галерея на Трубной", "Трубная галерея (Trubnaya Gallery)",)),
-    Venue("ugol", 55.77354, 37.66980, (), ("КЦ «Угол»",)),
-    Venue("prostranstvo_bestiariy", 55.74464, 37.56607, (), ("BESTиарий", "Пространство «Бестиарий»",)),
-    Venue("yauza", 55.75200, 37.64480, (), ("ресторан yauza", "ресторан яуза",)),
-    Venue("rossiyskaya_gosudarstven", 55.75103, 37.60924, (), ("Российская государственная библиотека",)),
-    Venue("galereya_hodynka", 55.78849, 37.49217, (), ("Галерея «Ходынка»",)),
-    Venue("kulturnyy_centr_moskvich", 55.70787, 37.73297, (), ("Культурный центр «Москвич»",)),
-    Venue("teatr_naciy", 55.76594, 37.61275, (), ("Театр Наций",)),
-    Venue("amber_plaza", 55.77999, 37.60577, (), ("Амбер Плаза",)),
-    Venue("muzey_kriptografii", 55.83069, 37.59742, (), ("Музей криптографии",)),
-    Venue("galereya_na_peschanoy", 55.79296, 37.51300, ("@pschgallery",), ("Галерея на Песчаной",)),
-    Venue("bar_strelka", 55.74245, 37.60931, (), ("Бар «Стрелка»",)),
-    Venue("osobnyak_v_a_lemana", 55.76587, 37.66803, (), ("Особняк В.А. Лемана",)),
-    Venue("klubklub", 55.75762, 37.64630, (), ("КлубКлуб",)),
-    Venue("klub_dff", 55.74638, 37.64709, (), ("Клуб DFF",)),
-    Venue("klub_sound", 59.92446, 30.23976, (), ("Клуб Sound",)),
-    Venue("novaya_scena_aleksandrin", 59.93041, 30.33758, (), ("Новая сцена Александринского театра",)),
-    Venue("punk_fiction", 55.77460, 37.67107, (), ("Punk Fiction",)),
-    Venue("kinoteatr_chtivo_dom", 55.73625, 37.59410, (), ("Кинотеатр Чтиво (Дом)",)),
-    Venue("dom_uryadnika", 56.25076, 37.99793, (), ("Дом Урядника",)),
-    Venue("centr_voznesenskogo", 55.73555, 37.62403, (), ("Центр Вознесенского",)),
-    Venue("galereya_rostokino", 55.83575, 37.65908, (), ("Галерея «Ростокино»",)),
-    Venue("vinzavod", 55.75557, 37.66459, (), ("Винзавод",)),
-    Venue("park_pokrovskiy_bereg", 55.83292, 37.47232, (), ("«Покровский берег»", "Покровский берег", "парк «Покровский берег»",)),
-    Venue("chert_poberi", 59.92295, 30.34875, (), ()),
-    Venue("basmannyy_dvor", 55.77572, 37.67771, (), ("Басманный двор",)),
-    Venue("kafe_delfin", 59.95830, 30.30224, (), ("Кафе Дельфин",)),
-    Venue("rosizo", 55.75679, 37.63662, (), ("РОСИЗО",)),
-    Venue("usadba_dolgorukovyh_bobr", 55.75869, 37.59359, (), ("Усадьба Долгоруковых-Бобринских (филиал Ельцин Центра)",)),
-    Venue("art_prostranstvo_locus_s", 55.65375, 37.59402, (), ("Арт-пространство Locus Solus",)),
-    Venue("park_zaryade_malyy_amfit", 55.75064, 37.63097, (), ("«Зарядье» (Малый амфитеатр)", "Парк «Зарядье» (Малый амфитеатр)", "малый амфитеатр",)),
-    Venue("siksseven", 55.79946, 37.58469, (), ("СИКССЕВЕН",)),
-    Venue("muzey_russkogo_lubka_i_n", 55.76904, 37.63440, (), ("Музей русского лубка и наивного искусства", "русского лубка и наивного искусства",)),
-    Venue("planetariy_1", 59.91153, 30.33094, (), ()),
-    Venue("loft_kompressor", 55.75127, 37.73303, (), ("Лофт «Компрессор»",)),
-    Venue("art_prostranstvo_artemev", 55.75639, 37.60495, (), ("Арт-пространство «Артемьев»",)),
-    Venue("dk_alfa_kristall", 55.75711, 37.67579, (), ("Альфа Кристалл", "ДК «Альфа Кристалл»",)),
-    Venue("osobnyak_brusnicynyh", 59.92278, 30.25083, (), ("Особняк Брусницыных",)),
-    Venue("park_zaryade", 55.75148, 37.62708, (), ("«Зарядье»", "Зарядье", "Парк «Зарядье»",)),
-    Venue("surf_coffee", 55.77257, 37.67879, (), ("surf coffee бауманская",)),
-    Venue("sad_imeni_baumana", 55.76585, 37.66040, (), ("Сад имени Баумана",)),
-    Venue("artplay_malyy_vystavochn", 55.75317, 37.66932, (), ("ARTPLAY (Малый выставочный зал)",)),
-    Venue("vostochnyy_kulturnyy_cen", 55.76358, 37.62381, (), ("Восточный культурный центр Института востоковедения РАН",)),
-    Venue("masterskaya_aacademy19_a", 55.75875, 37.68224, (), ("Мастерская AAcademy19 (AA19)",)),
-    Venue("the_spot", 55.78940, 37.53683, (), ("парк the spot",)),
-    Venue("galereya_vdohnovenie_tc_", 55.69625, 37.66558, (), ("«Вдохновение» (ТЦ «Мегаполис»)", "Галерея «Вдохновение» (ТЦ «Мегаполис»)", "галерея вдохновение", "тц мегаполис",)),
-    Venue("bar_rovesnik", 55.76242, 37.60592, (), ("бар «Ровесник»",)),
-    Venue("letnyaya_scena_csi_vinza", 55.75652, 37.66573, (), ("Летняя сцена ЦСИ Винзавод",)),
-    Venue("krasnyy_ugol", 59.90699, 30.28494, (), ("Красный угол",)),
-    Venue("galereya_na_varshavke", 55.65944, 37.61842, (), ("Галерея на Варшавке",)),
-    Venue("vladey", 55.75594, 37.66555, (), ("VLADEY",)),
-    Venue("galereya_korney", 55.75711, 37.60311, (), ("Галерея Корней",)),
-    Venue("flagshtok", 59.97061, 30.21268, (), ("Флагшток",)),
-    Venue("park_sokolniki", 55.78924, 37.67966, (), ("Парк «Сокольники»",)),
-    Venue("kulturnyy_centr_ugol", 55.77329, 37.66880, (), ("Культурный центр «Угол»",)),
-    Venue("original", 55.76169, 37.65854, (), ("клуб .оригинал",)),
-    Venue("orbita", 55.75052, 37.64350, (), ("бар орбита",)),
-    Venue("dezhurnaya_ryumochnaya", 55.75236, 37.59747, (), ("Дежурная рюмочная",)),
-    Venue("galereya_artzip", 55.77055, 37.64162, (), ("АРТЗИП", "Галерея АРТЗИП",)),
-    Venue("f_bula_radio", 55.75722, 37.67444, (), ("fābula radio",)),
-    Venue("kooperativ_chernyy", 55.75999, 37.65178, (), ("Кооператив Чёрный",)),
-    Venue("madame_roche", 55.72828, 37.64675, (), ("Madame Roche",)),
-    Venue("teatr_truda", 55.79069, 37.61012, ("@teatrtruda_10",), ("Театр труда",)),
-    Venue("park_iskusstv_muzeon", 55.73464, 37.60577, (), ("Музеон", "Парк искусств «Музеон»", "искусств «Музеон»",)),
-    Venue("moskovskiy_soyuz_hudozhn", 55.76206, 37.62199, (), ("Московский Союз художников (МСХ)",)),
-    Venue("substance_2_0", 55.73141, 37.60162, (), ("SUBSTANCE 2.0",)),
-    Venue("park_patriot", 55.57231, 36.82977, (), ("Парк «Патриот»",)),
-    Venue("ketch_up", 55.76114, 37.61731, (), ("KETCH UP",)),
-    Venue("art_pavilon_letniy_marke", 55.74510, 37.61720, (), ("Арт-павильон «Летний маркет»",)),
-    Venue("galereya_n1_33", 55.78136, 37.56863, (), ("Галерея N1.33",)),
-    Venue("roks", 59.96438, 30.27734, (), ("ROKS",)),
-)
-
-
 # Слова, по которым НЕЛЬЗЯ матчить: они встречаются в постах сами по себе, вне
 # связи с площадкой. Список собран из реальных ложных срабатываний (аудит
 # 2026-07-17): каждое из этих слов когда-то было алиасом и тянуло чужие события.
@@ -256,16 +96,16 @@ GENERIC_ALIAS_STOPLIST: frozenset[str] = frozenset(
 )
 
 
-def _validate_aliases() -> None:
-    """Fail the import if a venue matches on a word too common to be safe.
+def _validate_aliases(venues: tuple[Venue, ...]) -> None:
+    """Fail if a venue matches on a word too common to be safe.
 
     Deliberately fatal: a bad alias silently mis-pins hundreds of events onto the
     map (see the «Москва» incident in the module docstring). Better to break the
-    deploy than to ship wrong geometry — the failure is loud, immediate, and names
-    the offending alias.
+    deploy (or reject a reload) than to ship wrong geometry — the failure is loud,
+    immediate, and names the offending alias.
     """
     bad = [
-        (v.key, a) for v in VENUES for a in v.norm_aliases if a in GENERIC_ALIAS_STOPLIST
+        (v.key, a) for v in venues for a in v.norm_aliases if a in GENERIC_ALIAS_STOPLIST
     ]
     if bad:
         listed = ", ".join(f'{k}: "{a}"' for k, a in bad)
@@ -276,7 +116,49 @@ def _validate_aliases() -> None:
         )
 
 
-_validate_aliases()
+def parse_venues(raw: object) -> tuple[Venue, ...]:
+    """Список площадок из JSON (app/data/venues.json) → Venue, с проверкой:
+    обязательные поля, координаты, уникальные key, алиасы не из стоп-листа.
+    Любая ошибка — ValueError с указанием записи."""
+    if not isinstance(raw, list):
+        raise ValueError("gazetteer: ожидается JSON-список площадок")
+    out: list[Venue] = []
+    seen: set[str] = set()
+    for i, d in enumerate(raw):
+        where = f"gazetteer: запись #{i}"
+        if not isinstance(d, dict):
+            raise ValueError(f"{where}: ожидается объект")
+        key = d.get("key")
+        if not isinstance(key, str) or not re.fullmatch(r"[a-z0-9_]+", key):
+            raise ValueError(f"{where}: key должен быть [a-z0-9_]+, а не {key!r}")
+        if key in seen:
+            raise ValueError(f"{where}: повтор key {key!r}")
+        seen.add(key)
+        lat, lng = d.get("lat"), d.get("lng")
+        if not all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in (lat, lng)) \
+                or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValueError(f"{where} ({key}): lat/lng вне диапазона: {lat!r}, {lng!r}")
+        handles, aliases = d.get("handles", []), d.get("aliases", [])
+        for name, xs in (("handles", handles), ("aliases", aliases)):
+            if not isinstance(xs, list) or not all(isinstance(x, str) and x.strip() for x in xs):
+                raise ValueError(f"{where} ({key}): {name} — список непустых строк")
+        v = Venue(key, float(lat), float(lng), tuple(handles), tuple(aliases))
+        if aliases and not all(v.norm_aliases):
+            raise ValueError(f"{where} ({key}): алиас без букв/цифр")
+        out.append(v)
+    venues = tuple(out)
+    _validate_aliases(venues)
+    return venues
+
+
+def load_venues(path: Path = VENUES_FILE) -> tuple[tuple[Venue, ...], str]:
+    """Прочитать и проверить файл площадок → (venues, sha1 содержимого)."""
+    data = path.read_bytes()
+    try:
+        raw = json.loads(data)
+    except ValueError as e:
+        raise ValueError(f"gazetteer: {path.name} — не JSON: {e}") from None
+    return parse_venues(raw), hashlib.sha1(data).hexdigest()
 
 
 # A venue name inside a person's bio/affiliation ("преподаватель школ … ММОМА",
@@ -289,6 +171,139 @@ ATTRIBUTION_CUES: tuple[str, ...] = (
 )
 
 
+class AliasIndex:
+    """Все алиасы VENUES, скомпилированные в пословный trie.
+
+    _norm-текст — слова через одиночный пробел, поэтому `" {alias} "` в
+    `" {hay} "` ровно то же, что последовательность слов алиаса с границы
+    слова. find() идёт по словам текста один раз и от каждого слова спускается
+    по trie (глубина — длина алиаса в словах), вместо padded.find() на каждый
+    из ~400 алиасов. Приоритет прежний: алиас — это (индекс площадки, индекс
+    алиаса) в порядке VENUES, побеждает первый по нему; у каждого алиаса, как
+    и раньше, смотрим только ПЕРВОЕ вхождение."""
+
+    __slots__ = ("_trie", "_venue", "by_handle")
+
+    _END = ""  # ключ терминала в узле (слово не бывает пустым)
+
+    def __init__(self, venues: tuple[Venue, ...]) -> None:
+        self._trie: dict = {}
+        self._venue: list[Venue] = []  # порядковый номер алиаса → площадка
+        for v in venues:
+            for a in v.norm_aliases:
+                if not a:
+                    continue
+                node = self._trie
+                for w in a.split(" "):
+                    node = node.setdefault(w, {})
+                node.setdefault(self._END, []).append(len(self._venue))
+                self._venue.append(v)
+        # Дефолт канала: handle → площадка (первая в VENUES, как при переборе)
+        self.by_handle: dict[str, Venue] = {}
+        for v in venues:
+            for h in v.handles:
+                self.by_handle.setdefault(h, v)
+
+    def find(self, hay: str) -> list[tuple[int, int]]:
+        """(номер алиаса, позиция первого вхождения в hay) по приоритету.
+        Позиция — как у `f" {hay} ".find(f" {a} ")`."""
+        words = hay.split(" ")
+        root, end = self._trie, self._END
+        first: dict[int, int] = {}
+        pos = 0
+        for i, w in enumerate(words):
+            node = root.get(w)
+            j = i + 1
+            while node is not None:
+                for ordinal in node.get(end, ()):
+                    first.setdefault(ordinal, pos)
+                if j == len(words):
+                    break
+                node = node.get(words[j])
+                j += 1
+            pos += len(w) + 1
+        return sorted(first.items())
+
+    def match(self, hay: str) -> Optional[Venue]:
+        """Первая по приоритету площадка, чей алиас стоит в hay не в био/регалиях."""
+        padded = f" {hay} "
+        for ordinal, pos in self.find(hay):
+            # Skip when the alias sits in a bio/affiliation, not as a venue.
+            if any(cue in padded[max(0, pos - 60):pos] for cue in ATTRIBUTION_CUES):
+                continue
+            return self._venue[ordinal]
+        return None
+
+
+@dataclass(frozen=True)
+class Gazetteer:
+    """Загруженный справочник: площадки + собранный по ним индекс. geocode()
+    берёт текущий объект одной ссылкой, reload() подменяет его целиком —
+    запрос никогда не видит полусобранное состояние."""
+    venues: tuple[Venue, ...]
+    index: AliasIndex
+    digest: str  # sha1 файла — версия для воркеров пула (sync)
+    path: Path = VENUES_FILE
+
+    @classmethod
+    def load(cls, path: Path = VENUES_FILE) -> "Gazetteer":
+        venues, digest = load_venues(path)
+        return cls(venues, AliasIndex(venues), digest, path)
+
+
+@dataclass
+class ReloadResult:
+    venues: int
+    aliases: int
+    digest: str
+    changed: list[str]  # key добавленных / удалённых / изменённых площадок
+
+
+def changed_venues(old: tuple[Venue, ...], new: tuple[Venue, ...]) -> list[str]:
+    """Ключи площадок, у которых что-то поменялось (или которых не стало/прибавилось)."""
+    a = {v.key: v for v in old}
+    b = {v.key: v for v in new}
+    return sorted(k for k in a.keys() | b.keys() if a.get(k) != b.get(k))
+
+
+# Файл из репозитория: ошибка в нём роняет импорт (ловим на деплое).
+_CURRENT = Gazetteer.load()
+VENUES: tuple[Venue, ...] = _CURRENT.venues
+_synced_to: str | None = None
+
+
+def current() -> Gazetteer:
+    return _CURRENT
+
+
+def reload(path: Path | None = None) -> ReloadResult:
+    """Перечитать площадки и атомарно подменить индекс. ValueError/OSError —
+    прежний индекс остаётся в силе."""
+    global _CURRENT, VENUES
+    old = _CURRENT
+    new = Gazetteer.load(path or old.path)
+    _CURRENT, VENUES = new, new.venues
+    changed = changed_venues(old.venues, new.venues)
+    logger.info("gazetteer reloaded: %d venues, digest %s, changed %s",
+                len(new.venues), new.digest[:8], changed or "—")
+    return ReloadResult(len(new.venues), sum(len(v.aliases) for v in new.venues), new.digest, changed)
+
+
+def sync(digest: str, path: Path) -> None:
+    """Для воркеров пула (spawn → свой импорт модуля): догнать версию
+    справочника, с которой работает родитель. Один запрос версии — одна
+    попытка: если файл с тех пор снова поменялся или не читается, не
+    перечитываем на каждой пачке."""
+    global _synced_to
+    if digest == _CURRENT.digest or digest == _synced_to:
+        return
+    _synced_to = digest
+    try:
+        reload(path)
+    except (OSError, ValueError) as e:
+        logger.warning("gazetteer sync to %s failed, keeping %s: %s", digest[:8], _CURRENT.digest[:8], e)
+
+
 def geocode(
     *,
     text: Optional[str],
@@ -302,27 +317,19 @@ def geocode(
     """
     # 1) per-event: venue named in the extracted location or the post body
     hay = _norm(" ".join(p for p in (location_text, text) if p))
+    gaz = _CURRENT
     if hay:
-        padded = f" {hay} "
-        for v in VENUES:
-            for a in v.norm_aliases:
-                if not a:
-                    continue
-                pos = padded.find(f" {a} ")
-                if pos == -1:
-                    continue
-                # Skip when the alias sits in a bio/affiliation, not as a venue.
-                if any(cue in padded[max(0, pos - 60):pos] for cue in ATTRIBUTION_CUES):
-                    continue
-                return {"lat": v.lat, "lng": v.lng, "source": "gazetteer", "venue": v.key}
+        v = gaz.index.match(hay)
+        if v is not None:
+            return {"lat": v.lat, "lng": v.lng, "source": "gazetteer", "venue": v.key}
 
     # 2) channel default — a venue channel posts about its own building
     if channel_handle:
         h = channel_handle.lower()
         if not h.startswith("@"):
             h = "@" + h
-        for v in VENUES:
-            if h in v.handles:
-                return {"lat": v.lat, "lng": v.lng, "source": "gazetteer-channel", "venue": v.key}
+        v = gaz.index.by_handle.get(h)
+        if v is not None:
+            return {"lat": v.lat, "lng": v.lng, "source": "gazetteer-channel", "venue": v.key}
 
     return None
@@ -1,22 +1,32 @@
 """Per-channel processing pipeline.
 
 Steps:
-  1. fetch raw messages from services/telegram
-  2. dedup against posts_raw (insert new ones)
-  3. for each new post:
+  1. fetch raw messages from services/telegram (one channel per /ingest, or a
+     batch of due channels in one request — process_batch; process_stream
+     reads /ingest/stream and runs steps 2–3 while the poller still fetches)
+  2. dedup against posts_raw (insert new ones); for the curator channel
+     (@animalswithhands) also record its t.me links as endorsements
+  3. for each new post (computed for the whole batch first):
      a. detect_event() — score by rules
      b. if score < REVIEW_THRESHOLD → skip (rejected, not stored as event)
      c. enrich_event() — extract structure
-     d. insert into events_curated with status:
-        - score >= AUTO_THRESHOLD → approved
-        - else → manual_review (also enqueued in moderation_queue)
+     d. status: score >= AUTO_THRESHOLD → approved, else → manual_review
+     (a–d run in app.pipeline.executor — a process pool by default, so the
+     event loop isn't blocked), then the batch is written in bulk: one
+     multi-row INSERT ... RETURNING into events_curated, one insert into
+     moderation_queue, one into event_tags
   4. mark_polled on channel + log ingest_run
+
+With PIPELINE_WORKERS > 0 step 3 is deferred: the poll only stores posts and
+enqueues processing_jobs in the same transaction; app.pipeline.workers claim
+them (FOR UPDATE SKIP LOCKED) and run process_jobs / run_fanouts.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
@@ -24,19 +34,21 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
 from app.config import Settings
 from app.db import session_scope
-from app.models import Channel, EventStatus, IngestStatus
-from app.pipeline.classifier import KeywordClassifier, apply_cinema_venue_default
-from app.pipeline.detector import detect_event
-from app.pipeline.enricher import enrich_event
+from app.models import Channel, EventStatus, IngestStatus, PostRaw
+from app.pipeline.executor import PostAnalysis, PostInput, TagSpec, make_pipeline_executor
+from app.ranking import extract_links, is_endorser
 from app.repositories.channels import ChannelsRepository
+from app.repositories.endorsements import EndorsementsRepository
+from app.repositories.jobs import ProcessingJobsRepository
 from app.repositories.posts import (
     EventsRepository,
     IngestRunsRepository,
     ModerationRepository,
     PostsRepository,
 )
-from app.repositories.tags import EventTagsRepository, TagsRepository
-from app.services.tg_client import TelegramFetchError, TelegramServiceClient
+from app.repositories.tags import EventTagsRepository
+from app.services.taxonomy import TaxonomyCache
+from app.services.tg_client import ChannelDone, RawMessage, TelegramFetchError, TelegramServiceClient
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +62,22 @@ class ChannelRunResult:
     events_review: int
     events_rejected: int
     error: Optional[str] = None
+    # Секунды по стадиям detect/enrich/classify (PipelineExecutor)
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+
+    def add(self, other: "ChannelRunResult") -> None:
+        """Прибавить счётчики и время стадий записанной (закоммиченной) части."""
+        self.posts_fetched += other.posts_fetched
+        self.posts_new += other.posts_new
+        self.events_approved += other.events_approved
+        self.events_review += other.events_review
+        self.events_rejected += other.events_rejected
+        for k, v in other.stage_seconds.items():
+            self.stage_seconds[k] = self.stage_seconds.get(k, 0.0) + v
+
+
+def _fmt_stages(seconds: dict[str, float]) -> str:
+    return " ".join(f"{k}={v:.3f}s" for k, v in seconds.items())
 
 
 class PipelineProcessor:
@@ -58,12 +86,26 @@ class PipelineProcessor:
         session_factory: async_sessionmaker[AsyncSession],
         tg_client: TelegramServiceClient,
         settings: Settings,
+        taxonomy: TaxonomyCache | None = None,
     ) -> None:
         self.sf = session_factory
         self.tg = tg_client
         self.settings = settings
-        self.classifier = KeywordClassifier()
+        # detect/enrich/classify — в пуле процессов (PIPELINE_EXECUTOR=process)
+        # или прямо в event loop (inline)
+        self.executor = make_pipeline_executor(
+            settings.pipeline_executor, settings.pipeline_executor_workers
+        )
+        # Теги + прогретый классификатор: общий с /tags кэш (app.state.taxonomy)
+        self.taxonomy = taxonomy or TaxonomyCache(
+            session_factory, ttl_seconds=settings.taxonomy_ttl_seconds
+        )
         self.push_service: object | None = None  # set externally to enable fanout
+        # FeedSnapshotCache (app.state.feed_snapshot), set externally: новые
+        # approved после коммита → пересборка снимка ленты
+        self.feed_snapshot: object | None = None
+        # PIPELINE_WORKERS > 0 → посты обрабатывают воркеры очереди (process_jobs)
+        self.use_queue = settings.pipeline_workers > 0
 
     async def process_channel(self, channel_id: int, *, limit: int = 20) -> ChannelRunResult:
         started = datetime.utcnow()
@@ -79,114 +121,334 @@ class PipelineProcessor:
         # между опросами >N постов, терял старшие безвозвратно.
         try:
             raw = await self.tg.fetch(ch.handle, limit=limit, min_id=ch.last_message_id)
-        except TelegramFetchError as e:
+        except Exception as e:
+            return await self._fetch_failed(ch, e, started)
+        return await self._process_fetched(ch, raw, started)
+
+    async def process_batch(self, channel_ids: list[int], *, limit: int = 20) -> list[ChannelRunResult]:
+        """Батч-опрос: один /ingest на все каналы (у каждого свой min_id), затем
+        обработка каждого канала как в process_channel — своя сессия, свой
+        ingest_run. Сбой канала у поллера (channels_failed) роняет только его;
+        сбой самого запроса — весь батч."""
+        started = datetime.utcnow()
+        async with session_scope(self.sf) as s:
+            channels = ChannelsRepository(s)
+            chans = [ch for ch in [await channels.get_by_id(cid) for cid in channel_ids] if ch]
+        if not chans:
+            return []
+
+        try:
+            fetched = await self.tg.fetch_many(
+                {ch.handle: ch.last_message_id for ch in chans}, limit=limit
+            )
+        except Exception as e:
+            return [await self._fetch_failed(ch, e, started) for ch in chans]
+
+        results: list[ChannelRunResult] = []
+        for ch in chans:
+            raw = fetched.get(ch.handle, [])
+            if isinstance(raw, Exception):
+                results.append(await self._fetch_failed(ch, raw, started))
+            else:
+                results.append(await self._process_fetched(ch, raw, started))
+        return results
+
+    async def process_stream(
+        self, channel_ids: list[int], *, limit: int = 20, chunk: int = 50,
+    ) -> list[ChannelRunResult]:
+        """Потоковый батч (/ingest/stream): сообщения обрабатываются пачками по
+        chunk, пока поллер ещё тянет следующие. Читатель потока кладёт пачки в
+        очередь ограниченной длины, обработчик разбирает её в своей сессии на
+        пачку; память — O(chunk × длина очереди), а не O(весь догон).
+        mark_polled + ingest_run — только когда канал дочитан (channel_done):
+        оборванный посреди канал переопросится с прежнего min_id, уже
+        сохранённые посты отсеет insert_unseen."""
+        started = datetime.utcnow()
+        async with session_scope(self.sf) as s:
+            channels = ChannelsRepository(s)
+            chans = [ch for ch in [await channels.get_by_id(cid) for cid in channel_ids] if ch]
+        if not chans:
+            return []
+        by_handle = {ch.handle: ch for ch in chans}
+
+        queue: asyncio.Queue[tuple[Channel, list[RawMessage], ChannelDone | None] | None] = asyncio.Queue(maxsize=4)
+        progress: dict[str, tuple[ChannelRunResult, int | None]] = {}
+        results: list[ChannelRunResult] = []
+
+        def failed(ch: Channel, e: Exception) -> ChannelRunResult:
+            res = progress[ch.handle][0] if ch.handle in progress else ChannelRunResult(ch.handle, 0, 0, 0, 0, 0)
+            return ChannelRunResult(ch.handle, res.posts_fetched, res.posts_new,
+                                    res.events_approved, res.events_review,
+                                    res.events_rejected, error=str(e))
+
+        # Канал, у которого не записалась пачка: остаток его потока не пишем и
+        # mark_polled не делаем — иначе last_message_id перескочил бы потерянную
+        # пачку. Переопросится с прежнего min_id; записанное до сбоя отсеет
+        # insert_unseen.
+        broken: dict[str, Exception] = {}
+
+        async def consume() -> None:
+            while (item := await queue.get()) is not None:
+                ch, msgs, done = item
+                if ch.handle in broken:
+                    if done is not None:
+                        results.append(failed(ch, broken.pop(ch.handle)))
+                    continue
+                res, last = progress.get(ch.handle) or (ChannelRunResult(ch.handle, 0, 0, 0, 0, 0), ch.last_message_id)
+                progress[ch.handle] = (res, last)
+                try:
+                    if msgs:
+                        # счётчики — в res только после коммита пачки
+                        part = ChannelRunResult(ch.handle, 0, 0, 0, 0, 0)
+                        async with session_scope(self.sf) as s:
+                            last = await self._store_posts(s, ch, msgs, part, last)
+                        res.add(part)
+                        progress[ch.handle] = (res, last)
+                        self._feed_changed(part.events_approved)
+                    if done is None:
+                        continue
+                    if done.error is not None:
+                        results.append(await self._fetch_failed(ch, TelegramFetchError(f"{ch.handle}: {done.error}"), started))
+                    else:
+                        async with session_scope(self.sf) as s:
+                            await self._finish_channel(s, ch, res, last, started)
+                        results.append(res)
+                except Exception as e:  # noqa: BLE001 — один канал не роняет поток
+                    logger.exception("stream processing failed for %s", ch.handle)
+                    if done is None:
+                        broken[ch.handle] = e
+                    else:
+                        results.append(failed(ch, e))
+
+        worker = asyncio.create_task(consume())
+        pending = set(by_handle)
+        buf: dict[str, list[RawMessage]] = {}
+        stream_error: Exception | None = None
+        try:
+            async for item in self.tg.stream({ch.handle: ch.last_message_id for ch in chans}, limit=limit):
+                ch = by_handle.get(item.channel)
+                if ch is None:
+                    continue
+                if isinstance(item, ChannelDone):
+                    pending.discard(ch.handle)
+                    await queue.put((ch, buf.pop(ch.handle, []), item))
+                    continue
+                b = buf.setdefault(ch.handle, [])
+                b.append(item)
+                if len(b) >= chunk:
+                    await queue.put((ch, buf.pop(ch.handle), None))
+        except Exception as e:  # noqa: BLE001 — обрыв потока: недочитанные каналы → failed
+            stream_error = e
+        finally:
+            await queue.put(None)
+            await worker
+
+        for h in sorted(pending):
+            err = stream_error or TelegramFetchError(f"{h}: stream ended before channel_done")
+            results.append(await self._fetch_failed(by_handle[h], err, started))
+        return results
+
+    async def _fetch_failed(self, ch: Channel, e: Exception, started: datetime) -> ChannelRunResult:
+        if isinstance(e, TelegramFetchError):
             # Ожидаемый мягкий сбой: поллер не смог вытащить канал (FloodWait /
             # ResolveUsername / потеря доступа). Раньше это выглядело как «success,
             # 0 постов» — теперь пишем run как failed (видно в ingest_runs), без
             # пугающего traceback.
             logger.warning("poller could not fetch %s: %s", ch.handle, e)
-            async with session_scope(self.sf) as s:
-                await IngestRunsRepository(s).log(
-                    channel_id, status=IngestStatus.failed,
-                    error=f"poller: {e!s}"[:500], started_at=started,
-                )
-            return ChannelRunResult(ch.handle, 0, 0, 0, 0, 0, error=str(e))
-        except Exception as e:
-            logger.exception("fetch failed for %s", ch.handle)
-            async with session_scope(self.sf) as s:
-                runs = IngestRunsRepository(s)
-                await runs.log(
-                    channel_id, status=IngestStatus.failed,
-                    error=f"fetch: {e!s}"[:500], started_at=started,
-                )
-            return ChannelRunResult(ch.handle, 0, 0, 0, 0, 0, error=str(e))
+            error = f"poller: {e!s}"[:500]
+        else:
+            logger.error("fetch failed for %s", ch.handle, exc_info=e)
+            error = f"fetch: {e!s}"[:500]
+        async with session_scope(self.sf) as s:
+            await IngestRunsRepository(s).log(
+                ch.id, status=IngestStatus.failed, error=error, started_at=started,
+            )
+        return ChannelRunResult(ch.handle, 0, 0, 0, 0, 0, error=str(e))
 
-        # 2) DEDUP + STORE_RAW + 3) DETECT/ENRICH/STORE_EVENT + 4) CLASSIFY
-        approved = review = rejected = 0
-        last_msg_id: int | None = ch.last_message_id
+    async def _process_fetched(self, ch: Channel, raw: list[RawMessage], started: datetime) -> ChannelRunResult:
+        res = ChannelRunResult(ch.handle, 0, 0, 0, 0, 0)
         async with session_scope(self.sf) as s:
-            posts_repo = PostsRepository(s)
-            events_repo = EventsRepository(s)
-            mod_repo = ModerationRepository(s)
-            channels_repo = ChannelsRepository(s)
-            tags_repo = TagsRepository(s)
-            event_tags_repo = EventTagsRepository(s)
+            last_msg_id = await self._store_posts(s, ch, raw, res, ch.last_message_id)
+            await self._finish_channel(s, ch, res, last_msg_id, started)
+        self._feed_changed(res.events_approved)
+        return res
 
-            # Load taxonomy once per run
-            tags_list = list(await tags_repo.list_all())
+    def _feed_changed(self, approved: int) -> None:
+        """Вызывать после коммита: в ленте появились новые approved-события."""
+        if approved and self.feed_snapshot is not None:
+            self.feed_snapshot.invalidate()
 
-            new_posts = await posts_repo.insert_unseen(channel_id, raw)
+    async def _store_posts(
+        self, s: AsyncSession, ch: Channel, raw: list[RawMessage], res: ChannelRunResult, last_msg_id: int | None,
+    ) -> int | None:
+        """Шаги 2–4 для пачки сообщений канала; счётчики копятся в res. Возвращает
+        новый last_message_id (max по новым постам) — mark_polled делает
+        _finish_channel, когда канал дочитан целиком."""
+        # 2) DEDUP + STORE_RAW + 3) DETECT/ENRICH/STORE_EVENT + 4) CLASSIFY
+        new_posts = await PostsRepository(s).insert_unseen(ch.id, raw)
+        res.posts_fetched += len(raw)
+        res.posts_new += len(new_posts)
+        # Одобрения куратора извлекаем один раз здесь — ранжирование потом
+        # джойнит endorsements, а не сканирует всю историю канала регэкспом.
+        if is_endorser(ch.handle):
+            endorsements = EndorsementsRepository(s)
             for p in new_posts:
-                if p.message_id and (last_msg_id is None or p.message_id > last_msg_id):
-                    last_msg_id = p.message_id
-
-                detection = detect_event(p.text)
-                # Политические/антиправительственные ивенты («запрещёнка») — НЕ в
-                # ленту. Сохраняем как rejected (аудит в админке, вкладка Rejected),
-                # но не публикуем и не шлём пуш. Юр-риск для РФ-аудитории.
-                if detection.political:
-                    enrichment = enrich_event(
-                        p.text, detection.hits, published_at=p.published_at, channel_handle=ch.handle
-                    )
-                    await events_repo.insert(p, detection, enrichment, EventStatus.rejected)
-                    rejected += 1
-                    continue
-                if not detection.is_event_review:
-                    rejected += 1
-                    continue
-                enrichment = enrich_event(
-                    p.text, detection.hits, published_at=p.published_at, channel_handle=ch.handle
-                )
-                status = (
-                    EventStatus.approved
-                    if detection.is_event_auto
-                    else EventStatus.manual_review
-                )
-                ev = await events_repo.insert(p, detection, enrichment, status)
-                if status == EventStatus.manual_review:
-                    await mod_repo.enqueue(ev.id)
-                    review += 1
+                await endorsements.record(p.id, extract_links([p.text]))
+        for p in new_posts:
+            if p.message_id and (last_msg_id is None or p.message_id > last_msg_id):
+                last_msg_id = p.message_id
+        if self.use_queue:
+            # Detect/enrich/classify — в воркерах (app.pipeline.workers): тут только
+            # durable-задачи в той же транзакции, что и сами посты.
+            await ProcessingJobsRepository(s).enqueue_posts([p.id for p in new_posts])
+            return last_msg_id
+        # Таксономия — из кэша (перечитывается только после смены тегов)
+        taxonomy = await self.taxonomy.get()
+        analyses = await self._analyze([(ch.handle, p) for p in new_posts], taxonomy.specs, res)
+        for a in analyses:
+            if a.error is not None:
+                raise RuntimeError(f"post {a.post_id}: {a.error}")
+        await self._write_events(s, analyses, res)
+        return last_msg_id
+
+    async def _analyze(self, handle_posts: list[tuple[str, PostRaw]], tags: list[TagSpec],
+                       res: ChannelRunResult) -> list[PostAnalysis]:
+        """Шаг 3–4 без БД (detect → enrich → статус → теги) для всей пачки — в
+        PipelineExecutor (пул процессов или inline). Время стадий копится в res."""
+        inputs = [PostInput(p.id, p.text or "", handle, p.published_at) for handle, p in handle_posts]
+        analyses, seconds = await self.executor.analyze(inputs, tags)
+        for k, v in seconds.items():
+            res.stage_seconds[k] = res.stage_seconds.get(k, 0.0) + v
+        return analyses
+
+    async def _write_events(self, s: AsyncSession, analyses: list[PostAnalysis], res: ChannelRunResult) -> None:
+        """Записать пачку разборов: события — одним INSERT ... RETURNING, затем
+        одна вставка модерации, одна тегов и одна fanout-задач — число
+        запросов не зависит от размера пачки."""
+        stored = [a for a in analyses if a.status is not None]
+        event_ids = await EventsRepository(s).insert_many(
+            [(a.post_id, a.detection, a.enrichment, a.status) for a in stored]
+        )
+        review: list[int] = []
+        approved: list[int] = []
+        tag_rows: list[tuple[int, int, float]] = []
+        for a in stored:
+            ev_id = event_ids[a.post_id]
+            if a.status == EventStatus.manual_review:
+                review.append(ev_id)
+            elif a.status == EventStatus.approved:
+                approved.append(ev_id)
+            tag_rows.extend((ev_id, tid, conf) for tid, conf in a.tags)
+        await ModerationRepository(s).enqueue_many(review)
+        await EventTagsRepository(s).attach_bulk(tag_rows)
+
+        # Push fanout for auto-approved events: в режиме очереди — durable-задачи
+        # в той же транзакции (переживают рестарт), иначе — фоновые задачи.
+        if approved and self.push_service is not None:
+            if self.use_queue:
+                await ProcessingJobsRepository(s).enqueue_fanouts(approved)
+            else:
+                for ev_id in approved:
+                    asyncio.create_task(self.push_service.fanout_for_event(ev_id))
+
+        res.events_approved += len(approved)
+        res.events_review += len(review)
+        res.events_rejected += len(analyses) - len(approved) - len(review)
+
+    async def process_jobs(self, limit: int) -> int:
+        """Один батч очереди: забрать до limit process-задач (SKIP LOCKED),
+        разобрать посты и записать их пачкой в одном SAVEPOINT'е; батч
+        коммитится целиком. Если пачка не записалась — повторяем поштучно,
+        чтобы упавший пост не валил соседей: его задача уходит на retry с
+        backoff. Возвращает число взятых задач (0 → очередь пуста)."""
+        max_attempts = self.settings.pipeline_max_attempts
+        async with session_scope(self.sf) as s:
+            jobs = ProcessingJobsRepository(s)
+            claimed = await jobs.claim_posts(limit)
+            if not claimed:
+                return 0
+            taxonomy = await self.taxonomy.get()
+            res = ChannelRunResult("queue", 0, 0, 0, 0, 0)
+            job_of = {post.id: (job.id, job.attempts) for job, post, _ in claimed}
+            analyses = await self._analyze([(handle, post) for _, post, handle in claimed], taxonomy.specs, res)
+            analyzed: list[tuple[int, int, PostAnalysis]] = []
+            failed: list[tuple[int, int, Exception | str]] = []
+            for a in analyses:
+                job_id, attempts = job_of[a.post_id]
+                if a.error is not None:  # retry, соседей не трогаем
+                    failed.append((job_id, attempts, a.error))
                 else:
-                    approved += 1
-
-                # Classify (+ venue-default: alt-cinema каналы → cinema+киноклуб,
-                # снятие ложных лекция/театр по каналу-источнику)
-                assignments = self.classifier.classify(p.text, tags_list)
-                assignments = apply_cinema_venue_default(ch.handle, assignments, tags_list)
-                if assignments:
-                    await event_tags_repo.attach_many(
-                        ev.id,
-                        [(a.tag_id, a.confidence) for a in assignments],
-                    )
-
-                # Schedule push fanout for auto-approved events
-                if status == EventStatus.approved and self.push_service is not None:
-                    import asyncio as _asyncio
-                    _asyncio.create_task(self.push_service.fanout_for_event(ev.id))
-
-            await channels_repo.mark_polled(channel_id, last_msg_id)
-
-            runs = IngestRunsRepository(s)
-            await runs.log(
-                channel_id,
-                status=IngestStatus.success,
-                posts_fetched=len(raw),
-                posts_new=len(new_posts),
-                events_extracted=approved + review,
-                started_at=started,
-            )
+                    analyzed.append((job_id, attempts, a))
+            # Счётчики событий — в res только после RELEASE SAVEPOINT: откатившаяся
+            # запись (в т.ч. упавшая на самом RELEASE) их не учитывает.
+            done: list[int] = []
+            try:
+                part = ChannelRunResult("queue", 0, 0, 0, 0, 0)
+                async with s.begin_nested():
+                    await self._write_events(s, [a for _, _, a in analyzed], part)
+                res.add(part)
+                done = [job_id for job_id, _, _ in analyzed]
+            except Exception:  # noqa: BLE001 — ищем виновника поштучно
+                for job_id, attempts, a in analyzed:
+                    part = ChannelRunResult("queue", 0, 0, 0, 0, 0)
+                    try:
+                        async with s.begin_nested():
+                            await self._write_events(s, [a], part)
+                    except Exception as e:  # noqa: BLE001
+                        failed.append((job_id, attempts, e))
+                        continue
+                    res.add(part)
+                    done.append(job_id)
+            for job_id, attempts, e in failed:
+                logger.warning("job %d failed: %s", job_id, e)
+                await jobs.retry(job_id, attempts + 1, f"{e!s}", max_attempts=max_attempts)
+            await jobs.complete(done)
+        self._feed_changed(res.events_approved)
+        logger.info(
+            "queue: processed=%d ok=%d approved=%d review=%d rejected=%d %s",
+            len(claimed), len(done), res.events_approved, res.events_review, res.events_rejected,
+            _fmt_stages(res.stage_seconds),
+        )
+        return len(claimed)
+
+    async def run_fanouts(self, limit: int) -> int:
+        """Разослать пуши по fanout-задачам. Задача удаляется только после
+        успешного fanout_for_event — рестарт посреди рассылки её не теряет
+        (at-least-once)."""
+        if self.push_service is None:
+            return 0
+        max_attempts = self.settings.pipeline_max_attempts
+        async with session_scope(self.sf) as s:
+            jobs = ProcessingJobsRepository(s)
+            claimed = [(j.id, j.event_id, j.attempts) for j in await jobs.claim_fanouts(limit)]
+            done: list[int] = []
+            for job_id, event_id, attempts in claimed:
+                try:
+                    await self.push_service.fanout_for_event(event_id)
+                    done.append(job_id)
+                except Exception as e:  # noqa: BLE001
+                    logger.warning("fanout job %d (event %s) failed: %s", job_id, event_id, e)
+                    await jobs.retry(job_id, attempts + 1, f"{e!s}", max_attempts=max_attempts)
+            await jobs.complete(done)
+        return len(claimed)
+
+    async def _finish_channel(
+        self, s: AsyncSession, ch: Channel, res: ChannelRunResult, last_msg_id: int | None, started: datetime,
+    ) -> None:
+        await ChannelsRepository(s).mark_polled(ch.id, last_msg_id)
 
-        result = ChannelRunResult(
-            channel_handle=ch.handle,
-            posts_fetched=len(raw),
-            posts_new=len(new_posts),
-            events_approved=approved,
-            events_review=review,
-            events_rejected=rejected,
+        runs = IngestRunsRepository(s)
+        await runs.log(
+            ch.id,
+            status=IngestStatus.success,
+            posts_fetched=res.posts_fetched,
+            posts_new=res.posts_new,
+            events_extracted=res.events_approved + res.events_review,
+            started_at=started,
         )
         logger.info(
-            "channel %s: fetched=%d new=%d approved=%d review=%d rejected=%d",
-            ch.handle, result.posts_fetched, result.posts_new,
-            result.events_approved, result.events_review, result.events_rejected,
+            "channel %s: fetched=%d new=%d approved=%d review=%d rejected=%d %s",
+            ch.handle, res.posts_fetched, res.posts_new,
+            res.events_approved, res.events_review, res.events_rejected,
+            _fmt_stages(res.stage_seconds),
         )
-        return result
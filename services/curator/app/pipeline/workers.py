@@ -0,0 +1,54 @@
+"""Воркеры очереди пост-обработки (processing_jobs).
+
+N asyncio-задач на реплику крутят PipelineProcessor.process_jobs/run_fanouts:
+забрать батч (FOR UPDATE SKIP LOCKED), обработать, закоммитить. Реплик curator
+может быть несколько — SKIP LOCKED раздаёт им разные строки без координации.
+Пустая очередь → пауза idle_seconds; ошибка цикла логируется и не убивает воркер.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from app.pipeline.processor import PipelineProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineWorkers:
+    def __init__(self, processor: PipelineProcessor, *, workers: int, batch: int, idle_seconds: float = 2.0) -> None:
+        self.processor = processor
+        self.workers = workers
+        self.batch = batch
+        self.idle_seconds = idle_seconds
+        self._stop = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._stop.clear()
+        self._tasks = [asyncio.create_task(self._loop(i), name=f"pipeline-worker-{i}") for i in range(self.workers)]
+        logger.info("pipeline: %d queue workers started (batch=%d)", self.workers, self.batch)
+
+    async def _loop(self, n: int) -> None:
+        while not self._stop.is_set():
+            try:
+                busy = await self.processor.process_jobs(self.batch)
+                busy += await self.processor.run_fanouts(self.batch)
+            except Exception:  # noqa: BLE001
+                logger.exception("pipeline worker %d: batch failed", n)
+                busy = 0
+            if not busy:
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=self.idle_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def stop(self) -> None:
+        """Дождаться текущих батчей (не рвём транзакцию посередине)."""
+        self._stop.set()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
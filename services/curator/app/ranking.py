@@ -3,31 +3,47 @@
 Матчинг дублей портирован 1:1 из фронтового `buildDerived.ts`, чтобы бэкенд и
 клиент одинаково понимали, что такое дубль. На каждое фид-событие пишем:
   • dup_group_id / is_primary / crosspost_count — сворачивание кросс-постов
-  • rank_score                                  — порядок «самое интересное вверх»
+  • rank_score / rank_start_day / rank_close_day — порядок «самое интересное вверх»
 
-rank_score (v1, без LLM):
+Скор (v1, без LLM):
   0.35·venue_authority + 0.25·crosspost(distinct, −aggregator)
-  + 0.25·time_proximity + 0.15·quality
+  + 0.25·time_proximity + 0.15·quality (+ одобрение, + «последний шанс»)
 Отменённые (по стоп-списку имён) — вниз. LLM interest_score и engagement — след. слои.
+
+В rank_score пишем только статическую часть (_static_score); time_proximity и
+«последний шанс» зависят от сегодняшней даты и считаются в ORDER BY ленты
+(rank_order_expr) от rank_start_day / rank_close_day. Поэтому смена суток не
+требует переписывать всю ленту — пересчёт нужен только при изменении данных.
 """
 from __future__ import annotations
 
+import asyncio
 import math
+import multiprocessing
 import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime
 
-from sqlalchemy import String, func, or_, select, update
+from sqlalchemy import (
+    BigInteger, Boolean, Date, Float, Integer, String, and_, case, cast, column, func, literal, or_, select,
+    type_coerce, update, values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Channel, EventCurated, EventStatus, PostRaw
+from app.minhash import MinHashLSH
+from app.models import Channel, Endorsement, EventCurated, EventStatus, PostRaw, RankState
+from app.repositories.rank_runs import RankRunsRepository
 
 # ── стоп-список отменённых (временный, пока нет news-линкера отмен) ──
 CANCELLED_NAME_TOKENS: set[str] = {"outline"}
 
 # @animalswithhands — живой куратор Москвы. События, на которые он ссылается в
 # своих дайджестах (t.me/канал/msgid), получают буст rank_score как редакционное
-# «одобрение» (без UI-бейджа — просто высокий скор).
+# «одобрение» (без UI-бейджа — просто высокий скор). Ссылки вытаскиваются один
+# раз при инжесте (PipelineProcessor → таблица endorsements).
 AWH_HANDLE = "animalswithhands"
 ENDORSE_BOOST = 0.30
 _TME_RE = re.compile(r"(?:https?://)?t(?:elegram)?\.me/([A-Za-z0-9_]+)/(\d+)")
@@ -127,7 +143,7 @@ def _tkey(dt: datetime | None) -> str:
 # ────────────────────────────────────────────────────────────────────
 # Кластеризация (порт buildDerived.ts)
 # ────────────────────────────────────────────────────────────────────
-@dataclass
+@dataclass(slots=True)
 class _Row:
     id: int
     title: str
@@ -143,22 +159,47 @@ class _Row:
     override: int | None = None  # dup_override_group — принудительная склейка
     venue: str | None = None     # location_meta.venue — гео-ключ площадки
     phash: str | None = None     # dHash постера — дедуп по картинке (см. Проход C)
+    sig: str | None = None       # rank_sig на момент загрузки (см. _rank_sig_expr)
+
+
+@dataclass
+class ClusterStats:
+    """Профиль одного cluster(): время стадий (сек) и число склеек по проходам.
+    Стадии: exact, fuzzy, override, prep (агрегаты групп), pass_a, pass_b, pass_cd
+    (+ score из _rank и load/write из recompute_feed_ranks);
+    склейки: exact, fuzzy, override, pass_a, pass_b, pass_c, pass_d."""
+    seconds: dict[str, float] = field(default_factory=dict)
+    merges: dict[str, int] = field(default_factory=dict)
+
+    def merge(self, name: str) -> None:
+        self.merges[name] = self.merges.get(name, 0) + 1
 
 
 def cluster(
     rows: list[_Row],
     phash_max_hamming: int | None = None,
     phash_corrob_hamming: int | None = None,
+    stats: ClusterStats | None = None,
 ) -> list[list[_Row]]:
     """Схлопывает кросс-посты в группы. Возвращает список групп (списков строк).
 
     phash_max_hamming — строгий порог dHash (Проход C, безусловная склейка);
     phash_corrob_hamming — рыхлый порог dHash с подтверждением именем (Проход D).
-    None → соответствующий проход выключен (обратная совместимость)."""
+    None → соответствующий проход выключен (обратная совместимость).
+    stats — если передан, заполняется временем и склейками по проходам."""
+    clock = time.perf_counter
+    t_start = t_fuzzy = t_mark = 0.0
+    if stats is not None:
+        t_start = clock()
     groups: list[list[_Row]] = []
     reps: list[_Row] = []  # представитель группы (лучший титул), индекс = группа
     exact_to_idx: dict[str, int] = {}
-    name_buckets: dict[str, list[tuple[set[str], int]]] = {}
+    # Fuzzy-кандидаты — из MinHash-LSH (ns = день), а не линейным сканом бакета
+    # дня; точный _overlap считаем только на коллизиях. name_entries — записи
+    # (имя, группа) в порядке вставки: среди кандидатов берём самую раннюю
+    # подходящую, как делал скан.
+    lsh = MinHashLSH()
+    name_entries: list[tuple[set[str], int]] = []
 
     for e in rows:
         t = _tkey(e.event_time)
@@ -185,12 +226,21 @@ def cluster(
         for k in exact:
             if k in exact_to_idx:
                 dup = exact_to_idx[k]
+                if stats is not None:
+                    stats.merge("exact")
                 break
-        if dup < 0 and len(nm) >= 3:
-            for bnm, bidx in name_buckets.get(day, []):
-                if len(bnm) >= 3 and _overlap(nm, bnm) >= 0.85:
+        t0 = clock() if stats is not None else 0.0
+        sig = lsh.signature(nm) if len(nm) >= 3 else None
+        if dup < 0 and sig is not None:
+            for j in sorted(lsh.query(sig, day)):
+                bnm, bidx = name_entries[j]
+                if _overlap(nm, bnm) >= 0.85:
                     dup = bidx
+                    if stats is not None:
+                        stats.merge("fuzzy")
                     break
+        if stats is not None:
+            t_fuzzy += clock() - t0
 
         if dup >= 0:
             groups[dup].append(e)
@@ -198,8 +248,9 @@ def cluster(
                 reps[dup] = e
             for k in exact:
                 exact_to_idx.setdefault(k, dup)
-            if len(nm) >= 3:
-                name_buckets.setdefault(day, []).append((nm, dup))
+            if sig is not None:
+                lsh.insert(len(name_entries), sig, day)
+                name_entries.append((nm, dup))
             continue
 
         idx = len(reps)
@@ -207,8 +258,25 @@ def cluster(
         groups.append([e])
         for k in exact:
             exact_to_idx[k] = idx
-        if len(nm) >= 3:
-            name_buckets.setdefault(day, []).append((nm, idx))
+        if sig is not None:
+            lsh.insert(len(name_entries), sig, day)
+            name_entries.append((nm, idx))
+
+    # Индексы первого прохода дальше не нужны — отпускаем до агрегатов групп
+    # (иначе они держат пик памяти на больших лентах).
+    del exact_to_idx, lsh, name_entries
+
+    if stats is not None:
+        t_mark = clock()
+        stats.seconds["fuzzy"] = t_fuzzy
+        stats.seconds["exact"] = t_mark - t_start - t_fuzzy
+
+    def _stage(name: str) -> None:
+        nonlocal t_mark
+        if stats is not None:
+            now = clock()
+            stats.seconds[name] = now - t_mark
+            t_mark = now
 
     # Override: события с одинаковым dup_override_group принудительно в одной группе
     # (семантический дедуп трудных кросс-постов, что токен-оверлап не берёт: разные
@@ -221,14 +289,22 @@ def cluster(
             i = parent[i]
         return i
 
+    def _union(a: int, b: int, name: str) -> None:
+        ra, rb = _find(a), _find(b)
+        if ra != rb:
+            parent[ra] = rb
+            if stats is not None:
+                stats.merge(name)
+
     ov_seen: dict[int, int] = {}
     for gi, grp in enumerate(groups):
         for m in grp:
             if m.override is not None:
                 if m.override in ov_seen:
-                    parent[_find(gi)] = _find(ov_seen[m.override])
+                    _union(gi, ov_seen[m.override], "override")
                 else:
                     ov_seen[m.override] = gi
+    _stage("override")
 
     # ── Семантические склейки: кросс-посты одного события, что токен-оверлап (0.85)
     # не берёт из-за разных постеров/текста. Аггрегаты по текущим группам: ──
@@ -239,9 +315,11 @@ def cluster(
                 if m.event_time and (m.event_time.hour or m.event_time.minute)} for g in groups]
     g_venues = [{m.venue for m in g if m.venue} for g in groups]
     g_quotes = [set().union(*[_quote_keys(m.title, m.descr) for m in g]) for g in groups]
+    _stage("prep")
 
     # Проход A — одна ПЛОЩАДКА (venue из геокода) + один ДЕНЬ + похожий текст
     # (overlap ≥ 0.5): venue — сильный приор, поэтому снижаем фаззи-порог с 0.85.
+    # Сравнение — только с первой группой ключа (venue, день), скана тут нет.
     vd_seen: dict[tuple[str, str], int] = {}
     for gi in range(len(groups)):
         for v in g_venues[gi]:
@@ -251,7 +329,8 @@ def cluster(
                 if oj is None:
                     vd_seen[key] = gi
                 elif _find(gi) != _find(oj) and _overlap(g_names[gi], g_names[oj]) >= 0.5:
-                    parent[_find(gi)] = _find(oj)
+                    _union(gi, oj, "pass_a")
+    _stage("pass_a")
 
     # Проход B — один ДЕНЬ+ТОЧНОЕ ВРЕМЯ (не полночь) + РАЗНЫЕ каналы + общее имя в
     # кавычках. Ловит кросс-посты одного события с разными постерами/текстом (напр.
@@ -267,7 +346,8 @@ def cluster(
                 ga, gb = gis[a], gis[b]
                 if _find(ga) != _find(gb) and g_chan[ga].isdisjoint(g_chan[gb]) \
                         and _quotes_overlap(g_quotes[ga], g_quotes[gb]):
-                    parent[_find(ga)] = _find(gb)
+                    _union(ga, gb, "pass_b")
+    _stage("pass_b")
 
     # Проходы C/D — перцептивный dHash постера. Один и тот же постер, перепакованный
     # Telegram при перепосте (media_hash-sha256 разошёлся, текст/имя разные), даёт
@@ -280,35 +360,45 @@ def cluster(
     #     размывается (overlap 0.25), поэтому смотрим и на ЧИСЛО общих токенов
     #     (atelier+musique = 2). Подтверждение отсекает лукэлайки разных афиш
     #     одного шаблона («ФИНСКИЙ ЗАЛИВ» vs «FABŪLA» — общих слов 0).
+    #   Хэши парсим в int один раз; внутри дня (и длины хэша) — плоский скан XOR +
+    #   bit_count по int'ам. Индекс (BK-дерево, multi-index hashing) при радиусе
+    #   14 из 64 бит почти ничего не отсекает и в Python медленнее скана (см.
+    #   app.bench_ranking).
     if phash_max_hamming is not None or phash_corrob_hamming is not None:
-        from app.imagehash import hamming as _ham
+        from app.imagehash import to_int
 
-        g_phashes = [[m.phash for m in g if m.phash] for g in groups]
-        day_bucket: dict[str, list[int]] = {}
-        for gi in range(len(groups)):
+        radius = max(h for h in (phash_max_hamming, phash_corrob_hamming) if h is not None)
+        day_hashes: dict[tuple[str, int], list[tuple[int, int]]] = {}
+        for gi, g in enumerate(groups):
+            phs = {(len(m.phash), to_int(m.phash)) for m in g if m.phash}
             for d in g_days[gi]:
-                day_bucket.setdefault(d, []).append(gi)
-
-        def _phash_min(pa: list[str], pb: list[str]) -> int:
-            return min((_ham(x, y) for x in pa for y in pb if len(x) == len(y)), default=99)
-
-        for gis in day_bucket.values():
-            for a in range(len(gis)):
-                for b in range(a + 1, len(gis)):
-                    ga, gb = gis[a], gis[b]
-                    if _find(ga) == _find(gb):
+                for ln, ph in phs:
+                    day_hashes.setdefault((d, ln), []).append((ph, gi))
+
+        # min Hamming по каждой паре групп (ga < gb), в пределах radius
+        near: dict[tuple[int, int], int] = {}
+        for items in day_hashes.values():
+            for i, (ha, ga) in enumerate(items):
+                for hb, gb in items[i + 1:]:
+                    if ga == gb:
                         continue
-                    pa, pb = g_phashes[ga], g_phashes[gb]
-                    if not (pa and pb):
-                        continue
-                    d = _phash_min(pa, pb)
-                    if phash_max_hamming is not None and d <= phash_max_hamming:
-                        parent[_find(ga)] = _find(gb)  # Проход C — строгий
-                    elif phash_corrob_hamming is not None and d <= phash_corrob_hamming and (
-                        _overlap(g_names[ga], g_names[gb]) >= 0.5
-                        or len(g_names[ga] & g_names[gb]) >= 2
-                    ):
-                        parent[_find(ga)] = _find(gb)  # Проход D — рыхлый + имя
+                    dist = (ha ^ hb).bit_count()
+                    if dist <= radius:
+                        pair = (ga, gb) if ga < gb else (gb, ga)
+                        if dist < near.get(pair, 99):
+                            near[pair] = dist
+
+        for (ga, gb), dist in near.items():
+            if _find(ga) == _find(gb):
+                continue
+            if phash_max_hamming is not None and dist <= phash_max_hamming:
+                _union(ga, gb, "pass_c")  # Проход C — строгий
+            elif phash_corrob_hamming is not None and dist <= phash_corrob_hamming and (
+                _overlap(g_names[ga], g_names[gb]) >= 0.5
+                or len(g_names[ga] & g_names[gb]) >= 2
+            ):
+                _union(ga, gb, "pass_d")  # Проход D — рыхлый + имя
+    _stage("pass_cd")
 
     if any(parent[i] != i for i in range(len(parent))):
         by_root: dict[int, list[_Row]] = {}
@@ -325,19 +415,20 @@ _AUTH_NORM = {1: 0.2, 2: 0.6, 3: 1.0}
 _X_NORM = {0: 0.0, 1: 0.35, 2: 0.7}
 
 
-def _score(group: list[_Row], today: date, endorsed: bool = False) -> float:
-    chans = {m.channel for m in group if m.channel}
+SCORE_VERSION = 2  # формула/раскладка скора; смена → полный пересчёт (rank_state.params)
+
+
+def _static_score(group: list[_Row], endorsed: bool = False) -> tuple[float, date | None, date | None]:
+    """Не зависящая от даты часть скора + опорные дни для time-части:
+    (static, день ближайшего старта группы, день закрытия для «последнего шанса»
+    или None, если группа на буст не претендует)."""
     non_agg = {m.channel for m in group if m.channel and m.ctype != "aggregator"}
     auth = max((int(m.authority) for m in group), default=1)
     auth_norm = _AUTH_NORM.get(max(1, min(3, auth)), 0.2)
     x_norm = _X_NORM.get(len(non_agg), 1.0)
 
     dts = [m.event_time.date() for m in group if m.event_time]
-    if not dts:
-        prox = 0.45
-    else:
-        days = (min(dts) - today).days
-        prox = 1.0 if days <= 0 else math.exp(-days / 21.0)
+    start_day = min(dts) if dts else None
 
     fs = max((m.filter_score or 0) for m in group)
     fs_norm = max(0.0, min(1.0, (fs - 4) / 7.0))
@@ -349,23 +440,62 @@ def _score(group: list[_Row], today: date, endorsed: bool = False) -> float:
         blob_tokens |= _name_tokens(m.title, m.descr)
     cancelled = bool(blob_tokens & CANCELLED_NAME_TOKENS)
 
-    score = 0.35 * auth_norm + 0.25 * x_norm + 0.25 * prox + 0.15 * qual
+    score = 0.35 * auth_norm + 0.25 * x_norm + 0.15 * qual
     if endorsed:
         score += ENDORSE_BOOST
     # «Последний шанс» — чёткое скорое закрытие поднимает в ранге. Многодневное на
-    # исходе ИЛИ однодневный финисаж/последний день (по тексту). Ближе → сильнее.
+    # исходе ИЛИ однодневный финисаж/последний день (по тексту). Здесь решаем
+    # только «претендует ли»; величину буста (ближе → сильнее) даёт _time_score.
+    close_day = None
     end_dts = [m.event_time_end.date() for m in group if m.event_time_end]
     if end_dts:
         end_day = min(end_dts)
-        d_end = (end_day - today).days
-        if 0 <= d_end <= CLOSE_WINDOW:
-            starts = [m.event_time.date() for m in group if m.event_time]
-            multi = (not starts) or (end_day > min(starts))
-            if multi or _CLOSING_RE.search(" ".join((m.title or "") + " " + (m.descr or "") for m in group)):
-                score += CLOSE_BOOST * (1 - d_end / CLOSE_WINDOW)
+        multi = start_day is None or end_day > start_day
+        if multi or _CLOSING_RE.search(" ".join((m.title or "") + " " + (m.descr or "") for m in group)):
+            close_day = end_day
     if cancelled:
         score -= 5.0
-    return round(score, 4)
+    return round(score, 4), start_day, close_day
+
+
+def _time_score(start_day: date | None, close_day: date | None, today: date) -> float:
+    """Зависящая от даты часть: 0.25·time_proximity + «последний шанс».
+    SQL-близнец — rank_order_expr, держать в синхроне."""
+    if start_day is None:
+        prox = 0.45
+    else:
+        days = (start_day - today).days
+        prox = 1.0 if days <= 0 else math.exp(-days / 21.0)
+    score = 0.25 * prox
+    if close_day is not None:
+        d_end = (close_day - today).days
+        if 0 <= d_end <= CLOSE_WINDOW:
+            score += CLOSE_BOOST * (1 - d_end / CLOSE_WINDOW)
+    return score
+
+
+def _score(group: list[_Row], today: date, endorsed: bool = False) -> float:
+    """Полный скор группы на дату today (статика + time-часть)."""
+    static, start_day, close_day = _static_score(group, endorsed)
+    return round(static + _time_score(start_day, close_day, today), 4)
+
+
+def rank_order_expr(today: date):
+    """Ключ сортировки ленты: rank_score + time-часть (_time_score) на SQL от
+    rank_start_day / rank_close_day. Неотранжированные (rank_score NULL) →
+    нейтральный 0.5."""
+    d_start = type_coerce(EventCurated.rank_start_day - literal(today, Date), Integer)
+    d_close = type_coerce(EventCurated.rank_close_day - literal(today, Date), Integer)
+    prox = case(
+        (EventCurated.rank_start_day.is_(None), 0.45),
+        (d_start <= 0, 1.0),
+        else_=func.exp(-d_start / 21.0),
+    )
+    close = case(
+        (and_(d_close >= 0, d_close <= CLOSE_WINDOW), CLOSE_BOOST * (1 - d_close / float(CLOSE_WINDOW))),
+        else_=0.0,
+    )
+    return func.coalesce(EventCurated.rank_score + 0.25 * prox + close, 0.5)
 
 
 def _primary(group: list[_Row]) -> _Row:
@@ -373,19 +503,40 @@ def _primary(group: list[_Row]) -> _Row:
     return max(group, key=lambda e: (_title_score(e.title), int(e.authority), -e.id))
 
 
+_Update = tuple[int, int, bool, int, float, date | None, date | None]  # id, group_id, primary, xcount, static score, start, close
+
+
 @dataclass
 class RankResult:
     rows: int = 0
     groups: int = 0
     collapsed: int = 0
     endorsed: int = 0  # групп с одобрением @animalswithhands
-    updates: list[tuple[int, int, bool, int, float]] = field(default_factory=list)  # id, group_id, primary, xcount, score
+    updates: list[_Update] = field(default_factory=list)
+    mode: str = "full"  # full | incremental
+    days: int = 0       # сколько дней-бакетов перекластеризовано (incremental)
+    changed: int = 0    # строк, реально изменённых записью (churn прогона)
+    stats: ClusterStats = field(default_factory=ClusterStats)  # стадии/склейки, см. explain()
+
+    def explain(self) -> str:
+        """Человекочитаемый профиль прогона: сводка, время по стадиям, склейки."""
+        sec = self.stats.seconds
+        stages = " ".join(f"{k}={v:.3f}" for k, v in sec.items())
+        merges = " ".join(f"{k}={v}" for k, v in sorted(self.stats.merges.items())) or "—"
+        return (
+            f"{self.mode}: {self.rows} строк → {self.groups} групп (−{self.collapsed}), "
+            f"дней {self.days}, изменено {self.changed}, {sum(sec.values()):.3f}s\n"
+            f"  стадии: {stages}\n  склейки: {merges}"
+        )
 
 
-async def _load_rows(session: AsyncSession) -> list[_Row]:
+def _feed_query(*cols):
+    """SELECT по фид-событиям — тот же фильтр, что у list_feed: approved,
+    предстоящие/идущие, Москва, с постером."""
     now = datetime.utcnow()
-    q = (
-        select(EventCurated, PostRaw, Channel)
+    return (
+        select(*cols)
+        .select_from(EventCurated)
         .join(PostRaw, PostRaw.id == EventCurated.post_id)
         .join(Channel, Channel.id == PostRaw.channel_id, isouter=True)
         .where(EventCurated.status == EventStatus.approved)
@@ -396,41 +547,85 @@ async def _load_rows(session: AsyncSession) -> list[_Row]:
         .where(or_(EventCurated.event_time >= now, EventCurated.event_time_end >= now))
         .where(func.coalesce(EventCurated.location_meta.op("->>")("region"), "moscow").notin_(["spb", "other"]))
         .where(func.cast(PostRaw.media_urls, String).ilike("%.jpg%"))
-        .order_by(EventCurated.event_time.asc().nulls_last(), EventCurated.id.asc())
     )
+
+
+def _rank_sig_expr():
+    """md5 всех входов cluster()/_score() строки, считается на стороне БД. Текст
+    поста не входит: posts_raw.text не меняется после insert_unseen (ON CONFLICT
+    DO NOTHING), а гонять md5 по всем текстам каждые 15 мин незачем."""
+    return func.md5(func.concat_ws(
+        "|",
+        EventCurated.title, EventCurated.event_time, EventCurated.event_time_end,
+        EventCurated.filter_score, EventCurated.dup_override_group,
+        EventCurated.location_meta.op("->>")("venue"),
+        PostRaw.media_hash, PostRaw.media_phash,
+        Channel.handle, Channel.ctype, Channel.weight,
+    ))
+
+
+def _day(dt: datetime | None) -> date | None:
+    return dt.date() if dt else None
+
+
+_LOAD_BATCH = 2000  # строк на fetch серверного курсора в _load_rows
+
+
+async def _load_rows(session: AsyncSession, days: set[date | None] | None = None) -> list[_Row]:
+    """Фид-строки для cluster(). days → только эти дни-бакеты (по дате
+    event_time; None = строки без event_time) — для инкрементального режима.
+
+    Тянем только нужные cluster() колонки (не ORM-сущности целиком с JSON
+    media_urls/filter_reasons/location_meta) серверным курсором пачками по
+    _LOAD_BATCH и сразу собираем _Row: в памяти не живут одновременно результат
+    запроса, identity map и строки. Хэндл/ctype канала — общие объекты на канал."""
+    q = _feed_query(
+        EventCurated.id, EventCurated.title, PostRaw.text,
+        EventCurated.event_time, EventCurated.event_time_end,
+        PostRaw.media_hash, EventCurated.filter_score,
+        Channel.handle, PostRaw.message_id, Channel.ctype, Channel.weight,
+        EventCurated.dup_override_group, EventCurated.location_meta.op("->>")("venue"),
+        PostRaw.media_phash, _rank_sig_expr(),
+    )
+    if days is not None:
+        dated = [d for d in days if d is not None]
+        conds = []
+        if dated:
+            conds.append(func.date(EventCurated.event_time).in_(dated))
+        if None in days:
+            conds.append(EventCurated.event_time.is_(None))
+        if not conds:
+            return []
+        q = q.where(or_(*conds))
+    q = q.order_by(EventCurated.event_time.asc().nulls_last(), EventCurated.id.asc())
+    q = q.execution_options(yield_per=_LOAD_BATCH)
+
+    channels: dict[tuple, tuple[str, str | None, float]] = {}
     rows: list[_Row] = []
-    for ev, post, ch in (await session.execute(q)).all():
-        rows.append(
-            _Row(
-                id=ev.id,
-                title=(ev.title or "").strip(),
-                descr=post.text or "",
-                event_time=ev.event_time,
-                event_time_end=ev.event_time_end,
-                media_hash=post.media_hash,
-                filter_score=ev.filter_score or 0,
-                channel=(ch.handle.lstrip("@").lower() if ch and ch.handle else ""),
-                message_id=post.message_id,
-                ctype=(ch.ctype if ch else None),
-                authority=(ch.weight if ch and ch.weight else 1.0),
-                override=ev.dup_override_group,
-                venue=((ev.location_meta or {}).get("venue") if isinstance(ev.location_meta, dict) else None),
-                phash=post.media_phash,
-            )
-        )
+    result = await session.stream(q)
+    async for part in result.partitions():
+        for eid, title, text, et, et_end, mhash, fs, handle, mid, ctype, weight, ov, venue, phash, sig in part:
+            key = (handle, ctype, weight)
+            chan = channels.get(key)
+            if chan is None:
+                chan = channels[key] = (handle.lstrip("@").lower() if handle else "", ctype, weight or 1.0)
+            rows.append(_Row(
+                eid, (title or "").strip(), text or "", et, et_end, mhash, fs or 0,
+                chan[0], mid, chan[1], chan[2], ov, venue, phash, sig,
+            ))
     return rows
 
 
-async def _load_endorsed_links(session: AsyncSession) -> set[tuple[str, int]]:
-    """Множество (канал, message_id), на которые ссылается @animalswithhands в
-    своих постах — редакционные «одобрения» событий."""
-    q = (
-        select(PostRaw.text)
-        .join(Channel, Channel.id == PostRaw.channel_id)
-        .where(func.lower(func.replace(Channel.handle, "@", "")) == AWH_HANDLE)
-    )
+def is_endorser(handle: str | None) -> bool:
+    """Канал-куратор, чьи ссылки считаются одобрениями."""
+    return (handle or "").lstrip("@").lower() == AWH_HANDLE
+
+
+def extract_links(texts) -> set[tuple[str, int]]:
+    """(канал, message_id) всех ссылок t.me/<канал>/<msg> в текстах, кроме
+    ссылок куратора на самого себя."""
     links: set[tuple[str, int]] = set()
-    for (text,) in (await session.execute(q)).all():
+    for text in texts:
         for h, mid in _TME_RE.findall(text or ""):
             h = h.lower()
             if h != AWH_HANDLE:
@@ -438,36 +633,287 @@ async def _load_endorsed_links(session: AsyncSession) -> set[tuple[str, int]]:
     return links
 
 
-async def recompute_feed_ranks(
-    session: AsyncSession, *, apply: bool = True,
-    phash_hamming: int | None = None, phash_corrob: int | None = None,
-) -> RankResult:
-    """Пересчитать дедуп-группы + rank_score для всех фид-событий.
+def _norm_handle():
+    return func.lower(func.replace(Channel.handle, "@", ""))
 
-    phash_hamming — строгий порог dHash (Проход C); phash_corrob — рыхлый порог с
-    подтверждением именем (Проход D). None → соответствующий проход выключен."""
-    rows = await _load_rows(session)
-    endorsed_links = await _load_endorsed_links(session)
-    groups = cluster(rows, phash_max_hamming=phash_hamming, phash_corrob_hamming=phash_corrob)
-    today = datetime.utcnow().date()
 
-    res = RankResult(rows=len(rows), groups=len(groups), collapsed=len(rows) - len(groups))
+async def _load_endorsed_links(session: AsyncSession) -> set[tuple[str, int]]:
+    """Множество (канал, message_id) фид-событий, на которые ссылается
+    @animalswithhands — редакционные «одобрения». Джойн ленты с endorsements
+    по индексу (channel, message_id)."""
+    q = _feed_query(Endorsement.channel, Endorsement.message_id).join(
+        Endorsement,
+        and_(Endorsement.channel == _norm_handle(), Endorsement.message_id == PostRaw.message_id),
+    ).distinct()
+    return {(ch, mid) for ch, mid in (await session.execute(q)).all()}
+
+
+# ────────────────────────────────────────────────────────────────────
+# Инкрементальный режим: кластеры не пересекают день (все ключи/проходы — в
+# пределах дня, кроме override), поэтому перекластеризуем только дни, где что-то
+# поменялось, а группы прочих дней берём как есть из events_curated.
+# ────────────────────────────────────────────────────────────────────
+_SigRow = tuple[int, date | None, str, str | None, int | None]  # id, день, sig, сохранённый sig, override
+
+
+def _touched_days(
+    snapshot: list[_SigRow], seed_ids: set[int] = frozenset(), seed_days: set[date | None] = frozenset(),
+) -> set[date | None]:
+    """Дни, которые надо перекластеризовать: где у строки сменился sig (новая /
+    изменённая / появился phash), где лежат seed_ids (новые одобрения), плюс
+    seed_days (ушедшие из ленты). Замыкаем по dup_override_group — только он
+    склеивает группы через границу дня."""
+    days: set[date | None] = set(seed_days)
+    ov_days: dict[int, set[date | None]] = {}
+    for eid, day, sig, stored, ov in snapshot:
+        if sig != stored or eid in seed_ids:
+            days.add(day)
+        if ov is not None:
+            ov_days.setdefault(ov, set()).add(day)
+    grown = True
+    while grown:
+        grown = False
+        for ds in ov_days.values():
+            if not ds <= days and not ds.isdisjoint(days):
+                days |= ds
+                grown = True
+    return days
+
+
+async def _load_state(session: AsyncSession) -> RankState | None:
+    return await session.get(RankState, 1)
+
+
+async def _awh_max_id(session: AsyncSession) -> int | None:
+    return (await session.execute(select(func.max(Endorsement.id)))).scalar()
+
+
+def _new_endorsed_q(mark: int | None):
+    """События, одобренные после водяного знака. Знак — endorsements.id (порядок
+    вставки): backfill_endorsements пишет старые посты куратора с post_id ниже
+    любого уже учтённого, по post_id их дни так и остались бы чистыми."""
+    return (
+        select(EventCurated.id)
+        .join(PostRaw, PostRaw.id == EventCurated.post_id)
+        .join(Channel, Channel.id == PostRaw.channel_id)
+        .join(Endorsement, and_(
+            Endorsement.channel == _norm_handle(), Endorsement.message_id == PostRaw.message_id,
+        ))
+        .where(Endorsement.id > (mark or 0))
+    )
+
+
+async def _dirty_days(
+    session: AsyncSession, state: RankState,
+) -> tuple[set[date | None], list[int]]:
+    """(дни для перекластеризации, id ушедших из ленты строк с rank_sig)."""
+    snap_q = _feed_query(
+        EventCurated.id, EventCurated.event_time, _rank_sig_expr(),
+        EventCurated.rank_sig, EventCurated.dup_override_group,
+    )
+    snapshot: list[_SigRow] = [
+        (eid, _day(et), sig, stored, ov) for eid, et, sig, stored, ov in (await session.execute(snap_q)).all()
+    ]
+    feed_ids = {r[0] for r in snapshot}
+
+    # Ушедшие из ленты (прошли/сняты/сменили регион): их день тоже грязный — если
+    # ушёл праймари группы, оставшимся копиям нужен новый.
+    ranked = (await session.execute(
+        select(EventCurated.id, EventCurated.event_time).where(EventCurated.rank_sig.isnot(None))
+    )).all()
+    departed = [(eid, et) for eid, et in ranked if eid not in feed_ids]
+
+    # Одобрения из постов @animalswithhands после водяного знака → их события.
+    q = _new_endorsed_q(state.awh_endorsement_id)
+    seed_ids = {eid for (eid,) in (await session.execute(q)).all()}
+
+    days = _touched_days(snapshot, seed_ids, {_day(et) for _eid, et in departed})
+    return days, [eid for eid, _et in departed]
+
+
+async def _save_state(session: AsyncSession, *, params: str, awh_endorsement_id: int | None) -> None:
+    values = {"params": params, "awh_endorsement_id": awh_endorsement_id, "updated_at": datetime.utcnow()}
+    await session.execute(
+        pg_insert(RankState).values(id=1, **values)
+        .on_conflict_do_update(index_elements=["id"], set_=values)
+    )
+
+
+_WRITE_CHUNK = 2000  # строк на один UPDATE … FROM (VALUES …): 8 параметров/строку < 32767 asyncpg
+
+
+async def _write_back(
+    session: AsyncSession, updates: list[_Update], sig_by_id: dict[int, str | None],
+) -> int:
+    """Записать результат одним UPDATE … FROM (VALUES …) на чанк вместо UPDATE на
+    строку. Строки, где ничего не поменялось (IS DISTINCT FROM), не трогаем —
+    ни лишних версий строк, ни WAL. Возвращает число реально изменённых строк.
+
+    None в VALUES рендерится голым NULL: если в чанке весь столбец дат пуст
+    (скажем, инкремент по одним без-датным), Postgres выводит ему тип text и
+    SET date = text падает — поэтому даты явно приводим к Date."""
+    changed = 0
+    for i in range(0, len(updates), _WRITE_CHUNK):
+        chunk = updates[i:i + _WRITE_CHUNK]
+        v = values(
+            column("id", BigInteger), column("gid", BigInteger), column("prim", Boolean),
+            column("xc", Integer), column("score", Float), column("start", Date), column("close", Date),
+            column("sig", String),
+            name="v",
+        ).data([(*u, sig_by_id.get(u[0])) for u in chunk])
+        start, close = cast(v.c.start, Date), cast(v.c.close, Date)
+        stmt = (
+            update(EventCurated)
+            .where(EventCurated.id == v.c.id)
+            .where(or_(
+                EventCurated.dup_group_id.is_distinct_from(v.c.gid),
+                EventCurated.is_primary.is_distinct_from(v.c.prim),
+                EventCurated.crosspost_count.is_distinct_from(v.c.xc),
+                EventCurated.rank_score.is_distinct_from(v.c.score),
+                EventCurated.rank_start_day.is_distinct_from(start),
+                EventCurated.rank_close_day.is_distinct_from(close),
+                EventCurated.rank_sig.is_distinct_from(v.c.sig),
+            ))
+            .values(
+                dup_group_id=v.c.gid, is_primary=v.c.prim, crosspost_count=v.c.xc,
+                rank_score=v.c.score, rank_start_day=start, rank_close_day=close,
+                rank_sig=v.c.sig,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        changed += (await session.execute(stmt)).rowcount or 0
+    return changed
+
+
+# ────────────────────────────────────────────────────────────────────
+# CPU-стадия (cluster + _score) — чистый Python без БД. Может выполняться в
+# ProcessPoolExecutor, чтобы не стопорить event loop (API, вебхук бота): строки
+# уезжают в воркер компактными кортежами, обратно — только кортежи updates.
+# ────────────────────────────────────────────────────────────────────
+_PACK_FIELDS = (
+    "id", "title", "descr", "event_time", "event_time_end", "media_hash", "filter_score",
+    "channel", "message_id", "ctype", "authority", "override", "venue", "phash",
+)
+
+
+def _pack_rows(rows: list[_Row]) -> list[tuple]:
+    """_Row → кортеж полей в порядке _PACK_FIELDS (без sig — он нужен только
+    при записи в родителе). Кортежи пиклятся заметно компактнее датаклассов."""
+    return [tuple(getattr(r, f) for f in _PACK_FIELDS) for r in rows]
+
+
+def _rank(
+    rows: list[_Row], endorsed_links: set[tuple[str, int]],
+    phash_hamming: int | None, phash_corrob: int | None,
+) -> tuple[int, int, list[_Update], ClusterStats]:
+    """cluster + скоринг. Возвращает (групп, одобренных групп, updates, профиль)."""
+    stats = ClusterStats()
+    groups = cluster(rows, phash_max_hamming=phash_hamming, phash_corrob_hamming=phash_corrob, stats=stats)
+    t0 = time.perf_counter()
+    endorsed_n = 0
+    updates: list[_Update] = []
     for g in groups:
         prim = _primary(g)
         gid = prim.id
         xcount = len({m.channel for m in g if m.channel})
         endorsed = any((m.channel, m.message_id) in endorsed_links for m in g)
         if endorsed:
-            res.endorsed += 1
-        s = _score(g, today, endorsed)
+            endorsed_n += 1
+        s, start_day, close_day = _static_score(g, endorsed)
         for m in g:
-            res.updates.append((m.id, gid, m.id == prim.id, xcount, s))
+            updates.append((m.id, gid, m.id == prim.id, xcount, s, start_day, close_day))
+    stats.seconds["score"] = time.perf_counter() - t0
+    return len(groups), endorsed_n, updates, stats
+
+
+def _rank_packed(
+    packed: list[tuple], endorsed_links: set[tuple[str, int]],
+    phash_hamming: int | None, phash_corrob: int | None,
+) -> tuple[int, int, list[_Update], ClusterStats]:
+    """Точка входа воркера пула: распаковать кортежи из _pack_rows и ранжировать."""
+    return _rank([_Row(*t) for t in packed], endorsed_links, phash_hamming, phash_corrob)
+
+
+def make_rank_executor(mode: str) -> Executor | None:
+    """Исполнитель CPU-стадии по RANK_EXECUTOR: "process" → однопроцессный пул
+    (spawn: форк процесса с живым event loop и потоками небезопасен), иначе
+    None — считать прямо в event loop (детерминированно, для тестов/CLI)."""
+    if mode != "process":
+        return None
+    return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+
+async def recompute_feed_ranks(
+    session: AsyncSession, *, apply: bool = True,
+    phash_hamming: int | None = None, phash_corrob: int | None = None,
+    incremental: bool = False, executor: Executor | None = None,
+) -> RankResult:
+    """Пересчитать дедуп-группы + rank_score для всех фид-событий.
+
+    phash_hamming — строгий порог dHash (Проход C); phash_corrob — рыхлый порог с
+    подтверждением именем (Проход D). None → соответствующий проход выключен.
+
+    incremental=True — перекластеризовать только дни, где что-то поменялось с
+    прошлого прогона (см. _dirty_days). Смена суток пересчёта не требует (time-часть
+    скора считается в ORDER BY, см. rank_order_expr); полный пересчёт — при смене
+    порогов dHash / SCORE_VERSION и при первом прогоне (нет rank_state).
+
+    executor — где считать cluster()/_score() (см. make_rank_executor); None →
+    прямо в текущем event loop.
+
+    С apply=True прогон (время/склейки по стадиям, см. RankResult.explain)
+    пишется в rank_runs."""
+    started = datetime.utcnow()
+    t0 = time.perf_counter()
+    params = f"{phash_hamming}/{phash_corrob}/v{SCORE_VERSION}"
+    awh_mark = await _awh_max_id(session)
+    state = await _load_state(session) if incremental else None
+
+    if state is not None and state.params == params:
+        days, departed = await _dirty_days(session, state)
+        rows = await _load_rows(session, days=days) if days else []
+        res = RankResult(mode="incremental", days=len(days))
+    else:
+        rows = await _load_rows(session)
+        ranked = (await session.execute(
+            select(EventCurated.id).where(EventCurated.rank_sig.isnot(None))
+        )).scalars().all()
+        feed_ids = {r.id for r in rows}
+        departed = [eid for eid in ranked if eid not in feed_ids]
+        res = RankResult()
+
+    if rows:
+        keys = {(r.channel, r.message_id) for r in rows}
+        endorsed_links = await _load_endorsed_links(session) & keys
+    else:
+        endorsed_links = set()
+
+    load_s = time.perf_counter() - t0
+
+    if executor is None or not rows:
+        n_groups, res.endorsed, res.updates, stats = _rank(rows, endorsed_links, phash_hamming, phash_corrob)
+    else:
+        loop = asyncio.get_running_loop()
+        n_groups, res.endorsed, res.updates, stats = await loop.run_in_executor(
+            executor, _rank_packed, _pack_rows(rows), endorsed_links, phash_hamming, phash_corrob,
+        )
+    res.rows, res.groups, res.collapsed = len(rows), n_groups, len(rows) - n_groups
+    res.stats = stats
+    stats.seconds = {"load": load_s, **stats.seconds}
+    sig_by_id = {r.id: r.sig for r in rows}
 
     if apply:
-        for eid, gid, is_prim, xc, s in res.updates:
+        t0 = time.perf_counter()
+        res.changed = await _write_back(session, res.updates, sig_by_id)
+        if departed:
             await session.execute(
-                update(EventCurated)
-                .where(EventCurated.id == eid)
-                .values(dup_group_id=gid, is_primary=is_prim, crosspost_count=xc, rank_score=s)
+                update(EventCurated).where(EventCurated.id.in_(departed)).values(rank_sig=None)
             )
+        await _save_state(session, params=params, awh_endorsement_id=awh_mark)
+        stats.seconds["write"] = time.perf_counter() - t0
+        await RankRunsRepository(session).log(
+            started_at=started, mode=res.mode, params=params, rows=res.rows,
+            groups=res.groups, endorsed=res.endorsed, days=res.days, changed=res.changed,
+            seconds=stats.seconds, merges=stats.merges,
+        )
     return res
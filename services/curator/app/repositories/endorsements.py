@@ -0,0 +1,27 @@
+"""Repository for endorsements — ссылки @animalswithhands на посты каналов."""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Endorsement
+
+
+class EndorsementsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.s = session
+
+    async def record(self, post_id: int, links: Iterable[tuple[str, int]]) -> int:
+        """Сохранить ссылки поста куратора (идемпотентно). Возвращает число новых."""
+        values = [{"post_id": post_id, "channel": ch, "message_id": mid} for ch, mid in sorted(set(links))]
+        if not values:
+            return 0
+        stmt = (
+            pg_insert(Endorsement)
+            .values(values)
+            .on_conflict_do_nothing(constraint="uq_endorsement")
+        )
+        return (await self.s.execute(stmt)).rowcount or 0
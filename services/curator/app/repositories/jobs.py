@@ -0,0 +1,80 @@
+"""Repository for processing_jobs — durable очередь пост-обработки."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Sequence
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Channel, JobKind, JobStatus, PostRaw, ProcessingJob
+
+RETRY_BASE = timedelta(seconds=30)  # backoff: 30s · 2^(attempts-1)
+
+
+class ProcessingJobsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.s = session
+
+    async def enqueue_posts(self, post_ids: Sequence[int]) -> None:
+        if post_ids:
+            await self.s.execute(
+                insert(ProcessingJob),
+                [{"kind": JobKind.process, "post_id": pid} for pid in post_ids],
+            )
+
+    async def enqueue_fanouts(self, event_ids: Sequence[int]) -> None:
+        if event_ids:
+            await self.s.execute(
+                insert(ProcessingJob),
+                [{"kind": JobKind.fanout, "event_id": eid} for eid in event_ids],
+            )
+
+    def _claimable(self, kind: JobKind):
+        return (
+            select(ProcessingJob)
+            .where(
+                ProcessingJob.kind == kind,
+                ProcessingJob.status == JobStatus.pending,
+                ProcessingJob.available_at <= datetime.utcnow(),
+            )
+            .order_by(ProcessingJob.id)
+        )
+
+    async def claim_posts(self, limit: int) -> list[tuple[ProcessingJob, PostRaw, str]]:
+        """Забрать до limit process-задач вместе с постом и хэндлом канала.
+        Строки задач остаются залоченными до конца транзакции; другие воркеры/
+        реплики их пропускают (SKIP LOCKED), а не ждут."""
+        stmt = (
+            self._claimable(JobKind.process)
+            .add_columns(PostRaw, Channel.handle)
+            .join(PostRaw, PostRaw.id == ProcessingJob.post_id)
+            .join(Channel, Channel.id == PostRaw.channel_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=ProcessingJob)
+        )
+        return [(job, post, handle) for job, post, handle in (await self.s.execute(stmt)).all()]
+
+    async def claim_fanouts(self, limit: int) -> list[ProcessingJob]:
+        stmt = self._claimable(JobKind.fanout).limit(limit).with_for_update(skip_locked=True)
+        return list((await self.s.execute(stmt)).scalars().all())
+
+    async def complete(self, job_ids: Sequence[int]) -> None:
+        if job_ids:
+            await self.s.execute(delete(ProcessingJob).where(ProcessingJob.id.in_(job_ids)))
+
+    async def retry(self, job_id: int, attempts: int, error: str, *, max_attempts: int) -> None:
+        """Отложить задачу с экспоненциальным backoff; attempts — уже с учётом
+        этой попытки. Исчерпала попытки → failed (остаётся в таблице для разбора,
+        воркеры её больше не берут)."""
+        await self.s.execute(
+            update(ProcessingJob)
+            .where(ProcessingJob.id == job_id)
+            .values(
+                attempts=attempts,
+                status=JobStatus.failed if attempts >= max_attempts else JobStatus.pending,
+                available_at=datetime.utcnow() + RETRY_BASE * 2 ** (attempts - 1),
+                last_error=error[:500],
+            )
+        )
@@ -6,7 +6,7 @@ import re
 from datetime import datetime
 from typing import Sequence
 
-from sqlalchemy import String, delete, distinct, func, or_, select
+from sqlalchemy import String, delete, distinct, func, or_, select, tuple_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -20,6 +20,7 @@ from app.models import (
     UserFeedback,
     UserInterest,
 )
+from app.ranking import rank_order_expr
 
 
 _LEAD_JUNK = re.compile(r"^[\W_]+", re.UNICODE)  # ведущие эмодзи/символы/пробелы
@@ -76,6 +77,36 @@ def build_feed_item(
     }
 
 
+def feed_query(now: datetime):
+    """SELECT (EventCurated, PostRaw) of the primary feed — the card filters shared
+    by list_feed and the in-memory FeedSnapshot (app.services.feed_snapshot), so
+    the two can never disagree on what is in the feed. No ORDER BY / LIMIT."""
+    # Base events query — upcoming (and ongoing) events. Past-dated events
+    # are dropped so the feed/map shows what's still ahead.
+    return (
+        select(EventCurated, PostRaw)
+        .join(PostRaw, PostRaw.id == EventCurated.post_id)
+        .where(EventCurated.status == EventStatus.approved)
+        # Идущие события (напр. выставки): старт мог быть в прошлом, но пока
+        # event_time_end в будущем — оставляем в ленте (для «последнего шанса»).
+        # События БЕЗ дат (event_time и event_time_end оба NULL) в ленту НЕ
+        # пускаем: это почти всегда прошедшие разовые события с нераспарсенной
+        # датой — раньше протекали через клаузу `event_time IS NULL`.
+        .where(or_(EventCurated.event_time >= now, EventCurated.event_time_end >= now))
+        # Moscow-only feed: drop events tagged as another city. region is set
+        # by the city-detection pass (coords for geocoded, poster-vision for
+        # the rest); unset/unknown defaults to moscow so nothing is lost.
+        .where(func.coalesce(EventCurated.location_meta.op("->>")("region"), "moscow").notin_(["spb", "other"]))
+        # Usable poster required: an event with no image, or video-only media,
+        # renders as a blank card — keep it out of the feed/map entirely.
+        .where(func.cast(PostRaw.media_urls, String).ilike("%.jpg%"))
+        # Cross-post dedup: одна карточка на событие (app.ranking выставляет
+        # is_primary). До первого пересчёта is_primary=true у всех → фильтр
+        # ничего не режет (безопасно).
+        .where(EventCurated.is_primary.is_(True))
+    )
+
+
 class UserInterestsRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.s = session
@@ -129,44 +160,20 @@ class PersonalizedFeedRepository:
         - If `tag_keys` provided, restrict to events that have ANY of these tags.
         - If neither user_id nor tag_keys → all approved events, recency order.
         """
-        # Base events query — upcoming (and undated) events. Past-dated events
-        # are dropped so the feed/map shows what's still ahead. Geocoded events
-        # come FIRST (then by soonest event_time): the map plots only events
-        # with coordinates, and most upcoming events lack them (no auto-geocode
-        # yet), so without this the recency-flood of un-geocoded aggregator
-        # posts buries the few geocoded ones out of the fetch window and the map
-        # renders empty. Geo-first keeps placeable events in the window.
         now = datetime.utcnow()
-        ev_q = (
-            select(EventCurated, PostRaw)
-            .join(PostRaw, PostRaw.id == EventCurated.post_id)
-            .where(EventCurated.status == EventStatus.approved)
-            # Идущие события (напр. выставки): старт мог быть в прошлом, но пока
-            # event_time_end в будущем — оставляем в ленте (для «последнего шанса»).
-            # События БЕЗ дат (event_time и event_time_end оба NULL) в ленту НЕ
-            # пускаем: это почти всегда прошедшие разовые события с нераспарсенной
-            # датой — раньше протекали через клаузу `event_time IS NULL`.
-            .where(or_(EventCurated.event_time >= now, EventCurated.event_time_end >= now))
-            # Moscow-only feed: drop events tagged as another city. region is set
-            # by the city-detection pass (coords for geocoded, poster-vision for
-            # the rest); unset/unknown defaults to moscow so nothing is lost.
-            .where(func.coalesce(EventCurated.location_meta.op("->>")("region"), "moscow").notin_(["spb", "other"]))
-            # Usable poster required: an event with no image, or video-only media,
-            # renders as a blank card — keep it out of the feed/map entirely.
-            .where(func.cast(PostRaw.media_urls, String).ilike("%.jpg%"))
-            # Cross-post dedup: одна карточка на событие (app.ranking выставляет
-            # is_primary). До первого пересчёта is_primary=true у всех → фильтр
-            # ничего не режет (безопасно).
-            .where(EventCurated.is_primary.is_(True))
-            # Ранжирование: «самое интересное вверх» (app.ranking.rank_score).
-            # Неотранжированные (новые/до пересчёта) → нейтральный 0.5: садятся в
-            # середину (видны, не хоронятся вниз). До первого пересчёта все = 0.5 →
-            # тай → прежний порядок: гео-первыми, затем ближайшие по времени.
-            .order_by(
-                func.coalesce(EventCurated.rank_score, 0.5).desc(),
-                EventCurated.location_meta.isnot(None).desc(),
-                EventCurated.event_time.asc().nulls_last(),
-            )
+        # Ранжирование: «самое интересное вверх» — статический rank_score +
+        # зависящая от даты часть (близость, «последний шанс»), считаемая тут
+        # же на сегодня (app.ranking.rank_order_expr). Неотранжированные
+        # (новые/до пересчёта) → нейтральный 0.5: садятся в середину (видны,
+        # не хоронятся вниз). До первого пересчёта все = 0.5 → тай → прежний
+        # порядок: гео-первыми, затем ближайшие по времени. Geocoded events
+        # come first among ties: the map plots only events with coordinates,
+        # and without this the recency-flood of un-geocoded aggregator posts
+        # buries the few geocoded ones out of the fetch window.
+        ev_q = feed_query(now).order_by(
+            rank_order_expr(now.date()).desc(),
+            EventCurated.location_meta.isnot(None).desc(),
+            EventCurated.event_time.asc().nulls_last(),
         )
 
         # Filter by tags
@@ -188,7 +195,45 @@ class PersonalizedFeedRepository:
 
         ev_q = ev_q.limit(limit).offset(offset)
         rows = (await self.s.execute(ev_q)).all()
+        return await self.feed_items(rows)
+
+    async def list_venue_events(
+        self, venue_key: str, *, user_id: int | None, limit: int = 20,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[dict]:
+        """Upcoming/ongoing primary events at one venue (the place card), by start.
+
+        Keyset-paginated on (coalesce(event_time, event_time_end), id) — the
+        ix_events_venue_key index order — so a deep page costs the same as the
+        first. `after` is the (start, id) of the last item of the previous page.
+        Same card filters as list_feed minus the Moscow-only one: a venue page
+        shows whatever is at that venue.
+        """
+        now = datetime.utcnow()
+        starts = func.coalesce(EventCurated.event_time, EventCurated.event_time_end)
+        ev_q = (
+            select(EventCurated, PostRaw)
+            .join(PostRaw, PostRaw.id == EventCurated.post_id)
+            .where(EventCurated.venue_key == venue_key)
+            .where(EventCurated.status == EventStatus.approved)
+            .where(or_(EventCurated.event_time >= now, EventCurated.event_time_end >= now))
+            .where(func.cast(PostRaw.media_urls, String).ilike("%.jpg%"))
+            .where(EventCurated.is_primary.is_(True))
+            .order_by(starts, EventCurated.id)
+            .limit(limit)
+        )
+        if after is not None:
+            ev_q = ev_q.where(tuple_(starts, EventCurated.id) > tuple_(*after))
+        if user_id:
+            hidden = await UserFeedbackRepository(self.s).hidden_event_ids(user_id)
+            if hidden:
+                ev_q = ev_q.where(~EventCurated.id.in_(hidden))
+        rows = (await self.s.execute(ev_q)).all()
+        return await self.feed_items(rows)
 
+    async def feed_items(self, rows: Sequence) -> list[dict]:
+        """(EventCurated, PostRaw) rows → feed items, with tags and channel handles
+        fetched in one query each."""
         # Bulk-fetch tags for these events
         ev_ids = [ev.id for ev, _ in rows]
         tags_by_event: dict[int, list[str]] = {eid: [] for eid in ev_ids}
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -84,6 +84,34 @@ class EventsRepository:
         await self.s.flush()
         return ev
 
+    async def insert_many(
+        self,
+        items: Sequence[tuple[int, DetectionResult, EnrichmentResult, EventStatus]],
+    ) -> dict[int, int]:
+        """Bulk twin of insert(): one multi-row INSERT ... RETURNING for a whole
+        batch of (post_id, detection, enrichment, status). Returns {post_id: event_id} (post_id is unique per event, so
+        the mapping doesn't depend on RETURNING row order)."""
+        if not items:
+            return {}
+        rows = [
+            {
+                "post_id": post_id,
+                "event_time": enrichment.event_time,
+                "event_time_end": enrichment.event_time_end,
+                "location_text": enrichment.location_text,
+                "location_meta": enrichment.location_meta,
+                "price_text": enrichment.price_text,
+                "price_kopecks": enrichment.price_kopecks,
+                "filter_score": detection.score,
+                "filter_reasons": detection.reasons,
+                "status": status,
+            }
+            for post_id, detection, enrichment, status in items
+        ]
+        stmt = insert(EventCurated).values(rows).returning(EventCurated.post_id, EventCurated.id)
+        result = await self.s.execute(stmt)
+        return {post_id: event_id for post_id, event_id in result.all()}
+
     async def list_approved(
         self, *, limit: int = 50, offset: int = 0
     ) -> Sequence[EventCurated]:
@@ -111,6 +139,13 @@ class ModerationRepository:
         await self.s.flush()
         return mq
 
+    async def enqueue_many(self, event_ids: Sequence[int]) -> None:
+        if event_ids:
+            await self.s.execute(
+                insert(ModerationQueue),
+                [{"event_id": eid, "status": EventStatus.manual_review} for eid in event_ids],
+            )
+
     async def list_pending(self, limit: int = 50, offset: int = 0) -> Sequence[tuple]:
         from app.models import PostRaw, Channel
         stmt = (
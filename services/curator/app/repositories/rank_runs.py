@@ -0,0 +1,58 @@
+"""Repository for rank_runs — журнал прогонов пересчёта ленты (app.ranking)."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import RankRun
+
+RANK_RUNS_KEEP = 200  # ~2 суток при пересчёте раз в 15 минут
+
+
+class RankRunsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.s = session
+
+    async def log(
+        self,
+        *,
+        started_at: datetime,
+        mode: str,
+        params: str | None,
+        rows: int,
+        groups: int,
+        endorsed: int,
+        days: int,
+        changed: int,
+        seconds: dict[str, float],
+        merges: dict[str, int],
+        keep: int = RANK_RUNS_KEEP,
+    ) -> RankRun:
+        """Записать прогон и подрезать журнал до последних keep записей."""
+        run = RankRun(
+            started_at=started_at,
+            finished_at=datetime.utcnow(),
+            mode=mode,
+            params=params,
+            rows=rows,
+            groups=groups,
+            endorsed=endorsed,
+            days=days,
+            changed=changed,
+            total_s=round(sum(seconds.values()), 4),
+            seconds={k: round(v, 4) for k, v in seconds.items()},
+            merges=dict(merges),
+        )
+        self.s.add(run)
+        await self.s.flush()
+        keep_ids = select(RankRun.id).order_by(RankRun.id.desc()).limit(keep).scalar_subquery()
+        await self.s.execute(delete(RankRun).where(RankRun.id.notin_(keep_ids)))
+        return run
+
+    async def recent(self, limit: int = 20) -> Sequence[RankRun]:
+        stmt = select(RankRun).order_by(RankRun.id.desc()).limit(limit)
+        return (await self.s.execute(stmt)).scalars().all()
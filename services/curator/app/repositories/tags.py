@@ -4,13 +4,16 @@ from __future__ import annotations
 
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import ClassifierSource, EventTag, Tag
 
+# NOTIFY-канал смены таксономии (слушает app.services.taxonomy.TaxonomyCache)
+TAXONOMY_CHANNEL = "curator_taxonomy"
+
 
 class TagsRepository:
     def __init__(self, session: AsyncSession) -> None:
@@ -29,6 +32,7 @@ class TagsRepository:
     async def upsert(
         self, *, key: str, label: str, symbol: str | None = None,
         keywords: list[str] | None = None, sort_order: int = 0, parent_id: int | None = None,
+        notify: bool = True,
     ) -> Tag:
         stmt = pg_insert(Tag).values(
             key=key, label=label, symbol=symbol,
@@ -41,6 +45,8 @@ class TagsRepository:
             },
         ).returning(Tag)
         result = await self.s.execute(stmt)
+        if notify:
+            await self.notify_changed()
         return result.scalar_one()
 
     async def upsert_many(self, items: list[dict]) -> int:
@@ -51,10 +57,18 @@ class TagsRepository:
                 symbol=it.get("symbol"),
                 keywords=it.get("keywords") or [],
                 sort_order=it.get("sort_order", 0),
+                notify=False,
             )
             n += 1
+        await self.notify_changed()
         return n
 
+    async def notify_changed(self) -> None:
+        """NOTIFY curator_taxonomy — уходит подписчикам при COMMIT этой
+        транзакции (откат — не уходит); одинаковые NOTIFY в транзакции Postgres
+        схлопывает в один."""
+        await self.s.execute(select(func.pg_notify(TAXONOMY_CHANNEL, "")))
+
 
 class EventTagsRepository:
     def __init__(self, session: AsyncSession) -> None:
@@ -87,6 +101,21 @@ class EventTagsRepository:
         result = await self.s.execute(stmt)
         return result.rowcount or 0
 
+    async def attach_bulk(
+        self, rows: list[tuple[int, int, float]],
+        source: ClassifierSource = ClassifierSource.keyword,
+    ) -> int:
+        """attach_many across several events: (event_id, tag_id, confidence)
+        rows in one INSERT."""
+        if not rows:
+            return 0
+        stmt = pg_insert(EventTag).values([
+            {"event_id": eid, "tag_id": tid, "confidence": conf, "source": source}
+            for eid, tid, conf in rows
+        ]).on_conflict_do_nothing(index_elements=["event_id", "tag_id"])
+        result = await self.s.execute(stmt)
+        return result.rowcount or 0
+
     async def by_event(self, event_id: int) -> list[tuple[Tag, EventTag]]:
         stmt = (
             select(Tag, EventTag)
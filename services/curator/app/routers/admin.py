@@ -1,7 +1,8 @@
-"""Admin endpoints — moderation queue, taxonomy management, stats."""
+"""Admin endpoints — moderation queue, taxonomy management, gazetteer reload, feed snapshot, stats."""
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
@@ -12,6 +13,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from app.auth import require_admin
 from app.db import session_scope
 from app.models import Channel, EventCurated, EventStatus, FeedbackNote, PostRaw
+from app.pipeline import gazetteer
 from app.repositories.landing import LandingPickRepository
 from app.repositories.ui_variants import UiVariantRepository
 from app.repositories.posts import ModerationRepository
@@ -24,6 +26,14 @@ def get_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
     return request.app.state.session_factory
 
 
+def _feed_changed(request: Request) -> None:
+    """Статус или название события сменились — пересобрать снимок ленты (если
+    включён) на этой реплике; остальные догонят по FEED_SNAPSHOT_TTL_SECONDS."""
+    snap = getattr(request.app.state, "feed_snapshot", None)
+    if snap is not None:
+        snap.invalidate()
+
+
 # ── Moderation queue ───────────────────────────────────────────────
 @router.get("/moderation")
 async def list_pending(
@@ -111,6 +121,7 @@ class RejectBody(BaseModel):
 @router.post("/moderation/{event_id}/approve")
 async def approve_event(
     event_id: int,
+    request: Request,
     admin_id: int = Depends(require_admin),
     sf: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ) -> dict:
@@ -119,6 +130,7 @@ async def approve_event(
             await ModerationRepository(s).approve(event_id, reviewed_by=admin_id)
         except ValueError as e:
             raise HTTPException(404, str(e))
+    _feed_changed(request)
     # Trigger push fanout outside of the transaction
     from app.services.push import get_push_service
     import asyncio
@@ -131,6 +143,7 @@ async def approve_event(
 async def reject_event(
     event_id: int,
     body: RejectBody,
+    request: Request,
     admin_id: int = Depends(require_admin),
     sf: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ) -> dict:
@@ -139,6 +152,7 @@ async def reject_event(
             await ModerationRepository(s).reject(event_id, reviewed_by=admin_id, reason=body.reason)
         except ValueError as e:
             raise HTTPException(404, str(e))
+    _feed_changed(request)
     return {"status": "rejected", "event_id": event_id, "reason": body.reason}
 
 
@@ -377,6 +391,7 @@ class EventTitlesBody(BaseModel):
 @router.post("/event-titles")
 async def set_event_titles(
     body: EventTitlesBody,
+    request: Request,
     _admin: int = Depends(require_admin),
     sf: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ) -> dict:
@@ -396,4 +411,50 @@ async def set_event_titles(
                 updated += res.rowcount
             else:
                 missing.append(it.event_id)
+    if updated:
+        _feed_changed(request)
     return {"updated": updated, "missing": missing}
+
+
+# ── Gazetteer — перечитать app/data/venues.json без деплоя ─────────
+@router.post("/gazetteer/reload")
+async def reload_gazetteer(
+    request: Request,
+    _admin: int = Depends(require_admin),
+) -> dict:
+    """Перечитать площадки (GAZETTEER_VENUES_FILE или app/data/venues.json) и
+    атомарно подменить индекс геокодера. Невалидный файл → 422, в силе
+    остаётся прежний индекс. Воркеры пула догоняют версию со следующей пачкой;
+    другие реплики — своим вызовом. changed — площадки, чьи пины стоит
+    пересчитать (команда в regeocode)."""
+    settings = request.app.state.settings
+    path = Path(settings.gazetteer_venues_file) if settings.gazetteer_venues_file else None
+    try:
+        res = gazetteer.reload(path)
+    except (OSError, ValueError) as e:
+        raise HTTPException(422, f"gazetteer не перечитан, в силе прежний: {e}")
+    map_index = getattr(request.app.state, "map_index", None)
+    if map_index is not None:
+        map_index.invalidate()  # площадки на карте
+    return {
+        "venues": res.venues, "aliases": res.aliases, "digest": res.digest,
+        "changed": res.changed,
+        "regeocode": (
+            f"python -m app.backfill_geo_regeocode --venues {','.join(res.changed)}"
+            if res.changed else None
+        ),
+    }
+
+
+# ── Снимок ленты в памяти (/me/feed) ───────────────────────────────
+@router.get("/feed-snapshot")
+async def feed_snapshot_stats(
+    request: Request,
+    _admin: int = Depends(require_admin),
+) -> dict:
+    """Размер снимка ленты, время последней сборки и её возраст. Выключен
+    (FEED_SNAPSHOT_ENABLED=false) → {"enabled": false}, лента идёт из SQL."""
+    snap = getattr(request.app.state, "feed_snapshot", None)
+    if snap is None:
+        return {"enabled": False}
+    return {"enabled": True, **snap.stats()}
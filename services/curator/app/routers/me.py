@@ -1,7 +1,8 @@
-"""User-side API: /me/interests, /me/feed, /me/feedback. Auth via TG init_data."""
+"""User-side API: /me/interests, /me/feed, /me/map, /me/venues, /me/feedback. Auth via TG init_data."""
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
@@ -10,6 +11,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
 from app.auth import current_user_id, optional_current_user_id
 from app.db import session_scope
+from app.geoindex import BBox
 from app.models import FeedbackAction, FeedbackNote
 from app.repositories.me import (
     PersonalizedFeedRepository,
@@ -19,6 +21,8 @@ from app.repositories.me import (
 from app.repositories.landing import LandingPickRepository
 from app.repositories.ui_variants import UiVariantRepository
 from app.repositories.week import WeekPickRepository
+from app.services.feed_snapshot import FeedSnapshotCache
+from app.services.map_index import MapIndexCache
 
 router = APIRouter(prefix="/me", tags=["me"])
 
@@ -27,6 +31,14 @@ def get_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
     return request.app.state.session_factory
 
 
+def get_map_index(request: Request) -> MapIndexCache:
+    return request.app.state.map_index
+
+
+def get_feed_snapshot(request: Request) -> Optional[FeedSnapshotCache]:
+    return getattr(request.app.state, "feed_snapshot", None)
+
+
 # ── Interests ──────────────────────────────────────────────────────
 class InterestsBody(BaseModel):
     tag_keys: list[str]
@@ -123,14 +135,27 @@ async def get_feed(
     tags: Optional[str] = Query(None, description="Comma-separated tag keys to filter"),
     user_id: Optional[int] = Depends(optional_current_user_id),
     sf: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    feed_snapshot: Optional[FeedSnapshotCache] = Depends(get_feed_snapshot),
 ) -> list[dict]:
     """Personalized feed.
 
     - Without auth: anonymous, returns approved events possibly filtered by ?tags=
     - With auth: also excludes events user previously hid; if no ?tags but user has
       interests in DB, those are used as default filter.
+
+    Served from the in-memory feed snapshot (app.services.feed_snapshot) when it
+    is enabled — the only DB reads then are the user's interests and hidden ids.
     """
     explicit_tags = [t.strip() for t in (tags or "").split(",") if t.strip()] or None
+    if feed_snapshot is not None:
+        hidden: set[int] = set()
+        if user_id is not None:
+            async with session_scope(sf) as s:
+                if explicit_tags is None:
+                    explicit_tags = await UserInterestsRepository(s).list_keys(user_id) or None
+                hidden = await UserFeedbackRepository(s).hidden_event_ids(user_id)
+        snap = await feed_snapshot.get()
+        return snap.page(tag_keys=explicit_tags, hidden=hidden, limit=limit, offset=offset)
     async with session_scope(sf) as s:
         if explicit_tags is None and user_id is not None:
             # Auto-filter by user's saved interests
@@ -142,6 +167,74 @@ async def get_feed(
         )
 
 
+# ── Map — events inside the viewport ───────────────────────────────
+@router.get("/map")
+async def get_map(
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Cluster pins on this map zoom"),
+    limit: int = Query(2000, ge=1, le=10000),
+    user_id: Optional[int] = Depends(optional_current_user_id),
+    sf: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    map_index: MapIndexCache = Depends(get_map_index),
+) -> dict:
+    """Geocoded feed events and gazetteer venues inside the bbox.
+
+    Served from the in-process grid index (app.services.map_index), not a feed
+    scan. Without `zoom` every pin comes back (best-ranked first, up to
+    `limit`); with `zoom` pins sharing a grid cell of that zoom collapse into
+    `clusters` ({geo, count, top}). Events the user hid are left out.
+    """
+    if south > north or west > east:
+        raise HTTPException(400, "bbox: south ≤ north и west ≤ east")
+    hidden: set[int] = set()
+    if user_id is not None:
+        async with session_scope(sf) as s:
+            hidden = await UserFeedbackRepository(s).hidden_event_ids(user_id)
+    snap = await map_index.get()
+    return snap.query(BBox(south, west, north, east), zoom=zoom, limit=limit, hidden=hidden)
+
+
+# ── Venue page — upcoming events at one place ──────────────────────
+def _venue_cursor(item: dict) -> str:
+    """Opaque-ish keyset cursor: "<start iso>~<id>" of the page's last item."""
+    return f"{item['event_time'] or item['event_time_end']}~{item['id']}"
+
+
+def _parse_venue_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        start, ev_id = cursor.rsplit("~", 1)
+        return datetime.fromisoformat(start), int(ev_id)
+    except ValueError:
+        raise HTTPException(400, f"bad cursor: {cursor!r}")
+
+
+@router.get("/venues/{key}/events")
+async def get_venue_events(
+    key: str,
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = Query(None, description="`next` from the previous page"),
+    user_id: Optional[int] = Depends(optional_current_user_id),
+    sf: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> dict:
+    """Upcoming primary events at a venue (`geo.venue` key), soonest first.
+
+    Keyset pagination over the indexed venue_key column: pass `next` back as
+    `after`; `next` is null on the last page.
+    """
+    cursor = _parse_venue_cursor(after) if after else None
+    async with session_scope(sf) as s:
+        items = await PersonalizedFeedRepository(s).list_venue_events(
+            key, user_id=user_id, limit=limit, after=cursor,
+        )
+    return {
+        "venue": key, "events": items,
+        "next": _venue_cursor(items[-1]) if len(items) == limit else None,
+    }
+
+
 # ── Week digest hero — editorial «выбор недели» ────────────────────
 @router.get("/week")
 async def get_week_pick(
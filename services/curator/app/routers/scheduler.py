@@ -2,16 +2,52 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.db import session_scope
+from app.repositories.rank_runs import RANK_RUNS_KEEP, RankRunsRepository
 from app.services.scheduler import get_scheduler
 
 router = APIRouter(prefix="/scheduler", tags=["scheduler"])
 
 
+def get_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    return request.app.state.session_factory
+
+
 @router.get("/jobs")
 def list_jobs() -> list[dict]:
     sch = get_scheduler()
     if sch is None:
         raise HTTPException(503, "scheduler not initialized")
     return sch.list_jobs()
+
+
+@router.get("/rank-runs")
+async def list_rank_runs(
+    limit: int = Query(20, ge=1, le=RANK_RUNS_KEEP),
+    sf: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> list[dict]:
+    """Последние прогоны пересчёта ленты: время и склейки по стадиям
+    (load, exact, fuzzy, override, prep, pass_a, pass_b, pass_cd, score, write)."""
+    async with session_scope(sf) as s:
+        runs = await RankRunsRepository(s).recent(limit)
+        return [
+            {
+                "id": r.id,
+                "started_at": r.started_at.isoformat(),
+                "finished_at": r.finished_at.isoformat() if r.finished_at else None,
+                "mode": r.mode,
+                "params": r.params,
+                "rows": r.rows,
+                "groups": r.groups,
+                "endorsed": r.endorsed,
+                "days": r.days,
+                "changed": r.changed,
+                "total_s": r.total_s,
+                "seconds": r.seconds,
+                "merges": r.merges,
+            }
+            for r in runs
+        ]
@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
 from app.db import session_scope
 from app.repositories.tags import TagsRepository
+from app.services.taxonomy import TaxonomyCache
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
@@ -36,33 +37,50 @@ def get_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
     return request.app.state.session_factory
 
 
+def get_taxonomy(request: Request) -> TaxonomyCache:
+    return request.app.state.taxonomy
+
+
+def _feed_changed(request: Request) -> None:
+    """Теги событий или подписи тегов сменились — они в карточках снимка ленты
+    (app.services.feed_snapshot): пересобрать его на этой реплике."""
+    snap = getattr(request.app.state, "feed_snapshot", None)
+    if snap is not None:
+        snap.invalidate()
+
+
 @router.get("", response_model=list[TagOut])
-async def list_tags(sf: async_sessionmaker[AsyncSession] = Depends(get_session_factory)) -> list[TagOut]:
-    async with session_scope(sf) as s:
-        rows = await TagsRepository(s).list_all()
-        return [TagOut.model_validate(r) for r in rows]
+async def list_tags(taxonomy: TaxonomyCache = Depends(get_taxonomy)) -> list[TagOut]:
+    snap = await taxonomy.get()
+    return [TagOut.model_validate(t) for t in snap.tags]
 
 
 @router.post("", response_model=TagOut, status_code=201)
 async def upsert_tag(
     payload: TagUpsert,
+    request: Request,
     sf: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    taxonomy: TaxonomyCache = Depends(get_taxonomy),
 ) -> TagOut:
+    # upsert шлёт NOTIFY curator_taxonomy (остальным репликам — на commit);
+    # свой кэш сбрасываем сами, уже после commit'а
     async with session_scope(sf) as s:
         row = await TagsRepository(s).upsert(
             key=payload.key, label=payload.label, symbol=payload.symbol,
             keywords=payload.keywords, sort_order=payload.sort_order,
         )
-        return TagOut.model_validate(row)
+        out = TagOut.model_validate(row)
+    taxonomy.invalidate()
+    _feed_changed(request)  # tag_labels в карточках
+    return out
 
 
 @router.get("/{key}", response_model=TagOut)
-async def get_tag(key: str, sf: async_sessionmaker[AsyncSession] = Depends(get_session_factory)) -> TagOut:
-    async with session_scope(sf) as s:
-        row = await TagsRepository(s).get_by_key(key)
-        if not row:
-            raise HTTPException(404, f"tag {key} not found")
-        return TagOut.model_validate(row)
+async def get_tag(key: str, taxonomy: TaxonomyCache = Depends(get_taxonomy)) -> TagOut:
+    row = (await taxonomy.get()).by_key.get(key)
+    if not row:
+        raise HTTPException(404, f"tag {key} not found")
+    return TagOut.model_validate(row)
 
 
 @router.post("/reclassify")
@@ -76,14 +94,15 @@ async def reclassify_all(request: Request) -> dict:
     with an existing llm/manual row can never abort the batch."""
     from sqlalchemy import select, delete, distinct
     from sqlalchemy.dialects.postgresql import insert as pg_insert
-    from app.models import Channel, ClassifierSource, EventCurated, EventTag, PostRaw, Tag
-    from app.pipeline.classifier import KeywordClassifier, apply_cinema_venue_default
+    from app.models import Channel, ClassifierSource, EventCurated, EventTag, PostRaw
+    from app.pipeline.classifier import apply_cinema_venue_default
 
     sf: async_sessionmaker[AsyncSession] = request.app.state.session_factory
-    classifier = KeywordClassifier()
+    # Снимок таксономии: теги, by_key и классификатор с уже собранным автоматом
+    snap = await get_taxonomy(request).get()
+    tags, classifier = snap.tags, snap.classifier
 
     async with session_scope(sf) as s:
-        tags = list((await s.execute(select(Tag))).scalars().all())
         # Events owned by Claude (have ≥1 llm tag) — leave them alone.
         llm_events = {
             r[0] for r in (await s.execute(
@@ -106,7 +125,7 @@ async def reclassify_all(request: Request) -> dict:
                 n_skipped += 1
                 continue
             assignments = classifier.classify(text or "", tags)
-            assignments = apply_cinema_venue_default(handle, assignments, tags)
+            assignments = apply_cinema_venue_default(handle, assignments, tags, snap.by_key)
             n_events += 1
             for a in assignments:
                 stmt = pg_insert(EventTag).values(
@@ -116,6 +135,7 @@ async def reclassify_all(request: Request) -> dict:
                 await s.execute(stmt)
                 n_assignments += 1
 
+    _feed_changed(request)
     return {
         "events_processed": n_events, "assignments_created": n_assignments,
         "tags_used": len(tags), "events_skipped_llm_owned": n_skipped,
@@ -150,6 +170,7 @@ class ClassifyLlmBody(BaseModel):
 @router.post("/classify-llm")
 async def classify_llm(
     body: ClassifyLlmBody,
+    request: Request,
     sf: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ) -> dict:
     from sqlalchemy import select, delete
@@ -212,6 +233,7 @@ async def classify_llm(
             if wrote_any:
                 events_written += 1
 
+    _feed_changed(request)
     return {
         "events": events_written, "tags_written": tags_written,
         "unknown_keys": unknown_keys, "missing_events": missing_events,
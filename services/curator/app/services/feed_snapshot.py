@@ -0,0 +1,210 @@
+"""Снимок ленты в памяти для /me/feed: готовые карточки primary-фида (через
+build_feed_item — теги, хэндлы каналов), множества тегов и ключи ранга.
+
+Раньше каждый /me/feed гонял многотабличный запрос (JSON-касты, ilike по
+media_urls, подзапрос по тегам, NOT IN скрытых) плюс ещё два — за тегами и
+хэндлами каналов. Предстоящий московский фид — несколько тысяч строк, поэтому
+FeedSnapshotCache держит его целиком: фильтр по тегам, скрытые и пагинация —
+в памяти, из БД на запрос читаются только интересы и скрытые пользователя.
+
+Снимок неизменяем и подменяется целиком (ссылкой) после пересчёта рангов,
+пачки ингеста с новыми approved, модерации, правки названий и тегов — см.
+invalidate(); TTL (FEED_SNAPSHOT_TTL_SECONDS) — страховка от пропущенного
+сигнала. Сигналы — внутрипроцессные: в отличие от TaxonomyCache, NOTIFY тут
+нет, и правка через одну реплику доходит до остальных только по TTL.
+
+Отбор строк — тот же feed_query, что у list_feed; порядок — тот же ключ, что
+rank_order_expr (time-часть пересчитывается при смене даты).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db import session_scope
+from app.models import EventCurated
+from app.ranking import _time_score
+from app.repositories.me import PersonalizedFeedRepository, feed_query
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FeedEntry:
+    item: dict  # готовая карточка build_feed_item (не мутировать — отдаём копии)
+    tags: frozenset[str]
+    id: int
+    event_time: Optional[datetime]
+    event_time_end: Optional[datetime]
+    rank_score: Optional[float]
+    rank_start_day: Optional[date]
+    rank_close_day: Optional[date]
+    has_meta: bool  # location_meta IS NOT NULL — второй ключ сортировки ленты
+
+    def live(self, now: datetime) -> bool:
+        """Ещё в ленте: не началось или ещё идёт (как фильтр feed_query)."""
+        return (self.event_time is not None and self.event_time >= now) or (
+            self.event_time_end is not None and self.event_time_end >= now
+        )
+
+    def order_key(self, today: date) -> tuple:
+        """Питоновский близнец ORDER BY list_feed: ранг ↓ (rank_score + time-часть,
+        неотранжированные → 0.5), с координатами первыми, старт ↑ (NULL в конце);
+        id — для детерминизма при полном тае."""
+        rank = 0.5 if self.rank_score is None else (
+            self.rank_score + _time_score(self.rank_start_day, self.rank_close_day, today)
+        )
+        return (-rank, not self.has_meta, self.event_time is None, self.event_time or datetime.max, self.id)
+
+
+def _deep_size(obj, seen: set[int] | None = None) -> int:
+    """Приблизительный объём в байтах (sys.getsizeof по контейнерам рекурсивно,
+    общие объекты — один раз)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(x, seen) for x in obj)
+    elif hasattr(obj, "__dataclass_fields__"):
+        size += sum(_deep_size(getattr(obj, f), seen) for f in obj.__dataclass_fields__)
+    return size
+
+
+class FeedSnapshot:
+    def __init__(self, entries: Iterable[FeedEntry], *, build_seconds: float = 0.0) -> None:
+        self.entries: tuple[FeedEntry, ...] = tuple(entries)
+        self.build_seconds = build_seconds
+        self.built_at = time.monotonic()
+        self.bytes = _deep_size(self.entries)
+        self._order_day: date | None = None
+        self._order: tuple[FeedEntry, ...] = ()
+
+    def ordered(self, today: date) -> tuple[FeedEntry, ...]:
+        """Записи в порядке ленты на дату today (пересортировка — раз в сутки)."""
+        if self._order_day != today:
+            self._order = tuple(sorted(self.entries, key=lambda e: e.order_key(today)))
+            self._order_day = today
+        return self._order
+
+    def page(
+        self, *, tag_keys: Iterable[str] | None = None,
+        hidden: set[int] | frozenset[int] = frozenset(),
+        limit: int = 50, offset: int = 0, now: datetime | None = None,
+    ) -> list[dict]:
+        """Страница ленты — как list_feed: прошедшие с момента сборки отсеяны,
+        с tag_keys — события с ЛЮБЫМ из тегов, скрытые пользователем — нет."""
+        now = now or datetime.utcnow()
+        wanted = frozenset(tag_keys or ())
+        out: list[dict] = []
+        skip = offset
+        for e in self.ordered(now.date()):
+            if not e.live(now) or e.id in hidden or (wanted and wanted.isdisjoint(e.tags)):
+                continue
+            if skip:
+                skip -= 1
+                continue
+            out.append(dict(e.item))
+            if len(out) >= limit:
+                break
+        return out
+
+
+async def load_feed_snapshot(session: AsyncSession) -> FeedSnapshot:
+    t0 = time.monotonic()
+    rows = (await session.execute(
+        feed_query(datetime.utcnow()).add_columns(EventCurated.location_meta.isnot(None))
+    )).all()
+    items = await PersonalizedFeedRepository(session).feed_items([(ev, post) for ev, post, _ in rows])
+    entries = [
+        FeedEntry(
+            item=item, tags=frozenset(item["tags"]), id=ev.id,
+            event_time=ev.event_time, event_time_end=ev.event_time_end,
+            rank_score=ev.rank_score, rank_start_day=ev.rank_start_day,
+            rank_close_day=ev.rank_close_day, has_meta=bool(has_meta),
+        )
+        for (ev, _, has_meta), item in zip(rows, items)
+    ]
+    return FeedSnapshot(entries, build_seconds=time.monotonic() - t0)
+
+
+class FeedSnapshotCache:
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession], *, ttl_seconds: float = 300.0,
+    ) -> None:
+        self.sf = session_factory
+        self.ttl = ttl_seconds
+        self._snap: FeedSnapshot | None = None
+        self._lock = asyncio.Lock()
+        self._dirty = False
+        self._task: asyncio.Task | None = None
+        self.rebuilds = 0
+
+    def invalidate(self) -> None:
+        """Лента поменялась (пересчёт рангов, ингест, модерация, названия/теги):
+        пересобрать в фоне — только на этой реплике, другие ждут TTL. Сигналы
+        во время сборки схлопываются в одну следующую сборку; до её конца
+        запросы обслуживает прежний снимок."""
+        self._dirty = True
+        if self._snap is not None and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._rebuild_loop())
+
+    async def _rebuild_loop(self) -> None:
+        while self._dirty:
+            self._dirty = False
+            try:
+                async with self._lock:
+                    await self._rebuild()
+            except Exception:  # noqa: BLE001 — остаётся прежний снимок, повторит TTL
+                logger.exception("feed snapshot: rebuild failed")
+                return
+
+    async def _rebuild(self) -> None:
+        async with session_scope(self.sf) as s:
+            snap = await load_feed_snapshot(s)
+        self._snap = snap
+        self.rebuilds += 1
+        logger.info(
+            "feed snapshot: %d events in %.3fs, ~%.1f MiB",
+            len(snap.entries), snap.build_seconds, snap.bytes / 2**20,
+        )
+
+    async def get(self) -> FeedSnapshot:
+        if self._snap is None:
+            async with self._lock:
+                if self._snap is None:
+                    await self._rebuild()
+        elif time.monotonic() - self._snap.built_at >= self.ttl:
+            self.invalidate()  # отдаём текущий, свежий подменит его в фоне
+        return self._snap  # type: ignore[return-value]
+
+    def stats(self) -> dict:
+        snap = self._snap
+        if snap is None:
+            return {"loaded": False, "rebuilds": self.rebuilds}
+        return {
+            "loaded": True, "events": len(snap.entries),
+            "build_seconds": round(snap.build_seconds, 4), "bytes": snap.bytes,
+            "age_seconds": round(time.monotonic() - snap.built_at, 1),
+            "rebuilds": self.rebuilds,
+            "rebuilding": self._task is not None and not self._task.done(),
+        }
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
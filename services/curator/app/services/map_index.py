@@ -0,0 +1,157 @@
+"""Пространственный индекс карты для /me/map: фид-события с координатами +
+площадки газеттира в равномерной сетке (app.geoindex), в памяти процесса.
+
+Раньше карта тянула всю ленту и фильтровала по координатам на клиенте. Теперь
+MapIndexCache держит MapSnapshot — geocoded фид-события (тот же feed_query,
+что у ленты, в порядке ранга) и VENUES — и отдаёт пины в bbox,
+а с zoom — сводит плотные места в кластеры. Снимок перечитывается по TTL
+(MAP_INDEX_TTL_SECONDS): новые события появляются на карте с этой задержкой.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db import session_scope
+from app.geoindex import BBox, GridIndex, grid_cluster
+from app.models import EventCurated, PostRaw
+from app.pipeline import gazetteer
+from app.ranking import rank_order_expr
+from app.repositories.me import derive_title, feed_query
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_TOP = 3  # id лучших по рангу событий в кластере — для превью
+
+
+@dataclass(frozen=True)
+class MapPin:
+    id: int
+    title: str
+    event_time: Optional[datetime]
+    venue: Optional[str]
+
+    def as_dict(self, lat: float, lng: float) -> dict:
+        # Те же ключи, что у build_feed_item — фронт матчит пин с карточкой
+        return {
+            "id": str(self.id), "title": self.title,
+            "event_time": self.event_time.isoformat() if self.event_time else None,
+            "geo": [lat, lng], "venue": self.venue,
+        }
+
+
+def _coords(meta) -> tuple[float, float] | None:
+    if not isinstance(meta, dict):
+        return None
+    try:
+        return float(meta["lat"]), float(meta["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+async def load_map_pins(session: AsyncSession) -> list[tuple[float, float, MapPin]]:
+    """Geocoded фид-события (тот же отбор, что у ленты — feed_query) в порядке
+    ранга ленты."""
+    now = datetime.utcnow()
+    rows = (await session.execute(
+        feed_query(now)
+        .with_only_columns(
+            EventCurated.id, EventCurated.title, PostRaw.text,
+            EventCurated.event_time, EventCurated.location_meta,
+        )
+        .where(EventCurated.location_meta.op("->>")("lat").isnot(None))
+        .order_by(rank_order_expr(now.date()).desc(), EventCurated.id)
+    )).all()
+    out: list[tuple[float, float, MapPin]] = []
+    for ev_id, title, text, event_time, meta in rows:
+        ll = _coords(meta)
+        if ll is None:
+            continue
+        title = title.strip() if title and title.strip() else derive_title(text)
+        out.append((ll[0], ll[1], MapPin(ev_id, title, event_time, meta.get("venue"))))
+    return out
+
+
+class MapSnapshot:
+    def __init__(self, pins: list[tuple[float, float, MapPin]], venues=None) -> None:
+        self.events: GridIndex[MapPin] = GridIndex()
+        self.rank: dict[int, int] = {}  # id → позиция в ранге (кластеры/лимит)
+        for i, (lat, lng, pin) in enumerate(pins):
+            self.events.insert(lat, lng, pin)
+            self.rank[pin.id] = i
+        self.venues: GridIndex[gazetteer.Venue] = GridIndex()
+        for v in (gazetteer.VENUES if venues is None else venues):
+            self.venues.insert(v.lat, v.lng, v)
+
+    def query(
+        self, bbox: BBox, *, zoom: int | None = None, limit: int = 2000,
+        hidden: set[int] | frozenset[int] = frozenset(),
+    ) -> dict:
+        """Пины в bbox (лучшие по рангу первыми, не больше limit); с zoom —
+        одиночки пинами, плотные ячейки — clusters[{geo, count, top}]."""
+        pts = [p for p in self.events.query(bbox) if p[2].id not in hidden]
+        pts.sort(key=lambda p: self.rank[p[2].id])
+        per_venue: dict[str, int] = {}
+        for _, _, pin in pts:
+            if pin.venue:
+                per_venue[pin.venue] = per_venue.get(pin.venue, 0) + 1
+        venues = [
+            {"key": v.key, "geo": [lat, lng], "events": per_venue.get(v.key, 0)}
+            for lat, lng, v in self.venues.query(bbox)
+        ]
+        events: list[dict] = []
+        clusters: list[dict] = []
+        if zoom is None:
+            events = [pin.as_dict(lat, lng) for lat, lng, pin in pts[:limit]]
+        else:
+            for c in grid_cluster(pts, zoom):
+                if c.count == 1:
+                    events.append(c.items[0].as_dict(c.lat, c.lng))
+                else:
+                    clusters.append({
+                        "geo": [round(c.lat, 6), round(c.lng, 6)], "count": c.count,
+                        "top": [str(pin.id) for pin in c.items[:CLUSTER_TOP]],
+                    })
+            events = events[:limit]
+        shown = len(events) + sum(c["count"] for c in clusters)
+        return {
+            "total": len(pts), "truncated": shown < len(pts),
+            "events": events, "clusters": clusters, "venues": venues,
+        }
+
+
+class MapIndexCache:
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession], *, ttl_seconds: float = 60.0,
+    ) -> None:
+        self.sf = session_factory
+        self.ttl = ttl_seconds
+        self._snap: MapSnapshot | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._snap = None
+
+    def _fresh(self) -> bool:
+        return self._snap is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    async def get(self) -> MapSnapshot:
+        if self._fresh():
+            return self._snap  # type: ignore[return-value]
+        async with self._lock:
+            if not self._fresh():
+                t0 = time.monotonic()
+                async with session_scope(self.sf) as s:
+                    pins = await load_map_pins(s)
+                self._snap = MapSnapshot(pins)
+                self._loaded_at = time.monotonic()
+                logger.info("map index: %d events in %.3fs", len(pins), self._loaded_at - t0)
+        return self._snap  # type: ignore[return-value]
@@ -1,6 +1,8 @@
 """APScheduler wrapper.
 
 - Один job на канал, fires every `channel.poll_interval_minutes`.
+- Либо (POLL_BATCH_SIZE > 0) один job `poll:batch` раз в минуту: подошедшие
+  каналы уходят пачками в один /ingest (PipelineProcessor.process_batch).
 - Stagger при старте (раскладываем next_run_time с шагом, чтобы не было пика).
 - Глобальный Semaphore ограничивает параллелизм исходящих fetch'ей.
 - Hooks для channel CRUD (add_or_update / remove).
@@ -68,6 +70,10 @@ class CuratorScheduler:
         self._scheduler = AsyncIOScheduler(timezone="UTC")
         self._sem = asyncio.Semaphore(settings.poll_concurrency)
         self._started = False
+        self._rank_executor = None  # ProcessPoolExecutor для cluster(), лениво (RANK_EXECUTOR)
+        # Батч-режим: channel_id → (handle, interval_min, next_due); вместо job'ов на канал.
+        self._batch_size = max(0, settings.poll_batch_size)
+        self._due: dict[int, tuple[str, int, datetime]] = {}
 
     async def _run_channel(self, channel_id: int, handle: str) -> None:
         async with self._sem:
@@ -78,13 +84,43 @@ class CuratorScheduler:
             except Exception:  # noqa: BLE001
                 logger.exception("scheduler: unhandled error for %s", handle)
 
+    async def _run_poll_batch(self) -> None:
+        """Батч-режим: каналы с наступившим next_due → пачки по poll_batch_size,
+        по одному /ingest на пачку. next_due сдвигаем ДО запроса, чтобы долгий
+        батч не подхватил те же каналы повторно."""
+        now = datetime.utcnow()
+        due = sorted((nd, cid) for cid, (_h, _i, nd) in self._due.items() if nd <= now)
+        if not due:
+            return
+        ids = [cid for _nd, cid in due]
+        for cid in ids:
+            handle, interval, _nd = self._due[cid]
+            self._due[cid] = (handle, interval, now + timedelta(minutes=interval))
+        batches = [ids[i:i + self._batch_size] for i in range(0, len(ids), self._batch_size)]
+        await asyncio.gather(*(self._run_batch(b) for b in batches))
+
+    async def _run_batch(self, channel_ids: list[int]) -> None:
+        async with self._sem:
+            try:
+                if self.settings.poll_stream:
+                    results = await self.processor.process_stream(channel_ids, limit=25)
+                else:
+                    results = await self.processor.process_batch(channel_ids, limit=25)
+                for r in results:
+                    if r.error:
+                        logger.warning("scheduler: %s failed: %s", r.channel_handle, r.error)
+            except Exception:  # noqa: BLE001
+                logger.exception("scheduler: unhandled error for batch of %d channels", len(channel_ids))
+
     async def _run_recompute(self) -> None:
         """Периодический пересчёт дедуп-групп + rank_score ленты. Изолирован:
         любая ошибка логируется, но не трогает поллинг каналов."""
         try:
             from app.db import create_engine, create_session_maker, session_scope
-            from app.ranking import recompute_feed_ranks
+            from app.ranking import make_rank_executor, recompute_feed_ranks
 
+            if self._rank_executor is None:
+                self._rank_executor = make_rank_executor(self.settings.rank_executor)
             on = self.settings.phash_dedup_enabled
             ham = self.settings.phash_max_hamming if on else None
             corrob = self.settings.phash_corrob_hamming if on else None
@@ -92,8 +128,18 @@ class CuratorScheduler:
             try:
                 sf = create_session_maker(engine)
                 async with session_scope(sf) as s:
-                    res = await recompute_feed_ranks(s, apply=True, phash_hamming=ham, phash_corrob=corrob)
-                logger.info("scheduler: rank recompute %d rows → %d events (dedup −%d)", res.rows, res.groups, res.collapsed)
+                    res = await recompute_feed_ranks(
+                        s, apply=True, phash_hamming=ham, phash_corrob=corrob,
+                        incremental=self.settings.rank_incremental, executor=self._rank_executor,
+                    )
+                logger.info(
+                    "scheduler: rank recompute (%s, days=%d) %d rows → %d events (dedup −%d), changed %d",
+                    res.mode, res.days, res.rows, res.groups, res.collapsed, res.changed,
+                )
+                logger.debug("scheduler: rank recompute profile\n%s", res.explain())
+                # Новые ранги / is_primary → пересобрать снимок ленты
+                if (snap := getattr(self.processor, "feed_snapshot", None)) is not None:
+                    snap.invalidate()
             finally:
                 await engine.dispose()
         except Exception:  # noqa: BLE001
@@ -227,6 +273,13 @@ class CuratorScheduler:
         max_offset = max(30, channel.poll_interval_minutes * 60 // 2)
         offset = random.randint(10, max_offset)
         next_run = datetime.utcnow() + timedelta(seconds=offset)
+        if self._batch_size:
+            self._due[channel.id] = (channel.handle, channel.poll_interval_minutes, next_run)
+            logger.info(
+                "scheduler: batched %s every %d min, first due at %s",
+                channel.handle, channel.poll_interval_minutes, next_run.isoformat(timespec="seconds"),
+            )
+            return
         self._scheduler.add_job(
             self._run_channel,
             trigger=IntervalTrigger(minutes=channel.poll_interval_minutes),
@@ -244,6 +297,10 @@ class CuratorScheduler:
         )
 
     def remove_channel(self, handle: str) -> None:
+        for cid, (h, _i, _nd) in list(self._due.items()):
+            if h == handle:
+                del self._due[cid]
+                logger.info("scheduler: removed %s", handle)
         try:
             self._scheduler.remove_job(_job_id(handle))
             logger.info("scheduler: removed %s", handle)
@@ -255,6 +312,16 @@ class CuratorScheduler:
             return
         for ch in channels:
             self.add_or_update_channel(ch)
+        if self._batch_size:
+            self._scheduler.add_job(
+                self._run_poll_batch,
+                trigger=IntervalTrigger(minutes=1),
+                id="poll:batch",
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+                misfire_grace_time=60,
+            )
         # Периодический пересчёт ранга ленты (дедуп + rank_score). Первый прогон —
         # через 90с после старта, дальше каждые rank_recompute_minutes.
         self._scheduler.add_job(
@@ -320,6 +387,9 @@ class CuratorScheduler:
         if self._started:
             self._scheduler.shutdown(wait=False)
             self._started = False
+        if self._rank_executor is not None:
+            self._rank_executor.shutdown(wait=False, cancel_futures=True)
+            self._rank_executor = None
 
     def list_jobs(self) -> list[dict]:
         return [
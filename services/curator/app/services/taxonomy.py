@@ -0,0 +1,144 @@
+"""Кэш таксономии в процессе — общий для пайплайна и /tags.
+
+Теги меняются редко (seed на старте, изредка POST /tags), а читались на каждый
+прогон канала и каждый запрос /tags, и by_key / автомат классификатора
+собирались заново. TaxonomyCache держит один неизменяемый TaxonomySnapshot
+(теги, иерархия parent_id, by_key, прогретый KeywordClassifier) с номером
+версии.
+
+Сброс:
+  - upsert тега поднимает версию локально (TaxonomyCache.invalidate) и в той же
+    транзакции шлёт NOTIFY curator_taxonomy (TagsRepository.notify_changed —
+    доставляется на commit);
+  - каждая реплика слушает канал (TaxonomyCache.listen) и поднимает свою
+    версию; после (пере)подключения — тоже, на случай пропущенного NOTIFY;
+  - TTL (TAXONOMY_TTL_SECONDS) — страховка: перечитываем в любом случае.
+Следующий get() после смены версии перечитывает снимок из БД.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.db import session_scope
+from app.pipeline.classifier import KeywordClassifier
+from app.pipeline.executor import TagSpec
+from app.repositories.tags import TAXONOMY_CHANNEL, TagsRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TagInfo:
+    """Отвязанная от сессии копия Tag (duck-typed для классификатора и TagOut)."""
+    id: int
+    key: str
+    label: str
+    symbol: Optional[str]
+    parent_id: Optional[int]
+    keywords: tuple[str, ...]
+    sort_order: int
+
+
+@dataclass
+class TaxonomySnapshot:
+    version: int
+    tags: list[TagInfo]                      # в порядке TagsRepository.list_all
+    by_key: dict[str, TagInfo]
+    children: dict[Optional[int], list[int]]  # parent_id → id детей (None — корни)
+    specs: list[TagSpec]                     # что PipelineExecutor отдаёт в пул
+    classifier: KeywordClassifier = field(default_factory=KeywordClassifier)
+
+    @classmethod
+    def build(cls, version: int, rows) -> "TaxonomySnapshot":
+        tags = [
+            TagInfo(r.id, r.key, r.label, r.symbol, r.parent_id, tuple(r.keywords or ()), r.sort_order)
+            for r in rows
+        ]
+        children: dict[Optional[int], list[int]] = {}
+        for t in tags:
+            children.setdefault(t.parent_id, []).append(t.id)
+        snap = cls(
+            version=version, tags=tags, by_key={t.key: t for t in tags}, children=children,
+            specs=[TagSpec(t.id, t.key, list(t.keywords)) for t in tags],
+        )
+        snap.classifier._automaton_for(snap.tags)  # прогреть автомат заранее
+        return snap
+
+
+class TaxonomyCache:
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession], *, ttl_seconds: float = 600.0,
+    ) -> None:
+        self.sf = session_factory
+        self.ttl = ttl_seconds
+        self.version = 1
+        self._snap: TaxonomySnapshot | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._listener: asyncio.Task | None = None
+
+    def invalidate(self) -> None:
+        self.version += 1
+
+    def _fresh(self) -> bool:
+        snap = self._snap
+        return (
+            snap is not None and snap.version == self.version
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    async def get(self) -> TaxonomySnapshot:
+        if self._fresh():
+            return self._snap  # type: ignore[return-value]
+        async with self._lock:
+            if not self._fresh():
+                # Версию берём ДО чтения: bump во время загрузки оставит снимок
+                # устаревшим, и следующий get() перечитает.
+                version = self.version
+                async with session_scope(self.sf) as s:
+                    rows = list(await TagsRepository(s).list_all())
+                self._snap = TaxonomySnapshot.build(version, rows)
+                self._loaded_at = time.monotonic()
+                logger.info("taxonomy v%d loaded: %d tags", version, len(rows))
+        return self._snap  # type: ignore[return-value]
+
+    # ── LISTEN curator_taxonomy ──
+    def listen(self, engine: AsyncEngine, *, retry_seconds: float = 5.0) -> None:
+        """Фоновый LISTEN на отдельном соединении из пула (переподключается сам)."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen_loop(engine, retry_seconds))
+
+    async def _listen_loop(self, engine: AsyncEngine, retry_seconds: float) -> None:
+        def on_notify(_conn, _pid, _channel, _payload) -> None:
+            self.invalidate()
+
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = (await conn.get_raw_connection()).driver_connection
+                    await raw.add_listener(TAXONOMY_CHANNEL, on_notify)
+                    self.invalidate()  # что пропустили, пока не слушали
+                    logger.info("listening on %s", TAXONOMY_CHANNEL)
+                    while not raw.is_closed():
+                        await asyncio.sleep(retry_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # noqa: BLE001 — переподключаемся
+                logger.warning("taxonomy listener failed: %s", e)
+            await asyncio.sleep(retry_seconds)
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
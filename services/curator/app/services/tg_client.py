@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import os
 from datetime import datetime
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
 
@@ -29,6 +30,14 @@ class RawMessage:
     published_at: datetime | None
 
 
+@dataclass
+class ChannelDone:
+    """End-of-channel marker in the /ingest/stream NDJSON stream. error is the
+    poller's `channels_failed` reason, or None when the channel was read fully."""
+    channel: str
+    error: str | None = None
+
+
 class TelegramServiceClient:
     def __init__(
         self,
@@ -121,25 +130,92 @@ class TelegramServiceClient:
                 all_media = [u for ev in (data.get("events") or []) for u in (ev.get("media_urls") or [])]
                 await self._pull_media(client, all_media)
 
-        events: list[dict[str, Any]] = data.get("events", []) or []
-        out: list[RawMessage] = []
-        for ev in events:
-            published_at = ev.get("published_at")
-            dt: datetime | None = None
-            if published_at:
-                try:
-                    dt = datetime.fromisoformat(published_at)
-                    if dt.tzinfo is not None:
-                        dt = dt.replace(tzinfo=None)
-                except Exception:
-                    dt = None
-            out.append(
-                RawMessage(
-                    channel=ev.get("channel", handle),
-                    message_id=int(ev.get("message_id") or 0),
-                    text=ev.get("text", "") or "",
-                    media_urls=list(ev.get("media_urls") or []),
-                    published_at=dt,
-                )
-            )
+        return [_to_raw(ev, handle) for ev in (data.get("events", []) or [])]
+
+    async def fetch_many(
+        self, min_ids: dict[str, int | None], limit: int = 20, collect_media: bool = True
+    ) -> dict[str, list[RawMessage] | TelegramFetchError]:
+        """Batched /ingest: many channels in one request, each with its own
+        `min_id` («догон», see fetch). The poller walks them in its own order
+        with its own pacing; we pay one HTTP round-trip (and one connection for
+        the media mirror) per batch instead of per channel.
+
+        Returns handle → messages, or TelegramFetchError for channels the poller
+        put in `channels_failed`. Transport/HTTP errors raise for the whole batch."""
+        handles = list(min_ids)
+        body: dict[str, Any] = {
+            "channel_ids": handles,
+            "per_channel_limit": limit,
+            "pause_between_channels": 0.5,
+            "pause_between_messages": 0.05,
+            "collect_media": collect_media,
+            "min_ids": {h: int(m) for h, m in min_ids.items() if m},
+        }
+        async with httpx.AsyncClient(timeout=self._timeout) as client:
+            resp = await client.post(f"{self._base}/ingest", headers=self._headers, json=body)
+            resp.raise_for_status()
+            data = resp.json()
+            if self._media_dir and collect_media:
+                all_media = [u for ev in (data.get("events") or []) for u in (ev.get("media_urls") or [])]
+                await self._pull_media(client, all_media)
+
+        out: dict[str, list[RawMessage] | TelegramFetchError] = {h: [] for h in handles}
+        for h, reason in (data.get("channels_failed") or {}).items():
+            out[h] = TelegramFetchError(f"{h}: {reason}")
+        for ev in data.get("events", []) or []:
+            h = ev.get("channel")
+            bucket = out.get(h)
+            if isinstance(bucket, list):
+                bucket.append(_to_raw(ev, h))
         return out
+
+    async def stream(
+        self, min_ids: dict[str, int | None], limit: int = 20, collect_media: bool = True
+    ) -> AsyncIterator[RawMessage | ChannelDone]:
+        """Streaming /ingest/stream (NDJSON): yields each RawMessage as soon as the
+        poller has fetched it — media already mirrored — and a ChannelDone after
+        each channel. Nothing is buffered beyond one line, so a long catch-up uses
+        constant memory and processing can start with the first message."""
+        body: dict[str, Any] = {
+            "channel_ids": list(min_ids),
+            "per_channel_limit": limit,
+            "pause_between_channels": 0.5,
+            "pause_between_messages": 0.05,
+            "collect_media": collect_media,
+            "min_ids": {h: int(m) for h, m in min_ids.items() if m},
+        }
+        async with httpx.AsyncClient(timeout=self._timeout) as client:
+            async with client.stream(
+                "POST", f"{self._base}/ingest/stream", headers=self._headers, json=body
+            ) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    if item.get("type") == "channel_done":
+                        yield ChannelDone(item["channel"], None if item.get("ok") else (item.get("reason") or "unknown"))
+                        continue
+                    if self._media_dir and collect_media:
+                        await self._pull_media(client, list(item.get("media_urls") or []))
+                    yield _to_raw(item, item.get("channel", ""))
+
+
+def _to_raw(ev: dict[str, Any], handle: str) -> RawMessage:
+    """One /ingest event payload → RawMessage (published_at → naive UTC)."""
+    published_at = ev.get("published_at")
+    dt: datetime | None = None
+    if published_at:
+        try:
+            dt = datetime.fromisoformat(published_at)
+            if dt.tzinfo is not None:
+                dt = dt.replace(tzinfo=None)
+        except Exception:
+            dt = None
+    return RawMessage(
+        channel=ev.get("channel", handle),
+        message_id=int(ev.get("message_id") or 0),
+        text=ev.get("text", "") or "",
+        media_urls=list(ev.get("media_urls") or []),
+        published_at=dt,
+    )
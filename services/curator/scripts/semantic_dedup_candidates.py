@@ -6,6 +6,9 @@
 т.е. могут быть одним и тем же событием, обёрнутым по-разному (разные заголовки,
 постеры, без общего URL: фильм-концерт Дзиги из 5 постов и т.п.).
 
+Пары ищутся через MinHash-LSH (app.minhash) по редким токенам, а не перебором
+всех пар дня; точный порог проверяется только на коллизиях.
+
 Скрипт НИЧЕГО не пишет в БД — только предлагает кластеры для РУЧНОГО суждения.
 Решение (какие id = одно событие) человек принимает сам и применяет UPDATE-ом
 (см. services/curator/SEMANTIC_DEDUP.md).
@@ -24,6 +27,13 @@ from __future__ import annotations
 
 import json
 import sys
+from pathlib import Path
+
+# Скрипт гоняют как файл (без установленного пакета) — добавляем корень curator,
+# чтобы взять общий MinHash-LSH из app.minhash (тот же, что в ranking.cluster).
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.minhash import MinHashLSH  # noqa: E402
 
 # Общие/служебные слова — НЕ считаются значимыми токенами (иначе «концерт»,
 # «выставка», месяцы связали бы все несвязанные события одного дня).
@@ -92,15 +102,19 @@ def main() -> None:
             x = parent[x]
         return x
 
+    # Пары-кандидаты — коллизии MinHash-LSH по набору РЕДКИХ токенов внутри дня
+    # (ns = день), точное «≥2 общих редких» проверяем только на них.
+    rare = {eid: {t for t in s if df[t] <= RARE_DF} for eid, s in tk.items()}
+    lsh = MinHashLSH(num_perm=64, bands=64)
     edges = 0
-    for ids in by_day.values():
-        for i in range(len(ids)):
-            for j in range(i + 1, len(ids)):
-                a, b = ids[i], ids[j]
-                rare = sum(1 for t in tk[a] if t in tk[b] and df[t] <= RARE_DF)
-                if rare >= MIN_SHARED_RARE:
+    for d, ids in by_day.items():
+        for a in ids:
+            sig = lsh.signature(rare[a])
+            for b in lsh.query(sig, d):
+                if len(rare[a] & rare[b]) >= MIN_SHARED_RARE:
                     parent[find(a)] = find(b)
                     edges += 1
+            lsh.insert(a, sig, d)
 
     comp: dict[int, list[int]] = {}
     for e in events:
@@ -0,0 +1,31 @@
+"""Синтетический корпус бенчмарка (app.bench_ranking): детерминирован и реально
+нагружает все проходы cluster() — иначе сверка с базой ничего не ловит."""
+
+from app.bench_ranking import bench, check, synth_rows
+
+
+def test_synth_rows_deterministic():
+    a, b = synth_rows(300, seed=3), synth_rows(300, seed=3)
+    assert len(a) == 300
+    assert [(r.id, r.title, r.phash) for r in a] == [(r.id, r.title, r.phash) for r in b]
+
+
+def test_bench_exercises_every_pass():
+    r = bench(1000)
+    assert r["groups"] < r["rows"]
+    for name in ("exact", "fuzzy", "pass_a", "pass_b", "pass_c", "pass_d"):
+        assert r["merges"].get(name, 0) > 0, name
+    assert set(r["seconds"]) >= {"exact", "fuzzy", "pass_cd", "score"}
+    # Запись: updates всех строк уходят одним UPDATE-чанком (_WRITE_CHUNK=2000)
+    assert r["write_chunks"] == 1 and r["write_s"] > 0
+
+
+def test_check_flags_changed_merges_and_slowdown():
+    base = {"1000": {"groups": 10, "merges": {"exact": 1}, "total_s": 1.0, "peak_mb": 5.0}}
+    same = {"1000": {"groups": 10, "merges": {"exact": 1}, "total_s": 1.2, "peak_mb": 5.0}}
+    assert check(same, base, 1.5) == []
+    worse = {"1000": {"groups": 9, "merges": {"exact": 2}, "total_s": 2.0, "peak_mb": 5.0}}
+    assert len(check(worse, base, 1.5)) == 2
+    base["1000"]["write_s"] = 0.1
+    slow_write = {"1000": {**same["1000"], "write_s": 0.5}}
+    assert len(check(slow_write, base, 1.5)) == 1
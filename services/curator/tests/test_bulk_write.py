@@ -0,0 +1,107 @@
+"""Пачечная запись разобранных постов (PipelineProcessor._write_events): число
+запросов не зависит от размера пачки, статусы/теги/счётчики — как у поштучной.
+Запись ранга (app.ranking._write_back) — один UPDATE … FROM (VALUES …) на чанк
+с типизированными столбцами и пропуском неизменившихся строк."""
+
+import asyncio
+from types import SimpleNamespace
+
+from app.models import EventStatus
+from app.pipeline.executor import PostAnalysis
+from app.pipeline.processor import ChannelRunResult, PipelineProcessor
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows, self.rowcount = rows, len(rows)
+
+    def all(self):
+        return self.rows
+
+
+class _Session:
+    def __init__(self):
+        self.statements: list[tuple[str, object]] = []
+
+    async def execute(self, stmt, params=None):
+        table = stmt.table.name
+        self.statements.append((table, params if params is not None else stmt))
+        if table == "events_curated":
+            rows = stmt.compile().params  # post_id_m0, post_id_m1, ...
+            post_ids = [v for k, v in rows.items() if k.startswith("post_id")]
+            return _Result([(pid, 1000 + pid) for pid in post_ids])
+        return _Result([])
+
+
+class _Push:
+    def __init__(self):
+        self.sent: list[int] = []
+
+    async def fanout_for_event(self, ev_id):
+        self.sent.append(ev_id)
+
+
+def _analysis(pid, status, tags=()):
+    det = SimpleNamespace(score=7, reasons=[])
+    enr = SimpleNamespace(event_time=None, event_time_end=None, location_text=None,
+                          location_meta=None, price_text=None, price_kopecks=None)
+    return PostAnalysis(pid, det, enr if status else None, status, list(tags))
+
+
+def test_batch_of_25_is_a_handful_of_statements():
+    proc = PipelineProcessor.__new__(PipelineProcessor)
+    proc.use_queue, proc.push_service = False, _Push()
+    statuses = [EventStatus.approved, EventStatus.manual_review, EventStatus.rejected, None]
+    analyses = [_analysis(i, statuses[i % 4], [(1, 0.9), (2, 0.5)] if i % 4 < 2 else []) for i in range(25)]
+    s, res = _Session(), ChannelRunResult("@a", 0, 0, 0, 0, 0)
+
+    async def run():
+        await proc._write_events(s, analyses, res)
+        await asyncio.sleep(0)  # дать фоновым fanout-задачам отработать
+
+    asyncio.run(run())
+    assert [t for t, _ in s.statements] == ["events_curated", "moderation_queue", "event_tags"]
+    assert (res.events_approved, res.events_review, res.events_rejected) == (7, 6, 12)
+    assert s.statements[1][1] == [{"event_id": 1000 + i, "status": EventStatus.manual_review}
+                                  for i in range(25) if i % 4 == 1]
+    assert sorted(proc.push_service.sent) == [1000 + i for i in range(25) if i % 4 == 0]
+
+
+class _RankSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(rowcount=1)
+
+
+def test_rank_write_back_types_and_distinct_guard():
+    from datetime import date
+
+    from sqlalchemy.dialects.postgresql import asyncpg
+
+    from app.ranking import _WRITE_CHUNK, _write_back
+
+    # Весь чанк без дат: NULL-столбец VALUES Postgres сочтёт text — нужен CAST
+    updates = [(1, 1, True, 2, 0.75, None, None), (2, 1, False, 2, 1, None, None)]
+    s = _RankSession()
+    assert asyncio.run(_write_back(s, updates, {1: "sig1"})) == 1
+    c = s.statements[0].compile(dialect=asyncpg.dialect())
+    sql = str(c)
+    assert "FROM (VALUES ($1::BIGINT, $2::BIGINT, $3::BOOLEAN, $4::INTEGER, $5::FLOAT, NULL, NULL, $6::VARCHAR)" in sql
+    assert "rank_start_day=CAST(v.start AS DATE), rank_close_day=CAST(v.close AS DATE)" in sql
+    # неизменившиеся строки не трогаем: условие по каждому записываемому полю
+    for col, src in (("dup_group_id", "v.gid"), ("is_primary", "v.prim"), ("crosspost_count", "v.xc"),
+                     ("rank_score", "v.score"), ("rank_start_day", "CAST(v.start AS DATE)"),
+                     ("rank_close_day", "CAST(v.close AS DATE)"), ("rank_sig", "v.sig")):
+        assert f"curator.events_curated.{col} IS DISTINCT FROM {src}" in sql
+    params = list(c.params.values())
+    assert params[4] == 0.75 and isinstance(params[4], float)
+
+    # Даты биндятся как DATE; больше _WRITE_CHUNK строк → несколько UPDATE
+    d = date(2026, 11, 2)
+    s = _RankSession()
+    many = [(i, i, True, 1, 0.5, d, None) for i in range(_WRITE_CHUNK + 1)]
+    assert asyncio.run(_write_back(s, many, {})) == 2
+    assert "$6::DATE" in str(s.statements[0].compile(dialect=asyncpg.dialect()))
@@ -0,0 +1,51 @@
+"""KeywordClassifier на Aho-Corasick: те же теги и confidence, что наивный
+`kw in text` по каждому слову; перекрытия и дубли слов считаются как раньше;
+автомат пересобирается, когда у тега меняются keywords."""
+
+from app.models import Tag
+from app.pipeline.classifier import KeywordAutomaton, KeywordClassifier
+
+
+def _naive(text, tags):
+    tl = text.lower()
+    out = []
+    for tag in tags:
+        kws = [kw.lower() for kw in (tag.keywords or [])]
+        hits = sum(1 for kw in kws if kw in tl)
+        if kws and hits:
+            out.append((tag.id, round(min(1.0, 0.4 + hits / len(kws) * 0.6), 3)))
+    return out
+
+
+TAGS = [
+    Tag(id=1, key="cinema", label="Кино", keywords=["кино", "фильм", "показ"]),
+    Tag(id=2, key="kinoteatr", label="Кинотеатр", keywords=["кинотеатр", "инотеатр", "Театр"]),
+    Tag(id=3, key="music", label="Музыка", keywords=["концерт", "dj", "концерт"]),
+    Tag(id=4, key="empty", label="Пусто", keywords=[]),
+]
+TEXTS = [
+    "Показ фильма в кинотеатре «Ноябрь»",
+    "КОНЦЕРТ: DJ-сет до утра",
+    "Театр на Таганке",
+    "ничего подходящего",
+]
+
+
+def test_matches_naive_substring_classifier():
+    c = KeywordClassifier()
+    for text in TEXTS:
+        assert [(a.tag_id, a.confidence) for a in c.classify(text, TAGS)] == _naive(text, TAGS), text
+
+
+def test_automaton_finds_overlapping_words():
+    ac = KeywordAutomaton(["кино", "кинотеатр", "инотеатр", "театр", "атр"])
+    assert {ac.words[i] for i in ac.find("в кинотеатре")} == {"кино", "кинотеатр", "инотеатр", "театр", "атр"}
+    assert ac.find("") == set()
+
+
+def test_rebuilds_when_keywords_change():
+    c = KeywordClassifier()
+    tags = [Tag(id=1, key="lecture", label="Лекция", keywords=["лекция"])]
+    assert c.classify("Открытая лекция и дискуссия", tags)[0].confidence == 1.0
+    edited = [Tag(id=1, key="lecture", label="Лекция", keywords=["лекция", "семинар"])]
+    assert c.classify("Открытая лекция и дискуссия", edited)[0].confidence == 0.7
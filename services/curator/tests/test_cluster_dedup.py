@@ -138,3 +138,70 @@ def test_pass_d_off_when_only_strict():
         _mk(2, "Нюанс x L'atelier de Musique", "chanB", D_2000, title="Нюанс x L'atelier de Musique", phash=_PH_B),
     ]
     assert len(cluster(rows, phash_max_hamming=8)) == 2
+
+
+# ── CPU-стадия в пуле процессов: упаковка _Row в кортежи без потерь ──
+def test_packed_rank_matches_inline():
+    from app.ranking import _pack_rows, _rank, _rank_packed
+
+    rows = [
+        _mk(5780, "«Театр Вкуса» ассоциируется с чем-то тёплым, как лето у бабушки", "damuseum_garden", D_1830),
+        _mk(6007, "Театр «Вкуса» выступит бесплатно на фестивале «Русский КоТ» в саду", "freeartnewsletter", D_1830),
+        _mk(1, "Концерт «Джаз Вечер» большой", "chanA", D_2000, phash=_PH_A),
+    ]
+    links = {("chana", 1)}
+    packed, inline = _rank_packed(_pack_rows(rows), links, 8, 14), _rank(rows, links, 8, 14)
+    assert packed[:3] == inline[:3]
+    assert packed[3].merges == inline[3].merges
+
+
+def test_rank_stats_cover_all_stages():
+    from app.ranking import RankResult, _rank
+
+    rows = [
+        _mk(1, "Концерт «Джаз Вечер» большой", "chanA", D_2000, phash=_PH_A),
+        _mk(2, "Концерт «Джаз Вечер» большой", "chanB", D_2000, phash=_PH_B),
+    ]
+    n_groups, _endorsed, _updates, stats = _rank(rows, set(), 8, 14)
+    assert n_groups == 1
+    assert {"exact", "fuzzy", "override", "pass_a", "pass_b", "pass_cd", "score"} <= set(stats.seconds)
+    assert sum(stats.merges.values()) == 1
+    res = RankResult(rows=2, groups=1, collapsed=1, stats=stats)
+    assert "score=" in res.explain()
+
+
+def test_hamming_accepts_int_and_hex():
+    from app.imagehash import hamming, to_int
+
+    assert hamming(_PH_A, _PH_B) == hamming(to_int(_PH_A), to_int(_PH_B)) == 10
+
+
+def test_minhash_lsh_candidates():
+    # Короткое имя внутри длинного (overlap 1.0, Jaccard 0.2) — кандидат;
+    # непересекающиеся наборы и чужой день (ns) — нет.
+    from app.minhash import MinHashLSH
+
+    lsh = MinHashLSH()
+    long = {"atelier", "musique", "нюанс", "французский", "дворик", "микс", "идеальный",
+            "самый", "вечер", "пятница", "музыку", "подбирают", "ждет", "эту", "вас"}
+    lsh.insert("long", lsh.signature(long), "07.08")
+    assert "long" in lsh.query(lsh.signature({"atelier", "musique", "нюанс"}), "07.08")
+    assert not lsh.query(lsh.signature({"джаз", "квартет", "вечером"}), "07.08")
+    assert not lsh.query(lsh.signature(long), "08.08")
+
+
+def test_static_score_plus_time_part_equals_full_score():
+    # Выставка до 05.08: static пишется в rank_score, а близость и «последний
+    # шанс» досчитываются на дату запроса — сумма обязана совпасть с _score.
+    from datetime import date
+    from dataclasses import replace
+    from app.ranking import _score, _static_score, _time_score
+
+    g = [replace(_mk(1, "Выставка «Мозаика»", "chanA", D_NOON), event_time_end=datetime(2026, 8, 5, 20, 0))]
+    static, start, close = _static_score(g)
+    assert (start, close) == (date(2026, 7, 31), date(2026, 8, 5))
+    for today in (date(2026, 7, 1), date(2026, 7, 25), date(2026, 8, 3), date(2026, 8, 6)):
+        assert round(static + _time_score(start, close, today), 4) == _score(g, today)
+    # ближе к закрытию — выше; после закрытия буст пропадает
+    assert _time_score(start, close, date(2026, 8, 4)) > _time_score(start, close, date(2026, 8, 1))
+    assert _time_score(start, close, date(2026, 8, 6)) == 0.25
@@ -0,0 +1,37 @@
+"""Golden-тест детектора: однопроходный сканер (detector._Scan) обязан давать
+ровно тот же DetectionResult — score, reasons, hits, political, — что и
+исходный детектор «по регэкспу на признак» на фиксированном корпусе.
+
+Корпус — tests/fixtures/detector_golden.json: синтетика app.bench_detector
+(seed=7) + тексты из test_political_filter + краевые случаи (капс, ё, «Подмосковье»,
+«İ», у которого lower() меняет длину строки).
+Ожидания сняты со старой реализации; менять фикстуру — только осознанно,
+вместе с правилами детектора."""
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+from app.pipeline.detector import detect_event, looks_like_digest, looks_out_of_moscow
+
+GOLDEN = json.loads((Path(__file__).parent / "fixtures" / "detector_golden.json").read_text(encoding="utf-8"))
+
+
+def test_detector_matches_golden_corpus():
+    mismatches = []
+    for case in GOLDEN:
+        r = detect_event(case["text"])
+        got = {"score": r.score, "reasons": r.reasons, "hits": asdict(r.hits), "political": r.political}
+        want = {k: case[k] for k in got}
+        if got != want:
+            mismatches.append((case["text"][:80], want, got))
+    assert not mismatches, mismatches[:3]
+
+
+def test_public_helpers_agree_with_detector():
+    for case in GOLDEN:
+        reasons = case["reasons"]
+        if reasons[:1] == ["digest"]:
+            assert looks_like_digest(case["text"])
+        if reasons[:1] == ["out_of_moscow"]:
+            assert looks_out_of_moscow(case["text"])
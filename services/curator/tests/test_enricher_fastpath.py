@@ -0,0 +1,71 @@
+"""Быстрый путь разбора дат (enricher._fast_parse_dt) обязан давать ровно то же,
+что dateparser с нашими настройками, на всех формах, которые он берёт на себя;
+незнакомые формы — None (уходят в dateparser)."""
+
+from datetime import datetime
+
+import dateparser
+import pytest
+
+from app.pipeline import enricher
+from app.pipeline.enricher import DATE_PARSE_STATS, _fast_parse_dt, _parse_dt
+
+BASES = [
+    datetime(2026, 7, 22, 12, 0),              # среда, полдень
+    datetime(2026, 7, 25, 0, 0),               # суббота, ровно полночь
+    datetime(2026, 12, 31, 23, 59, 59, 5),     # перелом года
+    datetime(2028, 2, 29, 9, 30),              # високосный день
+]
+SNIPPETS = [
+    "4 июля", "22 июля", "22 июля 12:00", "23 июля 7:05", "1 января", "3 сент", "5 мая 2027 19:00",
+    "29 февраля", "31 декабря 23:59", "15.05.2026", "07.07.2026 9:00", "1/2/2027",
+    "сегодня", "завтра 09:30", "послезавтра", "Сегодня 19:00",
+    "субботу", "среду 10:00", "воскресенье 0:00", "понедельник",
+    "19:00", "00:00", "12:00",
+]
+
+
+def _reference(snippet, base):
+    settings = {"PREFER_DATES_FROM": "future", "DATE_ORDER": "DMY", "RELATIVE_BASE": base}
+    return dateparser.parse(snippet, languages=["ru"], settings=settings)
+
+
+@pytest.mark.parametrize("base", BASES)
+def test_fast_path_matches_dateparser(base):
+    covered = 0
+    for snippet in SNIPPETS:
+        fast = _fast_parse_dt(snippet, base)
+        if fast is not None:  # «29 февраля» в невисокосный год — в dateparser
+            covered += 1
+            assert fast == _reference(snippet, base), (snippet, base)
+    assert covered >= len(SNIPPETS) - 1
+
+
+@pytest.mark.parametrize("snippet", ["на выходных", "на этой неделе", "3 ноябр", "среды", "31 февраля", "завтра 25:00", ""])
+def test_unknown_shapes_fall_back(snippet):
+    assert _fast_parse_dt(snippet, BASES[0]) is None
+
+
+def test_stats_count_fast_hits_and_fallbacks(monkeypatch):
+    monkeypatch.setattr(enricher, "DATE_PARSE_STATS", type(DATE_PARSE_STATS)())
+    monkeypatch.setattr(enricher, "_DATE_CACHE", type(enricher._DATE_CACHE)())
+    _parse_dt("5 мая 19:00", BASES[0])
+    _parse_dt("на этой неделе", BASES[0])
+    assert (enricher.DATE_PARSE_STATS.fast, enricher.DATE_PARSE_STATS.fallback) == (1, 1)
+
+
+def test_cache_is_keyed_by_day_only_when_time_of_day_does_not_matter(monkeypatch):
+    monkeypatch.setattr(enricher, "DATE_PARSE_STATS", type(DATE_PARSE_STATS)())
+    monkeypatch.setattr(enricher, "_DATE_CACHE", type(enricher._DATE_CACHE)())
+    morning, evening = datetime(2026, 7, 22, 9, 0), datetime(2026, 7, 22, 21, 0)
+    # Другое число + другое время того же дня → попадание (кросс-пост)
+    assert _parse_dt("5 Августа  19:00", morning) == _parse_dt("5 августа 19:00", evening)
+    assert enricher.DATE_PARSE_STATS.cache_hits == 1
+    # Сегодняшнее число / голое время / «сегодня» зависят от времени суток —
+    # утром и вечером ответы разные, кэш их не склеивает.
+    assert _parse_dt("22 июля 13:00", morning).year == 2026
+    assert _parse_dt("22 июля 13:00", evening).year == 2027
+    assert _parse_dt("12:00", morning).day == 22 and _parse_dt("12:00", evening).day == 23
+    assert _parse_dt("сегодня", morning) == morning and _parse_dt("сегодня", evening) == evening
+    assert enricher.DATE_PARSE_STATS.cache_hits == 1
+    assert 0 < enricher.DATE_PARSE_STATS.hit_rate < 1
@@ -0,0 +1,74 @@
+"""Снимок ленты в памяти (app.services.feed_snapshot): порядок — тот же ключ,
+что ORDER BY list_feed (ранг с time-частью, гео, старт), фильтры по тегам /
+скрытым / прошедшим и пагинация — как у SQL-ленты."""
+
+from datetime import date, datetime, timedelta
+
+from app.ranking import _time_score
+from app.services.feed_snapshot import FeedEntry, FeedSnapshot
+
+NOW = datetime(2026, 11, 2, 12, 0)
+TODAY = NOW.date()
+
+
+def _entry(ev_id, *, rank=None, start_day=None, close_day=None, geo=False,
+           start=NOW + timedelta(days=1), end=None, tags=()):
+    return FeedEntry(
+        item={"id": str(ev_id), "tags": list(tags)}, tags=frozenset(tags), id=ev_id,
+        event_time=start, event_time_end=end, rank_score=rank,
+        rank_start_day=start_day, rank_close_day=close_day, has_meta=geo,
+    )
+
+
+def _ids(items):
+    return [int(i["id"]) for i in items]
+
+
+def test_order_matches_rank_formula():
+    soon, later = TODAY + timedelta(days=1), TODAY + timedelta(days=40)
+    entries = [
+        _entry(1, rank=0.30, start_day=later),
+        _entry(2, rank=0.30, start_day=soon),          # ближе → выше при том же статике
+        _entry(3),                                     # без ранга → нейтральный 0.5
+        _entry(4, geo=True),                           # тай по 0.5 → гео первым
+        _entry(5, start=None, end=NOW + timedelta(days=3)),  # тай, без старта → в конце
+        _entry(6, rank=0.10, start_day=later, close_day=TODAY + timedelta(days=2)),
+    ]
+    snap = FeedSnapshot(entries)
+
+    def rank(e):
+        if e.rank_score is None:
+            return 0.5
+        return e.rank_score + _time_score(e.rank_start_day, e.rank_close_day, TODAY)
+
+    # ORDER BY list_feed: ранг ↓, с координатами первыми, старт ↑ (NULL в конце), id
+    expected = sorted(
+        entries,
+        key=lambda e: (-rank(e), not e.has_meta, e.event_time is None, e.event_time or datetime.max, e.id),
+    )
+    got = _ids(snap.page(limit=10, now=NOW))
+    assert got == [e.id for e in expected]
+    # тай-брейки на тае 0.5: гео → с датой старта → без неё
+    assert got.index(4) < got.index(3) < got.index(5)
+    assert got.index(2) < got.index(1)
+    # Смена даты пересортировывает: «последний шанс» у 6 прошёл
+    later_day = snap.ordered(date(2026, 12, 1))
+    assert [e.id for e in later_day] != [e.id for e in snap.ordered(TODAY)]
+
+
+def test_tags_hidden_expired_and_paging():
+    entries = [
+        _entry(i, rank=1.0 - i / 100, tags=("music",) if i % 2 else ("art",)) for i in range(1, 11)
+    ] + [
+        _entry(20, rank=2.0, start=NOW - timedelta(hours=1)),  # началось, не идёт — прошло
+        _entry(21, rank=2.0, start=NOW - timedelta(days=5), end=NOW + timedelta(days=5)),  # идёт
+    ]
+    snap = FeedSnapshot(entries)
+    assert _ids(snap.page(limit=3, now=NOW)) == [21, 1, 2]
+    assert _ids(snap.page(limit=3, offset=3, now=NOW)) == [3, 4, 5]
+    assert _ids(snap.page(tag_keys=["music"], hidden={3}, limit=10, now=NOW)) == [1, 5, 7, 9]
+    assert _ids(snap.page(tag_keys=["music", "art"], limit=20, now=NOW)) == list(range(1, 11))
+    # Карточки — копии: правка ответа не портит снимок
+    snap.page(limit=1, now=NOW)[0]["id"] = "x"
+    assert _ids(snap.page(limit=1, now=NOW)) == [21]
+    assert snap.bytes > 0
@@ -0,0 +1,86 @@
+"""Пословный trie алиасов (gazetteer.AliasIndex) отвечает ровно как прежний
+перебор: тот же приоритет площадок, тот же отсев по ATTRIBUTION_CUES.
+reload() подменяет справочник целиком, а битый файл оставляет прежний;
+regeocode берёт площадки из того же файла, что и API."""
+
+import json
+
+import pytest
+
+from app.bench_gazetteer import match_linear, synth_hays, synth_venues
+from app.pipeline import gazetteer
+from app.pipeline.gazetteer import AliasIndex, Venue, _norm
+
+
+def test_index_matches_linear_scan():
+    venues = synth_venues(300, seed=3)
+    index = AliasIndex(venues)
+    for hay in synth_hays(venues, 600, seed=3):
+        assert index.match(hay) is match_linear(venues, hay)
+
+
+def test_priority_cues_and_word_boundaries():
+    a = Venue("a", 1, 1, ("@a",), ("центр зотов",))
+    b = Venue("b", 2, 2, ("@a", "@b"), ("зотов", "галерея"))
+    index = AliasIndex((a, b))
+    # Первая по VENUES площадка побеждает, даже если её алиас дальше в тексте
+    assert index.match(_norm("Зотов. Лекция в Центр Зотов")) is a
+    # Только целые слова
+    assert index.match(_norm("зотовка и галереями")) is None
+    # Первое вхождение алиаса — в регалиях лектора → алиас пропущен целиком
+    text = "выпускник центр зотов. Встреча пройдёт в субботу вечером, после неё — фуршет, галерея"
+    assert index.match(_norm(text)) is b
+    assert index.by_handle == {"@a": a, "@b": b}
+
+
+def test_geocode_channel_default():
+    geo = gazetteer.geocode(text="Лекция без площадки", channel_handle="vacges2")
+    assert geo == {"lat": 55.7407, "lng": 37.6107, "source": "gazetteer-channel", "venue": "ges2"}
+    assert gazetteer.geocode(text="Выставка в ГЭС-2")["source"] == "gazetteer"
+
+
+def test_reload_swaps_index_and_rejects_bad_file(tmp_path):
+    base = json.loads(gazetteer.VENUES_FILE.read_text(encoding="utf-8"))
+    good = tmp_path / "venues.json"
+    good.write_text(json.dumps(base + [
+        {"key": "test_hall", "lat": 55.7, "lng": 37.6, "aliases": ["зал тестовый"]},
+    ], ensure_ascii=False), encoding="utf-8")
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps(base + [
+        {"key": "moskva", "lat": 55.7, "lng": 37.6, "aliases": ["Москва"]},
+    ], ensure_ascii=False), encoding="utf-8")
+    try:
+        res = gazetteer.reload(good)
+        assert res.changed == ["test_hall"]
+        assert gazetteer.geocode(text="Концерт в Зал тестовый")["venue"] == "test_hall"
+        before = gazetteer.current()
+        with pytest.raises(ValueError, match="москва"):
+            gazetteer.reload(bad)
+        assert gazetteer.current() is before  # прежний индекс в силе
+        gazetteer.sync(before.digest, bad)  # та же версия — ничего не читаем
+        assert gazetteer.current() is before
+    finally:
+        gazetteer.reload(gazetteer.VENUES_FILE)
+    assert gazetteer.geocode(text="Концерт в Зал тестовый") is None
+
+
+def test_regeocode_uses_venues_file(tmp_path):
+    from types import SimpleNamespace
+
+    from app.backfill_geo_regeocode import load_gazetteer, venue_probe
+
+    base = json.loads(gazetteer.VENUES_FILE.read_text(encoding="utf-8"))
+    override = tmp_path / "venues.json"
+    override.write_text(json.dumps(base + [
+        {"key": "test_hall", "lat": 55.7, "lng": 37.6, "aliases": ["зал тестовый"]},
+    ], ensure_ascii=False), encoding="utf-8")
+    try:
+        gz = load_gazetteer(SimpleNamespace(gazetteer_venues_file=str(override)))
+        assert gz.path == override and gz is gazetteer.current()
+        probe = venue_probe({"test_hall"})
+        assert probe is not None and probe.find(_norm("Концерт в Зал тестовый"))
+        assert gazetteer.geocode(text="Концерт в Зал тестовый")["venue"] == "test_hall"
+    finally:
+        gazetteer.reload(gazetteer.VENUES_FILE)
+    assert load_gazetteer(SimpleNamespace(gazetteer_venues_file="")).path == gazetteer.VENUES_FILE
+    assert venue_probe(None) is None
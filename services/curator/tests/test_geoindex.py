@@ -0,0 +1,56 @@
+"""Сетка карты (app.geoindex) и снимок /me/map (app.services.map_index):
+выборка по bbox совпадает с полным перебором, zoom сводит плотные места в
+кластеры, скрытые пользователем события не попадают на карту."""
+
+import random
+
+from app.geoindex import BBox, GridIndex, grid_cluster
+from app.pipeline.gazetteer import Venue
+from app.services.map_index import MapPin, MapSnapshot
+
+
+def test_bbox_query_matches_brute_force():
+    rnd = random.Random(7)
+    pts = [(55.5 + rnd.random() * 0.5, 37.3 + rnd.random() * 0.6, i) for i in range(2000)]
+    index = GridIndex(cell_deg=0.02)
+    for lat, lng, i in pts:
+        index.insert(lat, lng, i)
+    for _ in range(50):
+        s, w = 55.4 + rnd.random() * 0.6, 37.2 + rnd.random() * 0.7
+        box = BBox(s, w, s + rnd.random() * 0.3, w + rnd.random() * 0.3)
+        got = sorted(i for _, _, i in index.query(box))
+        assert got == sorted(i for lat, lng, i in pts if box.contains(lat, lng))
+    # bbox на весь мир идёт по непустым ячейкам
+    assert len(index.query(BBox(-90, -180, 90, 180))) == 2000
+    assert index.query(BBox(56, 37, 55, 38)) == []
+
+
+def test_grid_cluster_by_zoom():
+    pts = [(55.7500, 37.6200, "a"), (55.7504, 37.6204, "b"), (55.9000, 37.3000, "c")]
+    far = grid_cluster(pts, zoom=8)
+    near = grid_cluster(pts, zoom=18)
+    assert sorted(c.count for c in far) == [1, 2]
+    assert sorted(c.count for c in near) == [1, 1, 1]
+
+
+def test_snapshot_query_clusters_hidden_and_venues():
+    pins = [
+        (55.7500, 37.6200, MapPin(1, "first", None, "ges2")),
+        (55.7501, 37.6201, MapPin(2, "second", None, None)),
+        (55.7502, 37.6202, MapPin(3, "third", None, "ges2")),
+        (55.9000, 37.3000, MapPin(4, "far", None, None)),
+    ]
+    snap = MapSnapshot(pins, venues=(Venue("ges2", 55.7407, 37.6107),))
+    box = BBox(55.7, 37.2, 56.0, 37.7)
+
+    flat = snap.query(box)
+    assert [e["id"] for e in flat["events"]] == ["1", "2", "3", "4"]
+    assert flat["venues"] == [{"key": "ges2", "geo": [55.7407, 37.6107], "events": 2}]
+
+    clustered = snap.query(box, zoom=10, hidden={2})
+    assert clustered["total"] == 3 and not clustered["truncated"]
+    assert [c["count"] for c in clustered["clusters"]] == [2]
+    assert clustered["clusters"][0]["top"] == ["1", "3"]
+    assert [e["id"] for e in clustered["events"]] == ["4"]
+
+    assert snap.query(box, limit=2)["truncated"]
@@ -0,0 +1,49 @@
+"""PipelineExecutor: пул процессов даёт те же разборы, что inline; упавший пост
+не роняет пачку; время стадий копится."""
+
+import asyncio
+from datetime import datetime
+
+from app.models import EventStatus
+from app.pipeline import executor as ex
+from app.pipeline.executor import PipelineExecutor, PostInput, TagSpec, make_pipeline_executor
+
+POSTS = [
+    PostInput(1, "Концерт 25 октября в 19:00, клуб «Мутабор». Вход 1500 ₽, регистрация по ссылке.",
+              "somechan", datetime(2026, 10, 1)),
+    PostInput(2, "Лекция об истории кино. 3 ноября 18:30, библиотека. Вход свободный.",
+              "somechan", datetime(2026, 10, 1)),
+    PostInput(3, "Просто красивый закат сегодня", "somechan", datetime(2026, 10, 1)),
+]
+TAGS = [TagSpec(1, "music", ["концерт"]), TagSpec(2, "lecture", ["лекция"])]
+
+
+def test_process_pool_matches_inline():
+    async def run(executor):
+        try:
+            return (await executor.analyze(POSTS, TAGS))[0]
+        finally:
+            executor.shutdown()
+
+    inline = asyncio.run(run(make_pipeline_executor("inline")))
+    pooled = asyncio.run(run(make_pipeline_executor("process", workers=1)))
+    assert [(a.post_id, a.status, a.tags, a.detection.score) for a in pooled] == \
+        [(a.post_id, a.status, a.tags, a.detection.score) for a in inline]
+    assert inline[0].status in (EventStatus.approved, EventStatus.manual_review)
+    assert inline[2].status is None
+
+
+def test_failed_post_is_isolated_and_stages_timed(monkeypatch):
+    real = ex.detect_event
+
+    def flaky(text):
+        if "сломай" in text:
+            raise ValueError("boom")
+        return real(text)
+
+    monkeypatch.setattr(ex, "detect_event", flaky)
+    executor = PipelineExecutor()
+    out, seconds = asyncio.run(executor.analyze(POSTS[:1] + [PostInput(9, "сломай", "x")], TAGS))
+    assert out[0].error is None and out[1].error == "ValueError: boom"
+    assert set(seconds) == {"detect", "enrich", "classify"} and seconds["detect"] > 0
+    assert executor.posts == 2 and executor.seconds == seconds
@@ -0,0 +1,166 @@
+"""Воркеры очереди пост-обработки (app.pipeline.workers): крутят батчи, пока
+есть работа, переживают упавший батч и останавливаются, дождавшись текущего.
+PipelineProcessor.process_jobs: упавший пост не валит пачку — соседи
+завершаются, он уходит на retry с backoff, а исчерпав попытки — в failed."""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.models import JobStatus
+from app.pipeline.processor import PipelineProcessor
+from app.pipeline.workers import PipelineWorkers
+from app.repositories.jobs import RETRY_BASE
+
+
+class _Processor:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.calls = 0
+
+    async def process_jobs(self, limit):
+        self.calls += 1
+        if not self.batches:
+            return 0
+        b = self.batches.pop(0)
+        if isinstance(b, Exception):
+            raise b
+        return b
+
+    async def run_fanouts(self, limit):
+        return 0
+
+
+def test_workers_drain_queue_survive_errors_and_stop():
+    async def scenario():
+        proc = _Processor([3, RuntimeError("db blip"), 2, 1])
+        w = PipelineWorkers(proc, workers=1, batch=10, idle_seconds=0.01)
+        w.start()
+        for _ in range(100):
+            if not proc.batches:
+                break
+            await asyncio.sleep(0.01)
+        await w.stop()
+        return proc
+
+    proc = asyncio.run(scenario())
+    assert proc.batches == []
+    assert proc.calls >= 4
+
+
+# ── process_jobs: пачка в SAVEPOINT, при сбое — поштучно, виновник на retry ──
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class _Savepoint:
+    """Ошибка БД всплывает на RELEASE (flush/отложенный constraint) — уже после
+    того, как _write_events досчитал счётчики."""
+
+    def __init__(self, session):
+        self.s = session
+
+    async def __aenter__(self):
+        self.s.pending = []
+        return self
+
+    async def __aexit__(self, exc_type, *_):
+        failed = exc_type is not None or self.s.bad_post in self.s.pending
+        self.s.savepoints.append("rollback" if failed else "release")
+        if exc_type is None and failed:
+            raise RuntimeError(f"post {self.s.bad_post}: constraint")
+        return False
+
+
+class _Session:
+    def __init__(self, claimed, bad_post):
+        self.claimed = claimed
+        self.bad_post = bad_post
+        self.pending: list[int] = []
+        self.writes = []
+        self.savepoints = []
+
+    async def execute(self, stmt):
+        if stmt.is_select:  # claim_posts
+            return _Result(self.claimed)
+        self.writes.append(stmt)
+        return _Result([])
+
+    def begin_nested(self):
+        return _Savepoint(self)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class _QueueProc(PipelineProcessor):
+    def __init__(self, claimed, bad_post, max_attempts=3):
+        self.session = _Session(claimed, bad_post)
+        self.sf = lambda: self.session
+        self.settings = SimpleNamespace(pipeline_max_attempts=max_attempts)
+        self.approved: list[int] = []
+
+        class _Taxonomy:
+            async def get(self):
+                return SimpleNamespace(specs=[])
+
+        self.taxonomy = _Taxonomy()
+
+    def _feed_changed(self, approved):
+        self.approved.append(approved)
+
+    async def _analyze(self, handle_posts, tags, res):
+        return [SimpleNamespace(post_id=p.id, error=None) for _, p in handle_posts]
+
+    async def _write_events(self, s, analyses, res):
+        s.pending.extend(a.post_id for a in analyses)
+        res.events_approved += len(analyses)
+
+
+def _claimed(n, attempts=0):
+    return [(SimpleNamespace(id=100 + i, attempts=attempts), SimpleNamespace(id=i), "@a") for i in range(n)]
+
+
+def _by_kind(session):
+    deletes = [w for w in session.writes if w.is_delete]
+    updates = [w.compile().params for w in session.writes if w.is_update]
+    return deletes, updates
+
+
+def test_process_jobs_isolates_failing_post():
+    proc = _QueueProc(_claimed(5), bad_post=2)
+    before = datetime.utcnow()
+    assert asyncio.run(proc.process_jobs(10)) == 5
+    s = proc.session
+    # пачка откатилась, затем 5 поштучных SAVEPOINT'ов — один из них упал
+    assert s.savepoints == ["rollback", "release", "release", "rollback", "release", "release"]
+    deletes, updates = _by_kind(s)
+    assert len(deletes) == 1
+    assert sorted(deletes[0].compile().params["id_1"]) == [100, 101, 103, 104]
+    [retry] = updates
+    assert retry["id_1"] == 102 and retry["attempts"] == 1
+    assert retry["status"] == JobStatus.pending and "constraint" in retry["last_error"]
+    assert retry["available_at"] >= before + RETRY_BASE
+    # в счёт — только записанные: 4 approved (откат пачки и упавший пост — нет)
+    assert proc.approved == [4]
+
+
+def test_process_jobs_fails_job_after_max_attempts():
+    proc = _QueueProc(_claimed(3, attempts=2), bad_post=0, max_attempts=3)
+    before = datetime.utcnow()
+    asyncio.run(proc.process_jobs(10))
+    deletes, [retry] = _by_kind(proc.session)
+    assert sorted(deletes[0].compile().params["id_1"]) == [101, 102]
+    assert retry["id_1"] == 100 and retry["attempts"] == 3
+    assert retry["status"] == JobStatus.failed
+    assert retry["available_at"] >= before + RETRY_BASE * 4
@@ -0,0 +1,37 @@
+"""Батч-опрос каналов (POLL_BATCH_SIZE): подошедшие каналы режутся на пачки
+по одному /ingest, next_due сдвигается на интервал канала, неподошедшие ждут."""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.services.scheduler import CuratorScheduler
+
+
+class _Processor:
+    def __init__(self):
+        self.batches: list[list[int]] = []
+
+    async def process_batch(self, channel_ids, *, limit):
+        self.batches.append(list(channel_ids))
+        return []
+
+
+def test_due_channels_are_batched_and_rescheduled():
+    settings = SimpleNamespace(poll_concurrency=2, poll_batch_size=2, poll_stream=False)
+    proc = _Processor()
+    sch = CuratorScheduler(proc, settings)
+    past = datetime.utcnow() - timedelta(minutes=1)
+    future = datetime.utcnow() + timedelta(hours=1)
+    sch._due = {
+        1: ("@a", 30, past), 2: ("@b", 30, past), 3: ("@c", 60, past), 4: ("@d", 30, future),
+    }
+
+    asyncio.run(sch._run_poll_batch())
+
+    assert proc.batches == [[1, 2], [3]]
+    assert sch._due[4][2] == future
+    assert sch._due[3][2] > datetime.utcnow() + timedelta(minutes=59)
+
+    sch.remove_channel("@b")
+    assert 2 not in sch._due
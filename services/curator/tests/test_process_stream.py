@@ -0,0 +1,98 @@
+"""Потоковый батч-опрос (PipelineProcessor.process_stream): пачки по chunk уходят
+в обработку до конца канала, канал фиксируется только по channel_done, а
+недочитанный при обрыве потока — failed (переопросится с прежнего min_id), как
+и канал, у которого не записалась одна из пачек."""
+
+import asyncio
+from types import SimpleNamespace
+
+from app.pipeline.processor import ChannelRunResult, PipelineProcessor
+from app.services.tg_client import ChannelDone, RawMessage
+
+
+class _Session:
+    def __init__(self, chans):
+        self.chans = chans
+
+    async def get(self, _model, cid):
+        return self.chans.get(cid)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class _Tg:
+    def __init__(self, items, fail_at_end=False):
+        self.items, self.fail_at_end = items, fail_at_end
+
+    async def stream(self, min_ids, limit=20, collect_media=True):
+        for it in self.items:
+            yield it
+        if self.fail_at_end:
+            raise ConnectionError("stream reset")
+
+
+class _Proc(PipelineProcessor):
+    def __init__(self, chans, tg, fail_on=()):
+        self.sf = lambda: _Session(chans)
+        self.tg = tg
+        self.fail_on = set(fail_on)  # message_id, на пачке с которым запись падает
+        self.log: list[tuple] = []
+
+    async def _store_posts(self, s, ch, raw, res, last):
+        self.log.append(("store", ch.handle, [m.message_id for m in raw]))
+        if self.fail_on & {m.message_id for m in raw}:
+            raise RuntimeError("db blip")
+        res.posts_fetched += len(raw)
+        return max([last or 0] + [m.message_id for m in raw])
+
+    async def _finish_channel(self, s, ch, res, last, started):
+        self.log.append(("finish", ch.handle, last))
+
+    async def _fetch_failed(self, ch, e, started):
+        self.log.append(("failed", ch.handle))
+        return ChannelRunResult(ch.handle, 0, 0, 0, 0, 0, error=str(e))
+
+
+def _msg(ch, mid):
+    return RawMessage(channel=ch, message_id=mid, text="", media_urls=[], published_at=None)
+
+
+def test_stream_chunks_and_finishes_per_channel():
+    chans = {1: SimpleNamespace(id=1, handle="@a", last_message_id=10),
+             2: SimpleNamespace(id=2, handle="@b", last_message_id=None)}
+    items = [_msg("@a", m) for m in (15, 14, 13)] + [ChannelDone("@a"), ChannelDone("@b", "FloodWait(30s)")]
+    proc = _Proc(chans, _Tg(items))
+    results = asyncio.run(proc.process_stream([1, 2], chunk=2))
+    assert proc.log == [
+        ("store", "@a", [15, 14]), ("store", "@a", [13]), ("finish", "@a", 15), ("failed", "@b"),
+    ]
+    assert [(r.channel_handle, r.posts_fetched, r.error is None) for r in results] == [("@a", 3, True), ("@b", 0, False)]
+
+
+def test_stream_cut_midway_fails_unfinished_channels():
+    chans = {1: SimpleNamespace(id=1, handle="@a", last_message_id=None)}
+    proc = _Proc(chans, _Tg([_msg("@a", 5), _msg("@a", 4)], fail_at_end=True))
+    results = asyncio.run(proc.process_stream([1], chunk=1))
+    assert ("finish", "@a", 5) not in proc.log and proc.log[-1] == ("failed", "@a")
+    assert results[0].error == "stream reset"
+
+
+def test_failed_chunk_keeps_channel_unpolled():
+    # Пачка 1 из 3 у @a не записалась: остаток @a не пишем, mark_polled нет —
+    # last_message_id не перескочит потерянные 15/14. @b не задет.
+    chans = {1: SimpleNamespace(id=1, handle="@a", last_message_id=10),
+             2: SimpleNamespace(id=2, handle="@b", last_message_id=None)}
+    items = [_msg("@a", m) for m in (15, 14, 13, 12, 11)] + [_msg("@b", 7), ChannelDone("@a"), ChannelDone("@b")]
+    proc = _Proc(chans, _Tg(items), fail_on={15})
+    results = asyncio.run(proc.process_stream([1, 2], chunk=2))
+    assert proc.log == [("store", "@a", [15, 14]), ("store", "@b", [7]), ("finish", "@b", 7)]
+    by = {r.channel_handle: r for r in results}
+    assert by["@a"].error == "db blip" and by["@a"].posts_fetched == 0
+    assert by["@b"].error is None and by["@b"].posts_fetched == 1
@@ -0,0 +1,86 @@
+"""Инкрементальный пересчёт ранга — выбор дней для перекластеризации
+(app.ranking._touched_days): только дни с изменёнными строками, с замыканием
+по dup_override_group (единственная склейка через границу дня)."""
+
+from datetime import date
+
+from app.ranking import _touched_days
+
+D1, D2, D3 = date(2026, 8, 1), date(2026, 8, 2), date(2026, 8, 3)
+
+
+def test_unchanged_snapshot_touches_nothing():
+    snap = [(1, D1, "a", "a", None), (2, D2, "b", "b", None)]
+    assert _touched_days(snap) == set()
+
+
+def test_new_and_changed_rows_touch_their_day():
+    # 2 — новая строка (sig ещё не сохранён), 3 — досчитался phash (sig сменился).
+    snap = [(1, D1, "a", "a", None), (2, D2, "b", None, None), (3, D3, "c2", "c1", None)]
+    assert _touched_days(snap) == {D2, D3}
+
+
+def test_override_closure_crosses_days():
+    # Override 77 склеивает D1 и D3 → правка в D1 тянет и D3, D2 не трогаем.
+    snap = [(1, D1, "x", "y", 77), (2, D2, "b", "b", None), (3, D3, "c", "c", 77)]
+    assert _touched_days(snap) == {D1, D3}
+
+
+def test_seed_ids_and_departed_days():
+    # Новое одобрение AWH на строку 2 + из ленты ушла строка дня D3.
+    snap = [(1, D1, "a", "a", None), (2, D2, "b", "b", None)]
+    assert _touched_days(snap, seed_ids={2}, seed_days={D3}) == {D2, D3}
+
+
+def test_undated_rows_share_one_bucket():
+    snap = [(1, None, "a", None, None), (2, D1, "b", "b", None)]
+    assert _touched_days(snap) == {None}
+
+
+def test_extract_links_skips_self_and_normalizes_handle():
+    from app.ranking import extract_links, is_endorser
+
+    text = (
+        "Дайджест: https://t.me/DaMuseum_Garden/5780 и t.me/freeartnewsletter/6007, "
+        "архив — t.me/animalswithhands/12, дубль https://telegram.me/damuseum_garden/5780"
+    )
+    assert extract_links([text]) == {("damuseum_garden", 5780), ("freeartnewsletter", 6007)}
+    assert is_endorser("@AnimalsWithHands") and not is_endorser(None)
+
+
+class _Session:
+    """Отвечает на запросы _dirty_days по порядку: снимок ленты, ранее
+    отранжированные, события с новыми одобрениями."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        self._rows = self.results.pop(0)
+        return self
+
+    def all(self):
+        return self._rows
+
+
+def test_backfilled_endorsement_below_post_watermark_recomputes_day():
+    # Прогон учёл одобрения до endorsements.id=41; backfill_endorsements затем
+    # дописал одобрение из СТАРОГО поста (post_id ниже любого учтённого) на
+    # событие 2 — оно получило id=42 и должно сделать D2 грязным.
+    import asyncio
+    from datetime import datetime
+
+    from sqlalchemy.dialects import postgresql
+
+    from app.models import RankState
+    from app.ranking import _dirty_days
+
+    snap = [(1, datetime(2026, 8, 1, 19), "a", "a", None), (2, datetime(2026, 8, 2, 19), "b", "b", None)]
+    s = _Session(snap, [(1, snap[0][1]), (2, snap[1][1])], [(2,)])
+    days, departed = asyncio.run(_dirty_days(s, RankState(id=1, awh_endorsement_id=41)))
+    assert days == {D2} and departed == []
+    seed_q = s.statements[2].compile(dialect=postgresql.dialect())
+    assert "endorsements.id > %(id_1)s" in str(seed_q) and seed_q.params["id_1"] == 41
+    assert "endorsements.post_id >" not in str(seed_q)
@@ -0,0 +1,66 @@
+"""Кэш таксономии (app.services.taxonomy): снимок переиспользуется, пока версия
+та же и TTL не истёк; invalidate() (NOTIFY) → следующий get() перечитывает."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from app.services import taxonomy as tx
+
+
+def _tag(id, key, parent_id=None, keywords=()):
+    return SimpleNamespace(id=id, key=key, label=key, symbol=None, parent_id=parent_id,
+                           keywords=list(keywords), sort_order=id)
+
+
+def _patch(monkeypatch, tables):
+    loads = []
+
+    @asynccontextmanager
+    async def session_scope(_sf):
+        yield None
+
+    class _Repo:
+        def __init__(self, _s):
+            pass
+
+        async def list_all(self):
+            loads.append(1)
+            return tables[0]
+
+    monkeypatch.setattr(tx, "session_scope", session_scope)
+    monkeypatch.setattr(tx, "TagsRepository", _Repo)
+    return loads
+
+
+def test_snapshot_reused_until_invalidated(monkeypatch):
+    tables = [[_tag(1, "music", keywords=["концерт"]), _tag(2, "techno", parent_id=1, keywords=["техно"])]]
+    loads = _patch(monkeypatch, tables)
+    cache = tx.TaxonomyCache(None)
+
+    async def scenario():
+        a = await cache.get()
+        b = await cache.get()
+        tables[0] = tables[0] + [_tag(3, "cinema", keywords=["кинопоказ"])]
+        cache.invalidate()
+        c = await cache.get()
+        return a, b, c
+
+    a, b, c = asyncio.run(scenario())
+    assert a is b and len(loads) == 2
+    assert [t.key for t in a.tags] == ["music", "techno"]
+    assert a.children == {None: [1], 1: [2]}
+    assert c.version > a.version and set(c.by_key) == {"music", "techno", "cinema"}
+    assert {x.tag_id for x in c.classifier.classify("кинопоказ и концерт", c.tags)} == {1, 3}
+
+
+def test_ttl_expiry_reloads(monkeypatch):
+    loads = _patch(monkeypatch, [[_tag(1, "music")]])
+    cache = tx.TaxonomyCache(None, ttl_seconds=0.0)
+
+    async def scenario():
+        await cache.get()
+        await cache.get()
+
+    asyncio.run(scenario())
+    assert len(loads) == 2
@@ -0,0 +1,41 @@
+"""Страница площадки (/me/venues/{key}/events): keyset по индексированной
+venue_key — запрос идёт по (старт, id) после курсора, курсор переживает
+круг «отдали next → получили after»."""
+
+import asyncio
+from datetime import datetime
+
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.me import PersonalizedFeedRepository
+from app.routers.me import _parse_venue_cursor, _venue_cursor
+
+
+class _Session:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return self
+
+    def all(self):
+        return []
+
+
+def test_keyset_query_and_cursor_roundtrip():
+    s = _Session()
+    after = (datetime(2026, 11, 2, 19, 0), 42)
+    out = asyncio.run(PersonalizedFeedRepository(s).list_venue_events(
+        "ges2", user_id=None, limit=20, after=after,
+    ))
+    assert out == []
+    sql = str(s.statements[0].compile(dialect=postgresql.dialect()))
+    assert "events_curated.venue_key = " in sql
+    assert "(coalesce(curator.events_curated.event_time, curator.events_curated.event_time_end), " \
+           "curator.events_curated.id) > (" in sql
+    assert "ORDER BY coalesce(curator.events_curated.event_time, curator.events_curated.event_time_end), " \
+           "curator.events_curated.id" in sql and "OFFSET" not in sql
+
+    item = {"id": "42", "event_time": None, "event_time_end": "2026-11-02T19:00:00"}
+    assert _parse_venue_cursor(_venue_cursor(item)) == after
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import json
 import logging
 from pathlib import Path
 
 from fastapi import Depends, FastAPI, Header, HTTPException, Query
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
@@ -67,6 +68,7 @@ class IngestRequest(BaseModel):
     collect_media: bool = True
     event_keywords: list[str] | None = None
     min_id: int | None = None   # «догон»: тянуть всё новее этого id (до per_channel_limit)
+    min_ids: dict[str, int] | None = None  # то же по каналам (батч куратора); приоритетнее min_id
 
 
 @app.post("/ingest")
@@ -80,9 +82,32 @@ async def ingest(body: IngestRequest, _: None = Depends(require_token)) -> dict:
         collect_media=body.collect_media,
         event_keywords=body.event_keywords,
         min_id=body.min_id,
+        min_ids=body.min_ids,
     )
 
 
+@app.post("/ingest/stream")
+async def ingest_stream(body: IngestRequest, _: None = Depends(require_token)) -> StreamingResponse:
+    """Same as /ingest, streamed as NDJSON: one line per message as soon as it is
+    fetched (media included), plus a {"type": "channel_done", ...} line after each
+    channel. The curator processes messages while the rest are still being fetched."""
+
+    async def lines():
+        async for item in service.iter_ingest(
+            channel_ids=body.channel_ids,
+            per_channel_limit=body.per_channel_limit,
+            pause_between_channels=body.pause_between_channels,
+            pause_between_messages=body.pause_between_messages,
+            collect_media=body.collect_media,
+            event_keywords=body.event_keywords,
+            min_id=body.min_id,
+            min_ids=body.min_ids,
+        ):
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 class RefetchItem(BaseModel):
     channel: str
     message_id: int
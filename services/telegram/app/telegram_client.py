@@ -9,7 +9,7 @@ import time
 from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
 
 from telethon import TelegramClient
 from telethon.errors import FloodWaitError
@@ -387,14 +387,54 @@ class TelegramService:
         collect_media: bool = True,
         event_keywords: list[str] | None = None,
         min_id: int | None = None,
+        min_ids: dict[str, int] | None = None,
     ) -> dict[str, Any]:
         """Fetch recent messages from channels; return list of event payloads (no DB). Optionally filter by event_keywords.
-        min_id → «догон»: вернуть всё новее этого id (до per_channel_limit), а не только последние N."""
-        self.media_root.mkdir(parents=True, exist_ok=True)
-        client = await self._get_client()
+        min_id → «догон»: вернуть всё новее этого id (до per_channel_limit), а не только последние N.
+        min_ids → то же, но своё значение на канал (ключ — как в channel_ids); батч-опрос
+        куратора шлёт много каналов одним запросом."""
         events: list[dict[str, Any]] = []
         ok: list[str] = []
         failed: dict[str, str] = {}
+        async for item in self.iter_ingest(
+            channel_ids, per_channel_limit, pause_between_channels, pause_between_messages,
+            collect_media, event_keywords, min_id, min_ids,
+        ):
+            if item.get("type") != "channel_done":
+                events.append(item)
+            elif item["ok"]:
+                ok.append(item["channel"])
+            else:
+                failed[item["channel"]] = item["reason"]
+        return {
+            "channels_ok": ok,
+            "channels_failed": failed,
+            "events": events,
+        }
+
+    async def iter_ingest(
+        self,
+        channel_ids: list[str],
+        per_channel_limit: int = 5,
+        pause_between_channels: float = 1.0,
+        pause_between_messages: float = 0.0,
+        collect_media: bool = True,
+        event_keywords: list[str] | None = None,
+        min_id: int | None = None,
+        min_ids: dict[str, int] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """То же, что ingest, но потоком: payload сообщения отдаётся сразу после
+        его выкачки (вместе с медиа), а после каждого канала — запись
+        {"type": "channel_done", "channel", "ok", "reason"}. Ничего не копим —
+        память не растёт с размером догона."""
+        self.media_root.mkdir(parents=True, exist_ok=True)
+        client = await self._get_client()
+        min_ids = min_ids or {}
+        keywords = [kw.lower() for kw in event_keywords or []]
+
+        def done(channel: str, reason: str | None = None) -> dict[str, Any]:
+            return {"type": "channel_done", "channel": channel, "ok": reason is None, "reason": reason}
+
         for channel in channel_ids:
             key = channel.strip().lower().lstrip("@")
             remaining = self._flood_until.get(key, 0.0) - time.monotonic()
@@ -402,7 +442,7 @@ class TelegramService:
                 # Канал ещё на cooldown после недавнего FloodWait — не трогаем,
                 # чтобы не продлевать лимит. Отдаём наверх как failed (видно в
                 # channels_failed), пост подтянется следующим циклом.
-                failed[channel] = f"FloodCooldown({int(remaining)}s)"
+                yield done(channel, f"FloodCooldown({int(remaining)}s)")
                 continue
             # Канал не в entity-кэше → его чтение форсит ResolveUsername (флуд-опасно).
             needs = self._needs_resolve(client, key)
@@ -412,27 +452,29 @@ class TelegramService:
                 # заново его продлевает — вечная петля резолв→флуд→кэш пуст).
                 g = int(self._resolve_blocked_until - time.monotonic())
                 if g > 0:
-                    failed[channel] = f"ResolveGlobalCooldown({g}s)"
+                    yield done(channel, f"ResolveGlobalCooldown({g}s)")
                     continue
                 # Сверх бюджета — пропускаем (подтянется следующим циклом): прогрев
                 # холодного кэша размазан во времени. Закэшированные идут свободно.
                 if not await self._resolve_budget_ok():
-                    failed[channel] = "ResolveThrottled (прогрев кэша)"
+                    yield done(channel, "ResolveThrottled (прогрев кэша)")
                     continue
+            reason: str | None = None
             try:
                 # min_id=0 → отдаём Telethon как None (иначе он это как «с самого начала»)
                 async for message in client.iter_messages(
-                    entity=channel, limit=per_channel_limit, min_id=(min_id or 0)
+                    entity=channel, limit=per_channel_limit, min_id=(min_ids.get(channel, min_id) or 0)
                 ):
                     if not isinstance(message, Message):
                         continue
                     if not message.message and not message.media:
                         continue
+                    if keywords and not any(kw in (message.message or "").lower() for kw in keywords):
+                        continue
                     media_urls = await self._collect_media(client, message) if collect_media else []
-                    events.append(self._message_to_payload(channel, message, media_urls))
+                    yield self._message_to_payload(channel, message, media_urls)
                     if pause_between_messages > 0:
                         await asyncio.sleep(pause_between_messages)
-                ok.append(channel)
                 self._flood_until.pop(key, None)
             except FloodWaitError as e:
                 wait = max(0, int(getattr(e, "seconds", 0)))
@@ -444,22 +486,16 @@ class TelegramService:
                     logger.warning("ResolveUsername FloodWait %ss on %s → глобальный кулдаун резолвов %ss", wait, channel, wait)
                 else:
                     logger.warning("FloodWait %ss on %s (cooling down)", wait, channel)
-                failed[channel] = f"FloodWait({wait}s)"
+                reason = f"FloodWait({wait}s)"
             except ValueError as e:
                 logger.warning("Channel not found or invalid: %s — %s", channel, e)
-                failed[channel] = str(e)[:500]
+                reason = str(e)[:500]
             except Exception as e:
                 logger.exception("Ingest failed channel=%s", channel)
-                failed[channel] = str(e)[:500]
+                reason = str(e)[:500]
+            yield done(channel, reason)
             if pause_between_channels > 0:
                 await asyncio.sleep(pause_between_channels)
-        if event_keywords:
-            events = [e for e in events if any(kw.lower() in (e.get("text") or "").lower() for kw in event_keywords)]
-        return {
-            "channels_ok": ok,
-            "channels_failed": failed,
-            "events": events,
-        }
 
     async def fetch_from_channel(
         self,